@@ -0,0 +1,83 @@
+"""Checks that `sorting-hat --help` stays within an import time budget.
+
+The command is run several times under `python -X importtime` and the best total
+import time is compared with the budget. The script exits with an error, listing
+the slowest imports, if the budget is exceeded or if a module reserved to the
+interactive quiz is imported.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 100] [--runs 5]
+"""
+
+import argparse
+import subprocess
+import sys
+
+COMMAND = "from sorting_hat.cli import cli; cli(['--help'])"
+
+# Modules that only the interactive quiz needs.
+FORBIDDEN_MODULES = ("questionary", "prompt_toolkit", "sorting_hat.render")
+
+
+def measure_imports() -> dict[str, tuple[int, int]]:
+    """Runs `sorting-hat --help` under `python -X importtime`.
+
+    Returns:
+        The self and cumulative import times, in microseconds, of each module.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", COMMAND],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    imports = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, cumulative_time, module = line[len("import time:") :].split("|")
+        imports[module.strip()] = (int(self_time), int(cumulative_time))
+
+    return imports
+
+
+def main() -> int:
+    """Measures the import time of `sorting-hat --help` and checks the budget.
+
+    Returns:
+        The exit code: 0 if the budget is met, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure_imports() for _ in range(args.runs)]
+    best = min(runs, key=lambda imports: sum(s for s, _ in imports.values()))
+    total_ms = sum(self_time for self_time, _ in best.values()) / 1000
+
+    print(f"Import time of `sorting-hat --help`: {total_ms:.1f} ms")
+    print(f"Budget: {args.budget_ms:.1f} ms")
+
+    forbidden = [
+        module
+        for module in best
+        for name in FORBIDDEN_MODULES
+        if module == name or module.startswith(f"{name}.")
+    ]
+    if forbidden:
+        print(f"Modules of the interactive quiz imported: {', '.join(forbidden)}")
+
+    if total_ms > args.budget_ms or forbidden:
+        print("Slowest imports (cumulative):")
+        slowest = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (_, cumulative_time) in slowest[:10]:
+            print(f"  {cumulative_time / 1000:8.1f} ms  {module}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Generates load on `sorting-hat serve` and reports its latency and throughput.
+
+Each simulated user opens a keep-alive connection, starts a session, fetches and
+answers every question at random and gets the result. All the users run at the
+same time.
+
+Usage:
+    sorting-hat serve --port 8000 &
+    python benchmarks/load_server.py [--port 8000] [--users 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Any
+
+
+async def _request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    path: str,
+    payload: Any = None,
+) -> tuple[int, Any]:
+    """Sends a request on a keep-alive connection and reads the response.
+
+    Args:
+        reader: The stream to read the response from.
+        writer: The stream to write the request to.
+        method: The HTTP method.
+        path: The path of the request.
+        payload: The JSON body, if any.
+
+    Returns:
+        The HTTP status and the JSON body of the response.
+    """
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _user(host: str, port: int, latencies: list[float]) -> None:
+    """Goes through a whole sorting as a single user.
+
+    Args:
+        host: The host of the server.
+        port: The port of the server.
+        latencies: The list to append the latency of each request to.
+    """
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+
+    async def timed(method: str, path: str, payload: Any = None) -> Any:
+        """Sends a request and records its latency."""
+        start = time.perf_counter()
+        status, body = await _request(reader, writer, method, path, payload)
+        latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path}: {status} {body}")
+        return body
+
+    session = await timed("POST", "/sessions")
+    path = f"/sessions/{session['session_id']}"
+    for _ in range(session["number_of_questions"]):
+        question = await timed("GET", f"{path}/question")
+        answer = random.choice(question["answers"])
+        await timed("POST", f"{path}/answers", {"answer_id": answer["answer_id"]})
+    await timed("GET", f"{path}/result")
+
+    writer.close()
+
+
+async def main(host: str, port: int, users: int) -> None:
+    """Runs the simulated users concurrently and prints the statistics.
+
+    Args:
+        host: The host of the server.
+        port: The port of the server.
+        users: The number of concurrent users.
+    """
+    latencies: list[float] = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_user(host, port, latencies) for _ in range(users)))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"Users: {users}, requests: {len(latencies)}, elapsed: {elapsed:.2f} s")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"Latency p50: {quantiles[49] * 1000:.2f} ms")
+    print(f"Latency p99: {quantiles[98] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(host=args.host, port=args.port, users=args.users))
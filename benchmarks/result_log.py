@@ -0,0 +1,98 @@
+"""Writes simulated sortings to a result log and times queries on it.
+
+The sortings are spread over a week, so that the time range of the queries
+covers part of the log. The script reports the records written per second, the
+size of a record and the time of each query, with the number of sortings found.
+
+Usage:
+    python benchmarks/result_log.py [--sortings 1000000] [--seed 0]
+        [--directory DIR]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sorting_hat.referential import load_referential
+from sorting_hat.result_log import ResultLog, ResultLogReader
+from sorting_hat.simulate import Simulator
+
+WEEK = 7 * 86400
+
+
+def main() -> int:
+    """Writes the log, runs the queries and prints the report.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sortings", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--directory", default=None, help="Defaults to a temporary directory."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = Path(args.directory or temporary_directory)
+        referential = load_referential()
+        now = time.time()
+        start_time = now - WEEK
+        spacing = WEEK / max(args.sortings, 1)
+
+        start = time.perf_counter()
+        with ResultLog(directory=directory, referential=referential) as log:
+            for i, sorting in enumerate(
+                Simulator(referential=referential, seed=args.seed).generate(
+                    n=args.sortings
+                )
+            ):
+                log.append(
+                    respondent_id=sorting.respondent_id,
+                    answers=sorting.answers,
+                    house=sorting.house,
+                    scores=sorting.scores,
+                    timestamp=start_time + i * spacing,
+                )
+        seconds = time.perf_counter() - start
+        print(f"{args.sortings} sortings written in {seconds:.1f}s")
+        print(f"{args.sortings / seconds:,.0f} sortings/s")
+        print(f"{log.record_size} bytes per sorting")
+
+        start = time.perf_counter()
+        reader = ResultLogReader(directory=directory)
+        print(f"Log opened in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        answer = referential.variations[0] + ("2",)
+        queries = {
+            "count serpentard": dict(house="serpentard"),
+            "count serpentard, last 2 days": dict(
+                house="serpentard", since=now - 2 * 86400
+            ),
+            "count answer 1/1/2": dict(answer=answer),
+            "count serpentard with answer 1/1/2": dict(
+                house="serpentard", answer=answer
+            ),
+        }
+        for name, conditions in queries.items():
+            start = time.perf_counter()
+            found = reader.count(**conditions)
+            milliseconds = (time.perf_counter() - start) * 1000
+            print(f"  {name:<40} {milliseconds:>9.2f} ms {found:>12}")
+
+        name = "read 1000 serpentard, last hour"
+        start = time.perf_counter()
+        found = sum(
+            1 for _ in reader.query(house="serpentard", since=now - 3600, limit=1000)
+        )
+        milliseconds = (time.perf_counter() - start) * 1000
+        print(f"  {name:<40} {milliseconds:>9.2f} ms {found:>12}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Times the scoring of answer sheets with and without the cache of the totals.
+
+The workload is skewed as real answers are: the sheets are drawn from a pool of
+distinct sheets (simulated with a profile towards each house, or uniform), the
+popularity of a sheet following a Zipf law, and the answers of each sheet are
+given in a random order. The script reports the time of the totals of the sheets
+and of the whole scoring with a cache keeping nothing and with the default cache,
+the speedups and the hit rate.
+
+Usage:
+    python benchmarks/score_cache.py [--respondents 200000] [--pool 20000]
+        [--zipf 1.1] [--seed 0]
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from sorting_hat.batch import accumulate_totals, decide_houses
+from sorting_hat.referential import load_referential
+from sorting_hat.scoring import ScoreCache
+from sorting_hat.simulate import Simulator
+
+
+def main() -> int:
+    """Builds the workload, scores it twice and prints the report.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--respondents", type=int, default=200_000)
+    parser.add_argument("--pool", type=int, default=20_000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    referential = load_referential()
+    rng = random.Random(args.seed)
+
+    profiles = [None, *referential.houses]
+    per_profile = -(-args.pool // len(profiles))
+    pool = [
+        sorting.answers
+        for i, profile in enumerate(profiles)
+        for sorting in Simulator(
+            referential=referential, seed=args.seed + i, profile=profile
+        ).generate(n=per_profile)
+    ]
+    rng.shuffle(pool)
+    popularity = list(
+        itertools.accumulate(1 / rank**args.zipf for rank in range(1, len(pool) + 1))
+    )
+
+    rows = []
+    for respondent, sheet in enumerate(
+        rng.choices(pool, cum_weights=popularity, k=args.respondents)
+    ):
+        sheet = list(sheet)
+        rng.shuffle(sheet)
+        rows += [(str(respondent), *answer) for answer in sheet]
+    print(
+        f"{args.respondents} respondents, {len(rows)} answers, "
+        f"{len(set(map(tuple, map(sorted, pool))))} distinct sheets in the pool"
+    )
+
+    timings = {}
+    for name, max_sheets in (("without cache", 0), ("with cache", 65_536)):
+        cache = ScoreCache(referential=referential, max_sheets=max_sheets)
+        start = time.perf_counter()
+        totals = accumulate_totals(answers=rows, referential=referential, cache=cache)
+        totals_seconds = time.perf_counter() - start
+        decide_houses(totals=totals, houses=referential.houses, seed=args.seed)
+        timings[name] = (totals_seconds, time.perf_counter() - start)
+        print(
+            f"  {name:<14} totals {totals_seconds:>6.3f}s  "
+            f"scoring {timings[name][1]:>6.3f}s  "
+            f"{args.respondents / timings[name][1]:>10,.0f} sheets/s  "
+            f"hit rate {cache.hit_rate:.1%}"
+        )
+
+    before, after = timings["without cache"], timings["with cache"]
+    print(
+        f"Speedup: {before[0] / after[0]:.2f}x on the totals, "
+        f"{before[1] / after[1]:.2f}x on the whole scoring"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
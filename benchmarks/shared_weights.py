@@ -0,0 +1,100 @@
+"""Times the start of the scoring workers, with and without the shared weights.
+
+Each worker is a new interpreter (as with the "spawn" start method or a pre-fork
+server started from scratch). Once its modules are imported, it either loads the
+referential or maps the table published by the parent, then builds its cache of
+the totals. The script reports the mean time of this start and the memory it made
+private to the workers, summed over them. The table itself is mapped once for all
+of them. The memory is read from /proc, so it is only reported on Linux.
+
+Usage:
+    python benchmarks/shared_weights.py [--workers 1 2 4 8]
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from sorting_hat.shared import publish_table
+
+
+def _private_bytes() -> Optional[int]:
+    """Reads the memory private to the current process.
+
+    Returns:
+        The private clean and dirty bytes, or None if they cannot be read.
+    """
+    try:
+        lines = Path("/proc/self/smaps_rollup").read_text().splitlines()
+    except OSError:
+        return None
+    return 1024 * sum(
+        int(line.split()[1]) for line in lines if line.startswith("Private_")
+    )
+
+
+def _start_worker(table: Optional[str], results: "multiprocessing.Queue") -> None:
+    """Starts a worker as the scorer does and sends back its start time and memory.
+
+    Args:
+        table: The path of the table to map, or None to load the referential.
+        results: The queue to send the measures to.
+    """
+    from sorting_hat.parallel import _init_worker
+
+    before = _private_bytes()
+    start = time.perf_counter()
+    _init_worker(package="sorting_hat.data", table=table)
+    seconds = time.perf_counter() - start
+    after = _private_bytes()
+    results.put(
+        (
+            seconds,
+            after - before if after is not None and before is not None else None,
+        )
+    )
+
+
+def main() -> int:
+    """Starts the workers in both modes and prints the report.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    table = publish_table()
+    print(f"Table of the weights: {table} ({table.stat().st_size} bytes, mapped once)")
+    context = multiprocessing.get_context("spawn")
+
+    for workers in args.workers:
+        for name, path in (("loaded", None), ("shared", str(table))):
+            results = context.Queue()
+            processes = [
+                context.Process(target=_start_worker, args=(path, results))
+                for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            measures = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+            seconds = sum(seconds for seconds, _ in measures) / workers
+            sizes = [size for _, size in measures if size is not None]
+            memory = f"{sum(sizes) / 1024:>9.0f} KiB" if sizes else "      n/a"
+            print(
+                f"  {workers:>3} workers, {name}:  start {seconds * 1000:>7.2f} ms  "
+                f"private memory for the weights {memory}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
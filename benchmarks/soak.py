@@ -0,0 +1,79 @@
+"""Runs the real quiz many times with scripted answers to check its throughput.
+
+Each sorting goes through SortingHat.run() as in the terminal: the variations are
+chosen, shuffled and asked, the score is updated and the result screen is
+rendered, only the prompt answers at random and writes into memory. The script
+reports the sortings per second and how much the memory grew between the first
+and the last half of the run, which should stay close to zero.
+
+Usage:
+    python benchmarks/soak.py [--sortings 100000] [--seed 0] [--long-quiz]
+        [--early-stop]
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.prompt import ScriptedPrompt
+from sorting_hat.referential import load_referential
+from sorting_hat.sorting_hat import SortingHat
+
+
+def main() -> int:
+    """Runs the sortings and prints the report.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sortings", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--long-quiz", action="store_true")
+    parser.add_argument("--early-stop", action="store_true")
+    args = parser.parse_args()
+
+    referential = load_referential()
+    rng = random.Random(args.seed)
+    stream = io.BytesIO()
+    prompt = ScriptedPrompt(rng=rng, stream=stream)
+    houses: Counter[str] = Counter()
+    half = args.sortings // 2
+    memory = []
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(args.sortings):
+        if i in (half // 2, half + half // 2):
+            memory.append(tracemalloc.get_traced_memory()[0])
+        stream.seek(0)
+        result = SortingHat(
+            referential=referential,
+            chosen_variations=ChooseVariations(
+                referential=referential, long_quiz=args.long_quiz, rng=rng
+            ).run(),
+            early_stop=args.early_stop,
+            rng=rng,
+            prompt=prompt,
+        ).run()
+        houses[result.house] += 1
+    seconds = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(f"{args.sortings} sortings in {seconds:.1f}s")
+    print(f"{args.sortings / seconds:,.0f} sortings/s (traced)")
+    if len(memory) == 2:
+        print(f"Memory growth: {memory[1] - memory[0]:+,} bytes")
+    for house, count in sorted(houses.items()):
+        print(f"  {house:<12} {count / args.sortings:.2%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Times each stage of a sorting and compares the timings with a baseline.
+
+Every stage is timed on its own, in seconds per call: the stages are timed in turn
+for several rounds, so that a slow spell of the machine is spread over all of them,
+and the median of the repeats of every round is kept. The timings are written as
+JSON. When a baseline is given, the script exits
+with an error if a stage got slower than the baseline by more than the threshold.
+The baseline depends on the machine: regenerate it with --update-baseline when the
+benchmarks run somewhere else.
+
+Usage:
+    python benchmarks/stages.py [--output timings.json] [--threshold 0.5] [--rounds 3]
+        [--baseline benchmarks/baseline.json] [--update-baseline] [--stage NAME]
+"""
+
+import argparse
+import io
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable
+
+from sorting_hat.cache import dump, hash_package, load
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.prompt import ScriptedPrompt
+from sorting_hat.referential import QuizReferential, load_referential
+from sorting_hat.sorting_hat import SortingHat
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def _load_csv() -> Callable[[], object]:
+    """Parses the CSV files of the referential."""
+    return QuizReferential.from_package
+
+
+def _load_compiled() -> Callable[[], object]:
+    """Unpacks the compiled referential (the cache file without the disk read)."""
+    digest = hash_package()
+    content = dump(referential=QuizReferential.from_package(), digest=digest)
+    return lambda: load(content=content, digest=digest)
+
+
+def _choose_short() -> Callable[[], object]:
+    """Chooses a variation for each question."""
+    return ChooseVariations(referential=load_referential()).run
+
+
+def _choose_long() -> Callable[[], object]:
+    """Chooses every variation of each question."""
+    return ChooseVariations(referential=load_referential(), long_quiz=True).run
+
+
+def _update_score() -> Callable[[], object]:
+    """Updates the score after one answer."""
+    referential = load_referential()
+    answer = {"question_id": "1", "variation_id": "1", "answer_id": "1"}
+    score: defaultdict[str, float] = defaultdict(float)
+    return lambda: SortingHat._update_score(
+        referential=referential, answer=answer, current_score=score
+    )
+
+
+def _winning_house() -> Callable[[], object]:
+    """Gets the winning house of a score with a tie."""
+    score = {"gryffondor": 3.5, "poufsouffle": 1.0, "serdaigle": 3.5, "serpentard": 2}
+    return lambda: SortingHat._get_winning_house(score=score)
+
+
+def _render_ascii() -> Callable[[], object]:
+    """Renders the screen announcing a house (banner, ASCII art) into memory."""
+    from sorting_hat.render import get_house_art, render_result, write_result
+
+    def render() -> None:
+        """Renders the screen, the art read again instead of taken from the cache."""
+        get_house_art.cache_clear()
+        render_result.cache_clear()
+        write_result(house="serdaigle", stream=io.BytesIO())
+
+    return render
+
+
+def _end_to_end() -> Callable[[], object]:
+    """Goes through a whole sorting with scripted answers, output included."""
+    referential = load_referential()
+    # The first answer of every question, with the texts and the result screen
+    # written into memory.
+    prompt = ScriptedPrompt(answers=itertools.repeat(1), stream=io.BytesIO())
+
+    def sort() -> None:
+        """Sorts someone."""
+        prompt.stream.seek(0)
+        chosen_variations = ChooseVariations(referential=referential).run()
+        SortingHat(
+            referential=referential, chosen_variations=chosen_variations, prompt=prompt
+        ).run()
+
+    return sort
+
+
+# Each stage builds, outside of the timing, the function to time.
+STAGES: dict[str, Callable[[], Callable[[], object]]] = {
+    "load_csv": _load_csv,
+    "load_compiled": _load_compiled,
+    "choose_short": _choose_short,
+    "choose_long": _choose_long,
+    "update_score": _update_score,
+    "winning_house": _winning_house,
+    "render_ascii": _render_ascii,
+    "end_to_end": _end_to_end,
+}
+
+
+def time_stages(
+    stages: dict[str, Callable[[], object]], rounds: int = 3, repeat: int = 5
+) -> dict[str, float]:
+    """Times stages in turn.
+
+    Args:
+        stages: The function to time of each stage.
+        rounds: The number of times every stage is timed.
+        repeat: The number of repeats of a stage in each round.
+
+    Returns:
+        The median time of one call of each stage, in seconds.
+    """
+    timers = {name: timeit.Timer(stage) for name, stage in stages.items()}
+    numbers = {name: timer.autorange()[0] for name, timer in timers.items()}
+    samples: defaultdict[str, list[float]] = defaultdict(list)
+    for _ in range(rounds):
+        for name, timer in timers.items():
+            samples[name] += [
+                seconds / numbers[name]
+                for seconds in timer.repeat(repeat=repeat, number=numbers[name])
+            ]
+
+    return {name: statistics.median(samples[name]) for name in stages}
+
+
+def compare(
+    timings: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Compares timings with a baseline.
+
+    Args:
+        timings: The time of one call of each stage, in seconds.
+        baseline: The reference time of each stage, in seconds.
+        threshold: The relative slowdown tolerated, 0.25 for 25%.
+
+    Returns:
+        The stages slower than the baseline by more than the threshold.
+    """
+    return [
+        name
+        for name, seconds in timings.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def main() -> int:
+    """Times the stages and checks them against the baseline.
+
+    Returns:
+        The exit code: 0 if no stage regressed, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", action="append", choices=STAGES)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    random.seed(0)
+    timings = time_stages(
+        stages={name: STAGES[name]() for name in args.stage or STAGES},
+        rounds=args.rounds,
+        repeat=args.repeat,
+    )
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timings": timings,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["timings"]
+
+    for name, seconds in timings.items():
+        reference = baseline.get(name)
+        change = f"{seconds / reference - 1:+7.1%}" if reference else "    new"
+        print(f"{name:>15}  {seconds * 1e6:12.2f} µs  {change}")
+
+    regressions = compare(timings=timings, baseline=baseline, threshold=args.threshold)
+    if regressions:
+        print(f"Slower than the baseline by more than {args.threshold:.0%}:")
+        print("  " + ", ".join(regressions))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Times the NumPy kernel against the pure Python scoring of the answer sheets.
+
+The sheets are drawn at random, one answer to a variation of each question as in
+the short quiz, and given to both engines as the positions of their answers. The
+Python engine sums them with ScoreCache, without keeping any sheet, and breaks
+the ties as decide_houses does. The kernel gets them as one array. The script
+reports the time of each engine, the speedup, and checks that the totals are the
+same floats and that the houses are the same where there is no tie.
+
+Usage:
+    python benchmarks/vectorized.py [--sheets 1000000] [--seed 0]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from sorting_hat.referential import load_referential
+from sorting_hat.scoring import ScoreCache, get_best_houses, get_winning_house
+from sorting_hat.vectorized import VectorizedScorer
+
+
+def main() -> int:
+    """Builds the sheets, scores them with both engines and prints the report.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    referential = load_referential()
+    scorer = VectorizedScorer(referential=referential)
+    rng = np.random.default_rng(args.seed)
+
+    by_question: dict[str, list[int]] = {}
+    for (question_id, _, _), code in scorer.codes.items():
+        by_question.setdefault(question_id, []).append(code)
+    codes = np.stack(
+        [rng.choice(choices, size=args.sheets) for choices in by_question.values()],
+        axis=1,
+    ).astype(np.int32)
+    sheets = codes.tolist()
+    print(f"{args.sheets} sheets of {codes.shape[1]} answers")
+
+    start = time.perf_counter()
+    cache = ScoreCache(referential=referential, max_sheets=0)
+    tie_rng = random.Random(args.seed)
+    python_totals, python_houses = [], []
+    for sheet in sheets:
+        totals = cache.totals(sheet)
+        score = dict(zip(referential.houses, totals))
+        best_houses = get_best_houses(score=score)
+        python_totals.append(totals)
+        python_houses.append(
+            best_houses[0]
+            if len(best_houses) == 1
+            else get_winning_house(score=score, rng=tie_rng)
+        )
+    python_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = scorer.score(codes=codes, seed=args.seed)
+    kernel_seconds = time.perf_counter() - start
+
+    houses = np.array(referential.houses)[result.winners]
+    same_totals = np.array_equal(result.scores, np.array(python_totals))
+    same_houses = np.array_equal(
+        houses[~result.ties], np.array(python_houses)[~result.ties]
+    )
+    print(
+        f"  python  {python_seconds:>8.3f}s  {args.sheets / python_seconds:>14,.0f}/s"
+    )
+    print(
+        f"  numpy   {kernel_seconds:>8.3f}s  {args.sheets / kernel_seconds:>14,.0f}/s"
+    )
+    print(f"Speedup: {python_seconds / kernel_seconds:.0f}x")
+    print(
+        f"Same totals: {same_totals}, same houses without a tie: {same_houses}, "
+        f"ties: {result.ties.mean():.1%}"
+    )
+    return 0 if same_totals and same_houses else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
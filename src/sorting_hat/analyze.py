@@ -0,0 +1,260 @@
+"""This module computes how likely each house is for a given quiz.
+
+Instead of going through every combination of answers, the distribution of the
+score of the four houses is propagated question by question: identical scores are
+merged as soon as they are reached, and a score whose leading house can no longer
+be caught is settled right away. The number of states thus stays small even when
+every variation of each question is asked.
+
+The weights are turned into integers (they are decimals with a few digits) and the
+probabilities are kept as integer masses over a common denominator, so the result
+is exact and the ties are detected without any rounding error.
+A tie between several houses is split evenly between them, as the sorting hat
+chooses one of them at random.
+"""
+
+from collections import defaultdict
+from fractions import Fraction
+from math import lcm
+from typing import NamedTuple, Optional, Sequence, Union
+
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.referential import QuizReferential
+
+Prior = Sequence[Union[int, float, Fraction]]
+
+
+class Analysis(NamedTuple):
+    """The probability of each house for a given quiz."""
+
+    probabilities: dict[str, Fraction]
+    outright: dict[str, Fraction]
+    from_ties: dict[str, Fraction]
+    tie_probability: Fraction
+    number_of_states: int  # The largest number of distinct scores kept at once.
+
+
+def analyze(
+    referential: QuizReferential,
+    chosen_variations: Optional[list[dict[str, str]]] = None,
+    long_quiz: bool = False,
+    priors: Optional[dict[tuple[str, str], Prior]] = None,
+) -> Analysis:
+    """Computes the probability of each house.
+
+    Args:
+        referential: The referential of questions, answers and weights.
+        chosen_variations: The variation asked for each question, as returned by
+            ChooseVariations.run(). Defaults to None: the variation of each question
+            is then drawn at random, as in a real quiz.
+        long_quiz: A flag to ask every variation of each question, used when no
+            variations are given. Defaults to False.
+        priors: The relative probability of each answer, keyed by
+            (question_id, variation_id). Defaults to None (uniform answers).
+
+    Returns:
+        The probability of each house, with the part coming from ties.
+    """
+    priors = priors or {}
+    houses = referential.houses
+
+    if chosen_variations is None and long_quiz:
+        chosen_variations = ChooseVariations(
+            referential=referential, long_quiz=True
+        ).run()
+
+    if chosen_variations is None:
+        variations_per_question: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for key in referential.variations:
+            variations_per_question[key[0]].append(key)
+        steps = list(variations_per_question.values())
+    else:
+        steps = [
+            [(variation["question_id"], variation["variation_id"])]
+            for variation in chosen_variations
+        ]
+
+    scale = _get_scale(referential=referential)
+    # The total score does not depend on the order of the questions: the ones with
+    # the fewest distinct gains come first to keep the number of states small.
+    transitions = sorted(
+        (
+            _get_transitions(
+                referential=referential,
+                variations=variations,
+                priors=priors,
+                scale=scale,
+            )
+            for variations in steps
+        ),
+        key=lambda transition: len(transition[0]),
+    )
+
+    # Each score is packed into a single integer, a few bits per house,
+    # so that adding a gain to a score is a single integer addition.
+    max_score = sum(max(max(gain) for gain, _ in step) for step, _ in transitions)
+    bits = max(max_score.bit_length(), 1)
+    shifts = [bits * i for i in range(len(houses))]
+    mask = (1 << bits) - 1
+
+    # The most and the least each house can still gain, and the denominator of
+    # the masses of the remaining questions, after each question.
+    max_remaining = [[0] * len(houses)]
+    min_remaining = [[0] * len(houses)]
+    remaining_denominator = [1]
+    for step, step_denominator in reversed(transitions):
+        gains_per_house = list(zip(*(gain for gain, _ in step)))
+        max_remaining.append(
+            [
+                total + max(gains)
+                for total, gains in zip(max_remaining[-1], gains_per_house)
+            ]
+        )
+        min_remaining.append(
+            [
+                total + min(gains)
+                for total, gains in zip(min_remaining[-1], gains_per_house)
+            ]
+        )
+        remaining_denominator.append(remaining_denominator[-1] * step_denominator)
+    max_remaining.reverse()
+    min_remaining.reverse()
+    remaining_denominator.reverse()
+
+    outright_masses = [0] * len(houses)
+    states = {0: 1}
+    number_of_states = 1
+
+    for i, (step, _) in enumerate(transitions, start=1):
+        packed_step = [
+            (sum(value << shift for value, shift in zip(gain, shifts)), step_mass)
+            for gain, step_mass in step
+        ]
+        next_states: dict[int, int] = defaultdict(int)
+        for state, mass in states.items():
+            for gain, step_mass in packed_step:
+                next_states[state + gain] += mass * step_mass
+
+        # A score whose leader cannot be caught anymore is decided: its mass,
+        # whatever the remaining answers, goes directly to the leader.
+        states = {}
+        for state, mass in next_states.items():
+            scores = [(state >> shift) & mask for shift in shifts]
+            leader = scores.index(max(scores))
+            lowest = scores[leader] + min_remaining[i][leader]
+            if all(
+                lowest > score + max_remaining[i][house]
+                for house, score in enumerate(scores)
+                if house != leader
+            ):
+                outright_masses[leader] += mass * remaining_denominator[i]
+            else:
+                states[state] = mass
+        number_of_states = max(number_of_states, len(states))
+
+    denominator = remaining_denominator[0]
+
+    # The masses of the ties are multiplied by a factor divisible by any number
+    # of tied houses, so that splitting a tie stays an integer division.
+    split_factor = lcm(*range(1, len(houses) + 1))
+    tie_masses = [0] * len(houses)
+    tie_mass = 0
+
+    for state, mass in states.items():
+        scores = [(state >> shift) & mask for shift in shifts]
+        best_score = max(scores)
+        best_houses = [i for i, value in enumerate(scores) if value == best_score]
+        if len(best_houses) == 1:
+            outright_masses[best_houses[0]] += mass
+        else:
+            tie_mass += mass
+            share = mass * split_factor // len(best_houses)
+            for i in best_houses:
+                tie_masses[i] += share
+
+    outright = {
+        house: Fraction(mass, denominator)
+        for house, mass in zip(houses, outright_masses)
+    }
+    from_ties = {
+        house: Fraction(mass, denominator * split_factor)
+        for house, mass in zip(houses, tie_masses)
+    }
+
+    return Analysis(
+        probabilities={house: outright[house] + from_ties[house] for house in houses},
+        outright=outright,
+        from_ties=from_ties,
+        tie_probability=Fraction(tie_mass, denominator),
+        number_of_states=number_of_states,
+    )
+
+
+def _get_scale(referential: QuizReferential) -> int:
+    """Gets the smallest factor turning every weight into an integer.
+
+    Args:
+        referential: The referential holding the weights.
+
+    Returns:
+        The common denominator of the weights, read as decimals.
+    """
+    denominators = {
+        Fraction(repr(weight)).denominator
+        for vector in referential.weights.values()
+        for weight in vector
+    }
+    return lcm(*denominators)
+
+
+def _get_transitions(
+    referential: QuizReferential,
+    variations: list[tuple[str, str]],
+    priors: dict[tuple[str, str], Prior],
+    scale: int,
+) -> tuple[list[tuple[tuple[int, ...], int]], int]:
+    """Gets the possible gains of one question and their integer masses.
+
+    When several variations are given, one of them is asked at random.
+
+    Args:
+        referential: The referential of answers and weights.
+        variations: The (question_id, variation_id) that can be asked.
+        priors: The relative probability of each answer.
+        scale: The factor turning every weight into an integer.
+
+    Returns:
+        The gain of each house with its mass, merged when identical,
+        and the denominator of the masses.
+    """
+    probabilities: dict[tuple[int, ...], Fraction] = defaultdict(Fraction)
+
+    for question_id, variation_id in variations:
+        number_of_answers = len(referential.answer_texts[(question_id, variation_id)])
+        prior = priors.get((question_id, variation_id), [1] * number_of_answers)
+        if len(prior) != number_of_answers:
+            raise ValueError(
+                f"The prior of {question_id}/{variation_id} should have "
+                f"{number_of_answers} values."
+            )
+        prior = [p if isinstance(p, Fraction) else Fraction(str(p)) for p in prior]
+        total = sum(prior)
+        if total <= 0 or min(prior) < 0:
+            raise ValueError(
+                f"The prior of {question_id}/{variation_id} should be non-negative "
+                "and not all zero."
+            )
+
+        for answer_id, p in enumerate(prior, start=1):
+            if p == 0:
+                continue
+            vector = referential.weights[(question_id, variation_id, str(answer_id))]
+            gain = tuple(int(Fraction(repr(weight)) * scale) for weight in vector)
+            if min(gain) < 0:
+                raise ValueError("The weights should not be negative.")
+            probabilities[gain] += p / total / len(variations)
+
+    denominator = lcm(*(p.denominator for p in probabilities.values()))
+    transitions = [(gain, int(p * denominator)) for gain, p in probabilities.items()]
+
+    return transitions, denominator
@@ -0,0 +1,399 @@
+"""This module scores answer sheets collected outside of the interactive quiz.
+
+An answer sheet is a set of rows sharing the same respondent_id, each row giving
+the question_id, the variation_id and the answer_id of one answer.
+Sheets can be read from a CSV file (with a header) or from a JSONL file
+(one JSON object per row) and the winning house of each respondent is written
+along with the total of each house.
+"""
+
+import csv
+import json
+import os
+from collections import defaultdict
+from random import Random
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional
+
+from sorting_hat.metrics import METRICS
+from sorting_hat.scoring import ScoreCache, get_best_houses, get_winning_house
+
+if TYPE_CHECKING:
+    from sorting_hat.referential import QuizReferential
+    from sorting_hat.result_log import ResultLog
+    from sorting_hat.stats import SortingStats
+
+FORMATS = ("csv", "jsonl")
+
+ENGINES = ("python", "numpy")
+
+ANSWER_FIELDS = ("respondent_id", "question_id", "variation_id", "answer_id")
+
+
+class ScoredSheet(NamedTuple):
+    """The result of the sorting of one respondent.
+
+    The respondents with the same totals share their dict of scores, which should
+    not be modified.
+    """
+
+    respondent_id: str
+    house: str
+    scores: dict[str, float]
+
+
+def guess_format(filename: str) -> str:
+    """Guesses the format of a file from its extension.
+
+    Args:
+        filename: The name of the file.
+
+    Returns:
+        The format of the file, one of FORMATS.
+    """
+    extension = os.path.splitext(filename)[1].lstrip(".").lower()
+
+    if extension not in FORMATS:
+        raise ValueError(
+            f"Cannot guess the format of {filename!r}, "
+            f"it should be one of {', '.join(FORMATS)}."
+        )
+
+    return extension
+
+
+def read_answers(f: IO[str], fmt: str) -> Iterator[tuple[str, str, str, str]]:
+    """Reads the rows of answer sheets.
+
+    Args:
+        f: The file to read.
+        fmt: The format of the file, one of FORMATS.
+
+    Yields:
+        The respondent_id, the question_id, the variation_id and the answer_id
+        of each answer.
+    """
+    if fmt == "csv":
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            positions = [header.index(field) for field in ANSWER_FIELDS]
+        except ValueError:
+            raise ValueError(
+                f"The CSV header should contain {', '.join(ANSWER_FIELDS)}."
+            ) from None
+        r, q, v, a = positions
+        for row in reader:
+            if row:
+                yield row[r], row[q], row[v], row[a]
+
+    elif fmt == "jsonl":
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield (
+                    str(row["respondent_id"]),
+                    str(row["question_id"]),
+                    str(row["variation_id"]),
+                    str(row["answer_id"]),
+                )
+
+    else:
+        raise ValueError(f"The format should be one of {', '.join(FORMATS)}.")
+
+
+def score_answers(
+    answers: Iterable[tuple[str, str, str, str]],
+    referential: "QuizReferential",
+    seed: Optional[int] = None,
+    stats: Optional["SortingStats"] = None,
+    cache: Optional[ScoreCache] = None,
+) -> list[ScoredSheet]:
+    """Scores the answer sheets of several respondents.
+
+    The answers of a respondent do not need to be contiguous. The results are
+    returned in the order in which the respondents first appear.
+
+    Args:
+        answers: The rows of the answer sheets.
+        referential: The referential holding the weights.
+        seed: The seed used to break ties. Defaults to None (not reproducible).
+        stats: The aggregate recording the answers and the outcomes.
+            Defaults to None (nothing is recorded).
+        cache: The cache of the totals of the sheets. Defaults to None (a new
+            cache).
+
+    Returns:
+        The winning house and the total of each house for each respondent.
+    """
+    totals = accumulate_totals(
+        answers=answers, referential=referential, stats=stats, cache=cache
+    )
+    return decide_houses(
+        totals=totals, houses=referential.houses, seed=seed, stats=stats
+    )
+
+
+def accumulate_totals(
+    answers: Iterable[tuple[str, str, str, str]],
+    referential: "QuizReferential",
+    stats: Optional["SortingStats"] = None,
+    cache: Optional[ScoreCache] = None,
+) -> dict[str, tuple[float, ...]]:
+    """Sums the weights of the answers of each respondent.
+
+    The answers of each respondent are gathered first, then the totals of the
+    whole sheet are taken from the cache, so the identical sheets are only summed
+    once.
+
+    Args:
+        answers: The rows of the answer sheets.
+        referential: The referential holding the weights.
+        stats: The aggregate counting the answers. Defaults to None
+            (nothing is counted).
+        cache: The cache of the totals of the sheets. Defaults to None (a new
+            cache).
+
+    Returns:
+        The total of each house for each respondent, in order of first appearance.
+    """
+    if cache is None:
+        cache = ScoreCache(referential=referential)
+    sheets = gather_sheets(answers=answers, positions=cache.positions, stats=stats)
+
+    return {
+        respondent_id: cache.totals(sheet) for respondent_id, sheet in sheets.items()
+    }
+
+
+def gather_sheets(
+    answers: Iterable[tuple[str, str, str, str]],
+    positions: dict[tuple[str, str, str], int],
+    stats: Optional["SortingStats"] = None,
+) -> dict[str, list[int]]:
+    """Gathers the answers of each respondent.
+
+    Args:
+        answers: The rows of the answer sheets.
+        positions: The position of each answer in the referential.
+        stats: The aggregate counting the answers. Defaults to None
+            (nothing is counted).
+
+    Returns:
+        The position of each answer of each respondent, in order of first
+        appearance.
+    """
+    sheets: dict[str, list[int]] = {}
+    counts = stats.answers if stats is not None else None
+
+    for respondent_id, question_id, variation_id, answer_id in answers:
+        key = (question_id, variation_id, answer_id)
+        try:
+            position = positions[key]
+        except KeyError:
+            raise ValueError(
+                f"Unknown answer {question_id}/{variation_id}/{answer_id} "
+                f"for respondent {respondent_id!r}."
+            ) from None
+
+        if counts is not None:
+            counts[key] += 1
+
+        sheet = sheets.get(respondent_id)
+        if sheet is None:
+            sheets[respondent_id] = [position]
+        else:
+            sheet.append(position)
+
+    return sheets
+
+
+def decide_houses(
+    totals: dict[str, tuple[float, ...]],
+    houses: tuple[str, ...],
+    seed: Optional[int] = None,
+    stats: Optional["SortingStats"] = None,
+) -> list[ScoredSheet]:
+    """Chooses the winning house of each respondent.
+
+    Args:
+        totals: The total of each house for each respondent.
+        houses: The houses, giving the order of the totals.
+        seed: The seed used to break ties. Defaults to None (not reproducible).
+        stats: The aggregate recording the outcomes. Defaults to None
+            (nothing is recorded).
+
+    Returns:
+        The winning house and the total of each house for each respondent.
+    """
+    results = []
+    # Many respondents share the same totals: their scores and best houses are
+    # built once, the scores being the same dict (a tie is still broken for each
+    # respondent).
+    decided: dict[tuple[float, ...], tuple[dict[str, float], list[str]]] = {}
+
+    for respondent_id, total in totals.items():
+        entry = decided.get(total)
+        if entry is None:
+            score = dict(zip(houses, total))
+            entry = decided[total] = (score, get_best_houses(score=score))
+        score, best_houses = entry
+        if len(best_houses) == 1:
+            house = best_houses[0]
+        else:
+            house = get_winning_house(
+                score=score, rng=record_rng(seed=seed, respondent_id=respondent_id)
+            )
+        METRICS.count_house(house=house)
+        if stats is not None:
+            stats.record(house=house, tie=len(best_houses) > 1)
+        results.append(ScoredSheet(respondent_id, house, score))
+
+    return results
+
+
+def record_rng(seed: Optional[int], respondent_id: str) -> Optional[Random]:
+    """Gets the random generator used to break a tie for one respondent.
+
+    The generator only depends on the seed and on the respondent, so a tie is
+    broken the same way whatever the order or the process in which the
+    respondents are scored.
+
+    Args:
+        seed: The seed used to break ties.
+        respondent_id: The respondent whose tie should be broken.
+
+    Returns:
+        The random generator, or None (the global one) if there is no seed.
+    """
+    if seed is None:
+        return None
+
+    return Random(f"{seed}:{respondent_id}")
+
+
+def write_results(
+    results: Iterable[ScoredSheet],
+    f: IO[str],
+    fmt: str,
+    houses: tuple[str, ...],
+    flush: bool = False,
+) -> None:
+    """Writes the results of the sorting.
+
+    Args:
+        results: The scored answer sheets.
+        f: The file to write to.
+        fmt: The format of the file, one of FORMATS.
+        houses: The houses, giving the order of the columns of a CSV file.
+        flush: A flag to flush the file after each result, for instance when
+            writing to a pipe. Defaults to False.
+    """
+    if fmt == "csv":
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(("respondent_id", "house") + houses)
+        rows = (
+            (result.respondent_id, result.house, *map(result.scores.get, houses))
+            for result in results
+        )
+        if not flush:
+            writer.writerows(rows)
+            return
+        f.flush()
+        for row in rows:
+            writer.writerow(row)
+            f.flush()
+
+    elif fmt == "jsonl":
+        for result in results:
+            f.write(json.dumps(result._asdict(), ensure_ascii=False) + "\n")
+            if flush:
+                f.flush()
+
+    else:
+        raise ValueError(f"The format should be one of {', '.join(FORMATS)}.")
+
+
+def score_file(
+    input_file: IO[str],
+    output_file: IO[str],
+    referential: "QuizReferential",
+    input_format: str,
+    output_format: str,
+    seed: Optional[int] = None,
+    stats: Optional["SortingStats"] = None,
+    log: Optional["ResultLog"] = None,
+    engine: str = "python",
+) -> int:
+    """Scores a file of answer sheets and writes the results.
+
+    Args:
+        input_file: The file with the answer sheets.
+        output_file: The file to write the results to.
+        referential: The referential holding the weights.
+        input_format: The format of the input file, one of FORMATS.
+        output_format: The format of the output file, one of FORMATS.
+        seed: The seed used to break ties. Defaults to None (not reproducible).
+        stats: The aggregate recording the answers and the outcomes.
+            Defaults to None (nothing is recorded).
+        log: The result log each sorting is appended to, with its answers.
+            Defaults to None (nothing is kept).
+        engine: The engine computing the totals, one of ENGINES: "python", or
+            "numpy" to score every sheet at once with NumPy (which must be
+            installed). The results are the same. Defaults to "python".
+
+    Returns:
+        The number of scored answer sheets.
+    """
+    answers: Iterable[tuple[str, str, str, str]] = read_answers(
+        f=input_file, fmt=input_format
+    )
+    if log is not None:
+        # The answers are read again to be logged along with the results.
+        answers = list(answers)
+
+    if engine == "numpy":
+        from sorting_hat.vectorized import VectorizedScorer
+
+        results = VectorizedScorer(referential=referential).score_answers(
+            answers=answers, seed=seed, stats=stats
+        )
+    else:
+        results = score_answers(
+            answers=answers, referential=referential, seed=seed, stats=stats
+        )
+    write_results(
+        results=results, f=output_file, fmt=output_format, houses=referential.houses
+    )
+
+    if log is not None:
+        log_results(results=results, answers=answers, log=log)
+
+    return len(results)
+
+
+def log_results(
+    results: Iterable[ScoredSheet],
+    answers: Iterable[tuple[str, str, str, str]],
+    log: "ResultLog",
+) -> None:
+    """Appends scored answer sheets to a result log.
+
+    Args:
+        results: The scored answer sheets.
+        answers: The rows of the answer sheets.
+        log: The result log.
+    """
+    answered = defaultdict(list)
+    for respondent_id, question_id, variation_id, answer_id in answers:
+        answered[respondent_id].append((question_id, variation_id, answer_id))
+
+    for result in results:
+        log.append(
+            respondent_id=result.respondent_id,
+            answers=answered[result.respondent_id],
+            house=result.house,
+            scores=result.scores,
+            tie=len(get_best_houses(score=result.scores)) > 1,
+        )
@@ -0,0 +1,268 @@
+"""This module compiles the referential into a compact binary file.
+
+Parsing the CSV files of the referential is the main cost when the sorting hat
+starts. The referential is thus compiled once into a binary file stored in the
+cache directory of the user: every string is stored once and referred to by its
+position, and the weights are packed as doubles. Later runs load it with a single
+read. The file is tagged with a hash of the CSV files so that a stale cache is
+rebuilt as soon as the referential changes.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from importlib import resources
+from pathlib import Path
+from typing import Optional
+
+from sorting_hat.referential import QuizReferential
+
+FILENAMES = ("questions.csv", "answers.csv", "weights.csv")
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"SHAT"
+_HEADER = struct.Struct("<4sH32s")
+_COUNT = struct.Struct("<I")
+
+
+def get_cache_dir() -> Path:
+    """Gets the directory where the compiled referentials are stored.
+
+    The directory can be set with the SORTING_HAT_CACHE_DIR environment variable.
+
+    Returns:
+        The cache directory.
+    """
+    if "SORTING_HAT_CACHE_DIR" in os.environ:
+        return Path(os.environ["SORTING_HAT_CACHE_DIR"])
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+
+    return Path(base) / "sorting-hat"
+
+
+def get_cache_path(package: str = "sorting_hat.data") -> Path:
+    """Gets the path of the compiled referential of a package.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The path of the compiled referential.
+    """
+    return get_cache_dir() / f"{package}.bin"
+
+
+def hash_package(package: str = "sorting_hat.data") -> bytes:
+    """Hashes the CSV files of a package.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The digest of the CSV files, of the format version and of the byte order.
+    """
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{sys.byteorder}".encode())
+
+    for filename in FILENAMES:
+        digest.update(resources.files(package).joinpath(filename).read_bytes())
+
+    return digest.digest()
+
+
+def compile_referential(package: str = "sorting_hat.data") -> Path:
+    """Compiles the referential of a package into the cache directory.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The path of the compiled referential.
+    """
+    path = get_cache_path(package=package)
+    _write(
+        path=path,
+        content=dump(
+            referential=QuizReferential.from_package(package=package),
+            digest=hash_package(package=package),
+        ),
+    )
+    return path
+
+
+def load_compiled(package: str = "sorting_hat.data") -> QuizReferential:
+    """Loads the compiled referential of a package, compiling it if needed.
+
+    The CSV files are used directly if the cache directory cannot be written to.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The referential.
+    """
+    digest = hash_package(package=package)
+    path = get_cache_path(package=package)
+
+    try:
+        referential = load(content=path.read_bytes(), digest=digest)
+    except (OSError, ValueError, struct.error):
+        referential = None
+
+    if referential is not None:
+        return referential
+
+    referential = QuizReferential.from_package(package=package)
+    try:
+        _write(path=path, content=dump(referential=referential, digest=digest))
+    except OSError:
+        pass
+
+    return referential
+
+
+def _write(path: Path, content: bytes) -> None:
+    """Writes a compiled referential atomically.
+
+    Args:
+        path: The path of the compiled referential.
+        content: The packed referential.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file first so that a reader never sees a partial file.
+    temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary_path.write_bytes(content)
+    os.replace(temporary_path, path)
+
+
+def dump(referential: QuizReferential, digest: bytes) -> bytes:
+    """Packs a referential into bytes.
+
+    Args:
+        referential: The referential to pack.
+        digest: The hash of the CSV files the referential was built from.
+
+    Returns:
+        The packed referential.
+    """
+    strings: dict[str, int] = {}
+
+    def intern(string: str) -> int:
+        """Gets the position of a string in the table of strings."""
+        return strings.setdefault(string, len(strings))
+
+    questions = array(
+        "I",
+        [
+            intern(value)
+            for (question_id, variation_id), text in referential.variation_texts.items()
+            for value in (question_id, variation_id, text)
+        ],
+    )
+    answers = array(
+        "I",
+        [
+            intern(value)
+            for (question_id, variation_id), texts in referential.answer_texts.items()
+            for text in texts
+            for value in (question_id, variation_id, text)
+        ],
+    )
+    houses = array("I", [intern(house) for house in referential.houses])
+    weight_keys = array(
+        "I", [intern(value) for key in referential.weights for value in key]
+    )
+    weight_values = array(
+        "d", [weight for vector in referential.weights.values() for weight in vector]
+    )
+
+    encoded = [string.encode("utf-8") for string in strings]
+    lengths = array("I", [len(string) for string in encoded])
+
+    parts = [_HEADER.pack(_MAGIC, FORMAT_VERSION, digest)]
+    for values in (lengths, questions, answers, houses, weight_keys):
+        parts.append(_COUNT.pack(len(values)))
+        parts.append(values.tobytes())
+    parts.append(weight_values.tobytes())
+    parts.extend(encoded)
+
+    return b"".join(parts)
+
+
+def load(content: bytes, digest: Optional[bytes] = None) -> Optional[QuizReferential]:
+    """Unpacks a referential.
+
+    Args:
+        content: The packed referential.
+        digest: The expected hash of the CSV files. Defaults to None (not checked).
+
+    Returns:
+        The referential, or None if it was packed from other CSV files.
+    """
+    view = memoryview(content)
+    magic, version, content_digest = _HEADER.unpack_from(view)
+
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        raise ValueError("The file is not a compiled referential of this version.")
+    if digest is not None and content_digest != digest:
+        return None
+
+    offset = _HEADER.size
+    sections = []
+    for _ in range(5):
+        (count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        values = array("I")
+        values.frombytes(view[offset : offset + count * values.itemsize])
+        offset += count * values.itemsize
+        sections.append(values)
+    lengths, questions, answers, houses, weight_keys = sections
+
+    number_of_houses = len(houses)
+    weight_values = array("d")
+    size = len(weight_keys) // 3 * number_of_houses * weight_values.itemsize
+    weight_values.frombytes(view[offset : offset + size])
+    offset += size
+
+    strings = []
+    for length in lengths:
+        strings.append(sys.intern(str(view[offset : offset + length], "utf-8")))
+        offset += length
+
+    if offset != len(content):
+        raise ValueError("The compiled referential is truncated or corrupted.")
+
+    variation_texts = {
+        (strings[questions[i]], strings[questions[i + 1]]): strings[questions[i + 2]]
+        for i in range(0, len(questions), 3)
+    }
+
+    answer_texts: dict[tuple[str, str], list[str]] = {}
+    for i in range(0, len(answers), 3):
+        key = (strings[answers[i]], strings[answers[i + 1]])
+        answer_texts.setdefault(key, []).append(strings[answers[i + 2]])
+
+    weights = {
+        (
+            strings[weight_keys[3 * i]],
+            strings[weight_keys[3 * i + 1]],
+            strings[weight_keys[3 * i + 2]],
+        ): tuple(
+            weight_values[number_of_houses * i : number_of_houses * (i + 1)].tolist()
+        )
+        for i in range(len(weight_keys) // 3)
+    }
+
+    return QuizReferential.from_indexes(
+        variation_texts=variation_texts,
+        answer_texts=answer_texts,
+        houses=tuple(strings[i] for i in houses),
+        weights=weights,
+    )
@@ -0,0 +1,400 @@
+"""This module adjusts the weights so that the houses reach a target distribution.
+
+The house of a respondent depends on the weights of the few answers they gave, so
+changing the weights of one answer only changes the house of the respondents who
+gave it. The optimizer thus works on a fixed sample of simulated respondents,
+drawn once from the priors of the answers, and indexes them by answer: after a
+change of the weights of one answer, only the totals and the houses of these
+respondents are computed again.
+
+Each step moves a small amount of weight of one answer from one house to another,
+so the weights of every answer still sum to one and stay non-negative, and keeps
+the move if it brings the distribution of the houses closer to the target without
+straying too far from the original weights. The weights are handled as integers
+over a common denominator, so moving weight back and forth is exact and the ties
+are detected without any rounding error.
+
+The distribution before and after the calibration is then computed exactly with
+the analyze module.
+"""
+
+import csv
+import time
+from fractions import Fraction
+from math import lcm
+from random import Random
+from typing import IO, Iterator, NamedTuple, Optional
+
+from sorting_hat.analyze import Analysis, Prior, _get_scale, analyze
+from sorting_hat.referential import QuizReferential
+
+Key = tuple[str, str, str]
+
+
+class Calibration(NamedTuple):
+    """The weights found by the calibration, with the distributions they give."""
+
+    referential: QuizReferential  # The referential with the calibrated weights.
+    target: dict[str, float]
+    before: Analysis
+    after: Analysis
+    steps: int
+    accepted: int
+    changed_answers: int
+    seconds: float
+
+
+class IncrementalEvaluator:
+    """Evaluates the distribution of the houses on a sample of respondents.
+
+    Args:
+        referential: The referential of questions, answers and weights.
+        scale: The factor turning every weight into an integer.
+        respondents: The number of simulated respondents. Defaults to 20 000.
+        seed: The seed of the sample. Defaults to 0.
+        long_quiz: A flag to ask every variation of each question. Defaults to False.
+        priors: The relative probability of each answer, keyed by
+            (question_id, variation_id). Defaults to None (uniform answers).
+    """
+
+    def __init__(
+        self,
+        referential: QuizReferential,
+        scale: int,
+        respondents: int = 20_000,
+        seed: int = 0,
+        long_quiz: bool = False,
+        priors: Optional[dict[tuple[str, str], Prior]] = None,
+    ) -> None:
+        """Initializes the class."""
+        priors = priors or {}
+        rng = Random(seed)
+        number_of_houses = len(referential.houses)
+        self.respondents = respondents
+        # A tie between k houses gives each of them 1/k: the shares are counted
+        # in units of 1 / lcm(1, ..., number of houses) to stay integers.
+        self.unit = lcm(*range(1, number_of_houses + 1))
+        self.weights: dict[Key, list[int]] = {
+            key: [int(Fraction(repr(weight)) * scale) for weight in vector]
+            for key, vector in referential.weights.items()
+        }
+
+        variations_per_question: dict[str, list[tuple[str, str]]] = {}
+        for key in referential.variations:
+            variations_per_question.setdefault(key[0], []).append(key)
+        answers: dict[tuple[str, str], tuple[list[Key], list[float]]] = {}
+        for key in referential.variations:
+            number_of_answers = len(referential.answer_texts[key])
+            answers[key] = (
+                [
+                    (*key, str(answer_id))
+                    for answer_id in range(1, number_of_answers + 1)
+                ],
+                [float(p) for p in priors.get(key, [1] * number_of_answers)],
+            )
+
+        self.totals: list[list[int]] = []
+        self.by_answer: dict[Key, list[int]] = {key: [] for key in self.weights}
+        for respondent in range(respondents):
+            if long_quiz:
+                variations = referential.variations
+            else:
+                variations = [
+                    rng.choice(keys) for keys in variations_per_question.values()
+                ]
+            total = [0] * number_of_houses
+            for variation in variations:
+                keys, prior = answers[variation]
+                (key,) = rng.choices(keys, weights=prior)
+                self.by_answer[key].append(respondent)
+                for house, weight in enumerate(self.weights[key]):
+                    total[house] += weight
+            self.totals.append(total)
+
+        self.shares = [0] * number_of_houses
+        self.winners = [self._get_winners(total=total) for total in self.totals]
+        for winners in self.winners:
+            self._add_share(shares=self.shares, winners=winners, sign=1)
+
+    def distribution(self) -> list[float]:
+        """Gets the share of the respondents sorted into each house.
+
+        Returns:
+            The probability of each house, in the order of the referential.
+        """
+        return [share / (self.unit * self.respondents) for share in self.shares]
+
+    def distribution_after(
+        self, key: Key, source: int, destination: int, amount: int
+    ) -> list[float]:
+        """Gets the distribution the houses would have after a move, without it.
+
+        Only the respondents who gave the answer are scored again.
+
+        Args:
+            key: The (question_id, variation_id, answer_id) of the answer.
+            source: The position of the house losing the weight.
+            destination: The position of the house gaining the weight.
+            amount: The weight moved, as an integer.
+
+        Returns:
+            The probability of each house, in the order of the referential.
+        """
+        shares = self.shares[:]
+        for _, winners, new_winners in self._rescore(
+            key=key, source=source, destination=destination, amount=amount
+        ):
+            self._add_share(shares=shares, winners=winners, sign=-1)
+            self._add_share(shares=shares, winners=new_winners, sign=1)
+
+        return [share / (self.unit * self.respondents) for share in shares]
+
+    def move(self, key: Key, source: int, destination: int, amount: int) -> None:
+        """Moves weight of an answer from one house to another.
+
+        Args:
+            key: The (question_id, variation_id, answer_id) of the answer.
+            source: The position of the house losing the weight.
+            destination: The position of the house gaining the weight.
+            amount: The weight moved, as an integer.
+        """
+        vector = self.weights[key]
+        vector[source] -= amount
+        vector[destination] += amount
+
+        changes = list(
+            self._rescore(
+                key=key, source=source, destination=destination, amount=amount
+            )
+        )
+        for respondent in self.by_answer[key]:
+            total = self.totals[respondent]
+            total[source] -= amount
+            total[destination] += amount
+        for respondent, winners, new_winners in changes:
+            self.winners[respondent] = new_winners
+            self._add_share(shares=self.shares, winners=winners, sign=-1)
+            self._add_share(shares=self.shares, winners=new_winners, sign=1)
+
+    def _rescore(
+        self, key: Key, source: int, destination: int, amount: int
+    ) -> Iterator[tuple[int, tuple[int, ...], tuple[int, ...]]]:
+        """Finds the respondents whose house a move would change.
+
+        Args:
+            key: The (question_id, variation_id, answer_id) of the answer.
+            source: The position of the house losing the weight.
+            destination: The position of the house gaining the weight.
+            amount: The weight moved, as an integer.
+
+        Yields:
+            The respondent and their winning houses before and after the move.
+        """
+        totals, all_winners = self.totals, self.winners
+        for respondent in self.by_answer[key]:
+            total = totals[respondent][:]
+            total[source] -= amount
+            total[destination] += amount
+            winners = all_winners[respondent]
+            new_winners = self._get_winners(total=total)
+            if new_winners != winners:
+                yield respondent, winners, new_winners
+
+    @staticmethod
+    def _get_winners(total: list[int]) -> tuple[int, ...]:
+        """Gets the houses with the best total.
+
+        Args:
+            total: The total of each house of a respondent.
+
+        Returns:
+            The positions of the winning houses.
+        """
+        best = max(total)
+        if total.count(best) == 1:
+            return (total.index(best),)
+        return tuple(house for house, value in enumerate(total) if value == best)
+
+    def _add_share(
+        self, shares: list[int], winners: tuple[int, ...], sign: int
+    ) -> None:
+        """Adds (or removes) a respondent to the shares of their winning houses.
+
+        Args:
+            shares: The shares of the houses, updated in place.
+            winners: The positions of the winning houses of the respondent.
+            sign: 1 to add the respondent, -1 to remove them.
+        """
+        share = sign * self.unit // len(winners)
+        for house in winners:
+            shares[house] += share
+
+
+def calibrate(
+    referential: QuizReferential,
+    target: Optional[dict[str, float]] = None,
+    priors: Optional[dict[tuple[str, str], Prior]] = None,
+    long_quiz: bool = False,
+    steps: int = 5000,
+    step: float = 0.1,
+    closeness: float = 0.001,
+    respondents: int = 20_000,
+    seed: int = 0,
+) -> Calibration:
+    """Searches for weights giving a target distribution of the houses.
+
+    Args:
+        referential: The referential of questions, answers and weights.
+        target: The wanted probability of each house. Defaults to None (uniform).
+        priors: The relative probability of each answer, keyed by
+            (question_id, variation_id). Defaults to None (uniform answers).
+        long_quiz: A flag to ask every variation of each question. Defaults to False.
+        steps: The number of moves tried. Defaults to 5000.
+        step: The weight moved by each step. Defaults to 0.1.
+        closeness: How much a move away from the original weights is penalized,
+            per squared unit of weight. Defaults to 0.001.
+        respondents: The number of simulated respondents. Defaults to 20 000.
+        seed: The seed of the sample and of the moves. Defaults to 0.
+
+    Returns:
+        The calibrated referential and the distributions before and after.
+    """
+    start = time.perf_counter()
+    houses = referential.houses
+    target = get_target(houses=houses, target=target)
+    target_vector = [target[house] for house in houses]
+
+    amount = Fraction(str(step))
+    scale = lcm(_get_scale(referential=referential), amount.denominator)
+    amount_units = int(amount * scale)
+    if amount_units <= 0:
+        raise ValueError("The step should be positive.")
+
+    evaluator = IncrementalEvaluator(
+        referential=referential,
+        scale=scale,
+        respondents=respondents,
+        seed=seed,
+        long_quiz=long_quiz,
+        priors=priors,
+    )
+    original = {key: tuple(vector) for key, vector in evaluator.weights.items()}
+    keys = [key for key, respondents in evaluator.by_answer.items() if respondents]
+    penalty = closeness / scale**2
+    rng = Random(seed)
+
+    def distance(key: Key, vector: list[int]) -> int:
+        """Gets the squared distance of the weights of an answer to the original."""
+        return sum((value - first) ** 2 for value, first in zip(vector, original[key]))
+
+    def error(distribution: list[float]) -> float:
+        """Gets the squared distance of a distribution to the target."""
+        return sum((p - t) ** 2 for p, t in zip(distribution, target_vector))
+
+    current = error(distribution=evaluator.distribution())
+    accepted = 0
+    for _ in range(steps):
+        key = rng.choice(keys)
+        vector = evaluator.weights[key]
+        sources = [house for house, value in enumerate(vector) if value >= amount_units]
+        source = rng.choice(sources)
+        destination = rng.choice([h for h in range(len(houses)) if h != source])
+
+        moved = vector[:]
+        moved[source] -= amount_units
+        moved[destination] += amount_units
+        candidate = error(
+            distribution=evaluator.distribution_after(
+                key=key, source=source, destination=destination, amount=amount_units
+            )
+        )
+        cost = penalty * (distance(key, moved) - distance(key, vector))
+        if candidate + cost < current:
+            evaluator.move(
+                key=key, source=source, destination=destination, amount=amount_units
+            )
+            current = candidate
+            accepted += 1
+
+    calibrated = QuizReferential.from_indexes(
+        variation_texts=referential.variation_texts,
+        answer_texts=referential.answer_texts,
+        houses=houses,
+        weights={
+            key: tuple(float(Fraction(value, scale)) for value in vector)
+            for key, vector in evaluator.weights.items()
+        },
+    )
+
+    return Calibration(
+        referential=calibrated,
+        target=target,
+        before=analyze(referential=referential, long_quiz=long_quiz, priors=priors),
+        after=analyze(referential=calibrated, long_quiz=long_quiz, priors=priors),
+        steps=steps,
+        accepted=accepted,
+        changed_answers=sum(
+            tuple(vector) != original[key] for key, vector in evaluator.weights.items()
+        ),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def get_target(
+    houses: tuple[str, ...], target: Optional[dict[str, float]] = None
+) -> dict[str, float]:
+    """Completes a target distribution of the houses.
+
+    Args:
+        houses: The houses.
+        target: The wanted probability of some houses. Defaults to None:
+            the houses left share what remains evenly.
+
+    Returns:
+        The wanted probability of each house.
+    """
+    target = dict(target or {})
+    unknown = set(target) - set(houses)
+    if unknown:
+        raise ValueError(f"Unknown houses {', '.join(sorted(unknown))}.")
+
+    remaining = 1.0 - sum(target.values())
+    others = [house for house in houses if house not in target]
+    if remaining < -1e-9 or (not others and abs(remaining) > 1e-9):
+        raise ValueError("The target probabilities should sum to 1.")
+
+    for house in others:
+        target[house] = remaining / len(others)
+
+    return target
+
+
+def write_weights(referential: QuizReferential, f: IO[str]) -> None:
+    """Writes the weights of a referential as a weights.csv file.
+
+    Args:
+        referential: The referential holding the weights.
+        f: The file to write to.
+    """
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(("question_id", "variation_id", "answer_id", "house", "weight"))
+    for (question_id, variation_id, answer_id), vector in referential.weights.items():
+        for house, weight in zip(referential.houses, vector):
+            writer.writerow(
+                (question_id, variation_id, answer_id, house, _format_weight(weight))
+            )
+
+
+def _format_weight(weight: float) -> str:
+    """Formats a weight as in the weights.csv file of the package.
+
+    Args:
+        weight: The weight.
+
+    Returns:
+        The shortest decimal, without a leading zero (e.g. "1", "0" or ".35").
+    """
+    if weight == int(weight):
+        return str(int(weight))
+
+    return repr(weight).lstrip("0")
@@ -9,92 +9,100 @@ An option is available to use every possible variation of each question to get a
 (and more robust?) quiz.
 """
 
-import csv
+import random
 from collections import Counter
-from importlib import resources
-from random import randint
+from typing import Optional
+
+from sorting_hat.metrics import timed
+from sorting_hat.model import intern_id
+from sorting_hat.referential import QuizReferential
+from sorting_hat.registry import resolve_referential
 
 
 class ChooseVariations:
     """Chooses randomly a variation for each question.
 
     Args:
-        filename: The filename with the referential of questions to ask.
+        referential: The referential of questions to ask. Defaults to None
+            (the referential of the pack).
         long_quiz: A flag to choose to return all variations for each question
             or not. Defaults to False.
+        rng: The random generator used to choose the variations. Defaults to None
+            (the global one).
+        pack: The name of the quiz pack to use instead of a referential.
+            Defaults to None (the default pack, if no referential is given).
     """
 
-    def __init__(self, filename: str, long_quiz: bool = False) -> None:
+    def __init__(
+        self,
+        referential: Optional[QuizReferential] = None,
+        long_quiz: bool = False,
+        rng: Optional[random.Random] = None,
+        pack: Optional[str] = None,
+    ) -> None:
         """Initializes the class."""
-        self.filename = filename
+        self.referential = resolve_referential(referential=referential, pack=pack)
         self.long_quiz = long_quiz
+        self.rng = rng
 
+    @timed("choose_variations")
     def run(self) -> list[dict[str, str]]:
         """Chooses randomly a variation for each question.
 
         Returns:
             The variation chosen for each question.
         """
-        questions = self._load_questions()
+        variations = self.referential.variations
 
         if self.long_quiz:
-            for question in questions:
-                question.pop("variation_text")
-            return questions
-
-        number_of_variations = self._get_number_of_variations(questions=questions)
-        return self._choose_variation(questions=number_of_variations)
-
-    def _load_questions(self) -> list[dict[str, str]]:
-        """Loads the referential of questions.
-
-        Returns:
-            The referential of questions.
-        """
-        questions = []
+            return [
+                {"question_id": question_id, "variation_id": variation_id}
+                for question_id, variation_id in variations
+            ]
 
-        with resources.open_text(
-            package="sorting_hat.data", resource=self.filename, encoding="utf-8"
-        ) as f:
-            reader = csv.DictReader(f=f)
-            for row in reader:
-                questions.append(row)
-
-        return questions
+        number_of_variations = self._get_number_of_variations(variations=variations)
+        return self._choose_variation(questions=number_of_variations, rng=self.rng)
 
     @staticmethod
-    def _choose_variation(questions: list[dict[str, int]]) -> list[dict[str, str]]:
+    def _choose_variation(
+        questions: list[dict[str, int]], rng: Optional[random.Random] = None
+    ) -> list[dict[str, str]]:
         """Chooses randomly a variation for each question.
 
         Args:
             questions: A list of questions with the id and the number of variations.
+            rng: The random generator to use. Defaults to None (the global one).
 
         Returns:
             The chosen variation for the given question.
         """
+        randint = random.randint if rng is None else rng.randint
+
         return [
             {
                 "question_id": question["question_id"],
-                "variation_id": str(randint(a=1, b=question["number_of_variations"])),
+                "variation_id": intern_id(
+                    str(randint(a=1, b=question["number_of_variations"]))
+                ),
             }
             for question in questions
         ]
 
     @staticmethod
     def _get_number_of_variations(
-        questions: list[dict[str, str]]
+        variations: list[tuple[str, str]]
     ) -> list[dict[str, int]]:
         """Gets the number of variations for each question.
 
         Args:
-            questions: The referential of questions.
+            variations: The (question_id, variation_id) of every variation.
 
         Returns:
             The number of existing variations for each question.
         """
         number_of_variations = []
 
-        counter = Counter(question["question_id"] for question in questions)
+        counter = Counter(question_id for question_id, _ in variations)
 
         for question_id, n_variations in counter.items():
             number_of_variations.append(
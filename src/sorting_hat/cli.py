@@ -1,15 +1,72 @@
-"""This module defines the commands available after installing the library."""
+"""This module defines the commands available after installing the library.
+
+Each command imports what it needs when it runs, so that the commands which
+do not ask any question (and `sorting-hat --help`) do not pay for the import of
+the interactive prompt.
+"""
+
+from typing import IO, TYPE_CHECKING, Optional
 
 import click
 
-from sorting_hat.choose_variations import ChooseVariations
-from sorting_hat.sorting_hat import SortingHat
+from sorting_hat.batch import ENGINES, FORMATS
+
+if TYPE_CHECKING:
+    from fractions import Fraction
+
+    from sorting_hat.referential import QuizReferential
 
 
 @click.group()
-def cli() -> None:
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Record the time spent in each phase and write the report to this file "
+    "(also set with SORTING_HAT_PROFILE).",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(("json", "prometheus")),
+    default=None,
+    help='The format of the report. Defaults to "prometheus" for a ".prom" file '
+    'and to "json" otherwise.',
+)
+@click.option(
+    "--stats-dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    envvar="SORTING_HAT_STATS_DIR",
+    help="Aggregate the houses, the answers and the ties of the sortings and write "
+    "a snapshot to this directory (also set with SORTING_HAT_STATS_DIR).",
+)
+def cli(
+    profile_path: Optional[str], profile_format: Optional[str], stats_dir: Optional[str]
+) -> None:
     """Finds all the available commands below."""
-    pass
+    if stats_dir is not None:
+        from sorting_hat.stats import SortingStats, write_snapshot
+
+        stats = SortingStats()
+
+        def write() -> None:
+            """Writes the snapshot, unless the command recorded nothing."""
+            if stats.sortings or stats.answers:
+                write_snapshot(stats=stats, directory=stats_dir)
+
+        # The aggregate is given to the commands which score sortings.
+        click.get_current_context().obj = stats
+        click.get_current_context().call_on_close(write)
+
+    if profile_path is not None:
+        from pathlib import Path
+
+        from sorting_hat.metrics import enable, write_report
+
+        enable(path=Path(profile_path), fmt=profile_format, at_exit=False)
+        # The report is written even if the command exits early.
+        click.get_current_context().call_on_close(write_report)
 
 
 @cli.command()
@@ -20,15 +77,1035 @@ def cli() -> None:
     default=False,
     help="Use the longer quiz (every variation of each question will be asked).",
 )
-def sort(long_quiz: bool) -> None:
+@click.option(
+    "--early-stop",
+    is_flag=True,
+    default=False,
+    help="Stop asking questions as soon as the house is decided.",
+)
+@click.option(
+    "--information-gain",
+    is_flag=True,
+    default=False,
+    help="Ask the most informative question first (implies --early-stop).",
+)
+@click.option(
+    "--pack",
+    default="default",
+    show_default=True,
+    help="The quiz pack to use (see `sorting-hat packs`).",
+)
+@click.option(
+    "--prompt",
+    "prompt_name",
+    type=click.Choice(("menu", "stdin")),
+    default=None,
+    help="Ask the questions with an interactive menu, or with numbered answers read "
+    "from the standard input. Defaults to the menu in a terminal.",
+)
+@click.option(
+    "--log",
+    "log_dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    envvar="SORTING_HAT_RESULT_LOG",
+    help="Append the sorting to the result log of this directory, read with "
+    "`sorting-hat query` (also set with SORTING_HAT_RESULT_LOG).",
+)
+def sort(
+    long_quiz: bool,
+    early_stop: bool,
+    information_gain: bool,
+    pack: str,
+    prompt_name: Optional[str],
+    log_dir: Optional[str],
+) -> None:
     """Starts the sorting."""
-    chosen_variations = ChooseVariations(
-        filename="questions.csv", long_quiz=long_quiz
-    ).run()
-
-    SortingHat(
-        questions="questions.csv",
-        answers="answers.csv",
-        weights="weights.csv",
+    import sys
+
+    from sorting_hat.choose_variations import ChooseVariations
+    from sorting_hat.prompt import QuestionaryPrompt, QuizCancelled, StdinPrompt
+    from sorting_hat.sorting_hat import SortingHat
+
+    try:
+        chosen_variations = ChooseVariations(long_quiz=long_quiz, pack=pack)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--pack")
+
+    if prompt_name is None:
+        prompt_name = "menu" if sys.stdin.isatty() else "stdin"
+
+    log = None
+    if log_dir is not None:
+        from sorting_hat.result_log import ResultLog
+
+        # Opened before the quiz, so that a pack which cannot be logged is refused
+        # before any question is asked.
+        try:
+            log = ResultLog(
+                directory=log_dir, referential=chosen_variations.referential
+            )
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--log")
+
+    try:
+        result = SortingHat(
+            referential=chosen_variations.referential,
+            chosen_variations=chosen_variations.run(),
+            early_stop=early_stop or information_gain,
+            information_gain=information_gain,
+            stats=click.get_current_context().obj,
+            prompt=QuestionaryPrompt() if prompt_name == "menu" else StdinPrompt(),
+        ).run()
+    except QuizCancelled:
+        if log is not None:
+            log.close()
+        click.get_current_context().exit()
+
+    if log is not None:
+        import uuid
+
+        from sorting_hat.scoring import get_best_houses
+
+        with log:
+            log.append(
+                respondent_id=uuid.uuid4().hex,
+                answers=[
+                    (answer["question_id"], answer["variation_id"], answer["answer_id"])
+                    for answer in result.answers
+                ],
+                house=result.house,
+                scores=result.scores,
+                pack=pack,
+                tie=len(get_best_houses(score=result.scores)) > 1,
+            )
+
+
+@cli.command()
+@click.argument("input_file", metavar="INPUT", type=click.File("r"), default="-")
+@click.option(
+    "-o",
+    "--output",
+    "output_file",
+    type=click.File("w"),
+    default="-",
+    help="The file to write the results to. Defaults to the standard output.",
+)
+@click.option(
+    "--input-format",
+    type=click.Choice(FORMATS),
+    default=None,
+    help="The format of the answer sheets. Guessed from the extension by default.",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(FORMATS),
+    default=None,
+    help="The format of the results. Defaults to the format of the answer sheets.",
+)
+@click.option("--seed", type=int, default=None, help="The seed used to break the ties.")
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Emit each result as soon as the quiz of a respondent is complete.",
+)
+@click.option(
+    "-l",
+    "--long-quiz",
+    is_flag=True,
+    default=False,
+    help="With --stream, a quiz is complete once every variation is answered.",
+)
+@click.option(
+    "--idle-timeout",
+    type=float,
+    default=3600.0,
+    show_default=True,
+    help="With --stream, the seconds after which an idle respondent is dropped.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="The number of processes scoring the answer sheets (not with --stream).",
+)
+@click.option(
+    "--log",
+    "log_dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    envvar="SORTING_HAT_RESULT_LOG",
+    help="Append each sorting, with its answers, to the result log of this "
+    "directory, read with `sorting-hat query` (also set with SORTING_HAT_RESULT_LOG).",
+)
+@click.option(
+    "--reload",
+    "reload_data",
+    is_flag=True,
+    default=False,
+    help="With --stream, reload the quiz data when its CSV files change.",
+)
+@click.option(
+    "--reload-interval",
+    type=click.FloatRange(min=0.1),
+    default=2.0,
+    show_default=True,
+    help="With --reload, the seconds between two checks of the CSV files.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default="python",
+    show_default=True,
+    help='Sum the totals of every answer sheet at once with NumPy with "numpy" '
+    "(installed with `pip install sorting-hat[numpy]`), not with --stream or several "
+    "workers.",
+)
+def score(
+    input_file: IO[str],
+    output_file: IO[str],
+    input_format: Optional[str],
+    output_format: Optional[str],
+    seed: Optional[int],
+    stream: bool,
+    long_quiz: bool,
+    idle_timeout: float,
+    workers: int,
+    log_dir: Optional[str],
+    reload_data: bool,
+    reload_interval: float,
+    engine: str,
+) -> None:
+    """Scores answer sheets without asking any question.
+
+    Each row of INPUT gives the respondent_id, question_id, variation_id and
+    answer_id of one answer. INPUT can be a CSV or a JSONL file
+    (or "-" for the standard input, read as JSONL with --stream).
+    """
+    from sorting_hat.batch import guess_format, read_answers, score_file, write_results
+    from sorting_hat.referential import load_referential
+
+    if input_format is None:
+        if stream and input_file.name == "<stdin>":
+            input_format = "jsonl"
+        else:
+            try:
+                input_format = guess_format(filename=input_file.name)
+            except ValueError as error:
+                raise click.BadParameter(str(error), param_hint="--input-format")
+
+    if workers > 1 and (stream or input_file.name == "<stdin>"):
+        raise click.BadParameter(
+            "Several workers can only score a file, not a stream.",
+            param_hint="--workers",
+        )
+
+    if log_dir is not None and (stream or workers > 1):
+        raise click.BadParameter(
+            "The result log is only written by a single worker, without --stream.",
+            param_hint="--log",
+        )
+
+    if engine == "numpy":
+        if stream or workers > 1:
+            raise click.BadParameter(
+                "The numpy engine scores a whole file in a single process.",
+                param_hint="--engine",
+            )
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise click.UsageError(
+                "The numpy engine needs NumPy: pip install sorting-hat[numpy]"
+            ) from None
+
+    if reload_data and not stream:
+        raise click.BadParameter(
+            "Only a stream is scored long enough to reload the quiz data.",
+            param_hint="--reload",
+        )
+
+    if stream:
+        from sorting_hat.stream import StreamScorer
+
+        referential = load_referential()
+        scorer = StreamScorer(
+            referential=referential,
+            long_quiz=long_quiz,
+            idle_timeout=idle_timeout,
+            seed=seed,
+            stats=click.get_current_context().obj,
+        )
+        watcher = None
+        if reload_data:
+            from sorting_hat.registry import DEFAULT_PACK, get_registry
+            from sorting_hat.reload import ReferentialWatcher
+
+            _log_reloads()
+            watcher = ReferentialWatcher(
+                name=DEFAULT_PACK,
+                directory=get_registry().packs[DEFAULT_PACK].location,
+                on_reload=lambda referential, _: scorer.reload(referential),
+                interval=reload_interval,
+            )
+            watcher.start()
+
+        try:
+            write_results(
+                results=scorer.run(read_answers(f=input_file, fmt=input_format)),
+                f=output_file,
+                fmt=output_format or input_format,
+                houses=referential.houses,
+                flush=True,
+            )
+        finally:
+            if watcher is not None:
+                watcher.stop()
+        return
+
+    if workers > 1:
+        from sorting_hat.parallel import score_file_parallel
+
+        score_file_parallel(
+            path=input_file.name,
+            output_file=output_file,
+            input_format=input_format,
+            output_format=output_format or input_format,
+            workers=workers,
+            seed=seed,
+            stats=click.get_current_context().obj,
+        )
+        return
+
+    referential = load_referential()
+    log = None
+    if log_dir is not None:
+        from sorting_hat.result_log import ResultLog
+
+        log = ResultLog(directory=log_dir, referential=referential)
+
+    try:
+        score_file(
+            input_file=input_file,
+            output_file=output_file,
+            referential=referential,
+            input_format=input_format,
+            output_format=output_format or input_format,
+            seed=seed,
+            stats=click.get_current_context().obj,
+            log=log,
+            engine=engine,
+        )
+    finally:
+        if log is not None:
+            log.close()
+
+
+@cli.command()
+@click.option(
+    "-l",
+    "--long-quiz",
+    is_flag=True,
+    default=False,
+    help="Analyze the longer quiz (every variation of each question is asked).",
+)
+@click.option(
+    "--chosen",
+    is_flag=True,
+    default=False,
+    help="Analyze a single random draw of the variations instead of all of them.",
+)
+@click.option(
+    "--priors",
+    "priors_file",
+    type=click.File("r"),
+    default=None,
+    help='A JSON file with the relative probability of each answer, e.g. {"1/2": '
+    "[1, 2, 1, 1]}. Answers are uniform by default.",
+)
+@click.option(
+    "--exact",
+    is_flag=True,
+    default=False,
+    help="Print the probabilities as exact fractions.",
+)
+def analyze(
+    long_quiz: bool, chosen: bool, priors_file: Optional[IO[str]], exact: bool
+) -> None:
+    """Computes the probability of each house."""
+    import json
+
+    from sorting_hat.analyze import analyze as analyze_quiz
+    from sorting_hat.choose_variations import ChooseVariations
+    from sorting_hat.referential import load_referential
+
+    referential = load_referential()
+
+    chosen_variations = None
+    if chosen:
+        chosen_variations = ChooseVariations(
+            referential=referential, long_quiz=long_quiz
+        ).run()
+        click.echo(
+            "Variations: "
+            + " ".join(
+                f"{variation['question_id']}/{variation['variation_id']}"
+                for variation in chosen_variations
+            )
+        )
+
+    priors = None
+    if priors_file is not None:
+        priors = {
+            tuple(key.split("/")): values
+            for key, values in json.load(priors_file).items()
+        }
+
+    result = analyze_quiz(
+        referential=referential,
         chosen_variations=chosen_variations,
-    ).run()
+        long_quiz=long_quiz,
+        priors=priors,
+    )
+
+    def format_probability(probability: "Fraction") -> str:
+        """Formats a probability as a percentage or as an exact fraction."""
+        return str(probability) if exact else f"{float(probability):.4%}"
+
+    click.echo(f"{'house':<12} {'probability':>12} {'outright':>12} {'from ties':>12}")
+    for house in referential.houses:
+        click.echo(
+            f"{house:<12} "
+            f"{format_probability(result.probabilities[house]):>12} "
+            f"{format_probability(result.outright[house]):>12} "
+            f"{format_probability(result.from_ties[house]):>12}"
+        )
+    click.echo(f"Probability of a tie: {format_probability(result.tie_probability)}")
+
+
+@cli.command()
+@click.option(
+    "-o",
+    "--output",
+    "output_file",
+    type=click.File("w"),
+    required=True,
+    help="The file to write the calibrated weights to, as a weights.csv file.",
+)
+@click.option(
+    "--target",
+    "targets",
+    multiple=True,
+    metavar="HOUSE=PROBABILITY",
+    help="The wanted probability of a house, e.g. serpentard=0.2 (repeat it for "
+    "several houses). The other houses share what remains evenly.",
+)
+@click.option(
+    "--priors",
+    "priors_file",
+    type=click.File("r"),
+    default=None,
+    help="A JSON file with the relative probability of each answer, as for analyze. "
+    "Answers are uniform by default.",
+)
+@click.option(
+    "-l",
+    "--long-quiz",
+    is_flag=True,
+    default=False,
+    help="Calibrate the longer quiz (every variation of each question is asked).",
+)
+@click.option(
+    "--steps",
+    type=click.IntRange(min=0),
+    default=5000,
+    show_default=True,
+    help="The number of moves of weight tried.",
+)
+@click.option(
+    "--step",
+    type=click.FloatRange(min=0, min_open=True, max=1),
+    default=0.1,
+    show_default=True,
+    help="The weight moved from one house to another by each move.",
+)
+@click.option(
+    "--closeness",
+    type=click.FloatRange(min=0),
+    default=0.001,
+    show_default=True,
+    help="How much the weights are kept close to the original ones.",
+)
+@click.option(
+    "-n",
+    "--respondents",
+    type=click.IntRange(min=1),
+    default=20_000,
+    show_default=True,
+    help="The number of simulated respondents the moves are evaluated on.",
+)
+@click.option("--seed", type=int, default=0, show_default=True, help="The seed.")
+@click.option(
+    "--pack",
+    default="default",
+    show_default=True,
+    help="The quiz pack whose weights are calibrated.",
+)
+def calibrate(
+    output_file: IO[str],
+    targets: tuple[str, ...],
+    priors_file: Optional[IO[str]],
+    long_quiz: bool,
+    steps: int,
+    step: float,
+    closeness: float,
+    respondents: int,
+    seed: int,
+    pack: str,
+) -> None:
+    """Adjusts the weights so that the houses reach a target distribution.
+
+    The weights of each answer still sum to 1. The distribution of the houses
+    before and after is computed exactly, as with analyze.
+    """
+    import json
+
+    from sorting_hat.calibrate import calibrate as calibrate_weights
+    from sorting_hat.calibrate import write_weights
+    from sorting_hat.registry import get_registry
+
+    try:
+        referential = get_registry().get(name=pack)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--pack")
+
+    target = {}
+    for value in targets:
+        house, _, probability = value.partition("=")
+        try:
+            target[house] = float(probability)
+        except ValueError:
+            raise click.BadParameter(
+                f"{value!r} should be HOUSE=PROBABILITY.", param_hint="--target"
+            )
+
+    priors = None
+    if priors_file is not None:
+        priors = {
+            tuple(key.split("/")): values
+            for key, values in json.load(priors_file).items()
+        }
+
+    try:
+        result = calibrate_weights(
+            referential=referential,
+            target=target,
+            priors=priors,
+            long_quiz=long_quiz,
+            steps=steps,
+            step=step,
+            closeness=closeness,
+            respondents=respondents,
+            seed=seed,
+        )
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+    write_weights(referential=result.referential, f=output_file)
+
+    click.echo(f"{'house':<12} {'target':>10} {'before':>10} {'after':>10}")
+    for house in referential.houses:
+        click.echo(
+            f"{house:<12} "
+            f"{result.target[house]:>10.4%} "
+            f"{float(result.before.probabilities[house]):>10.4%} "
+            f"{float(result.after.probabilities[house]):>10.4%}"
+        )
+    click.echo(
+        f"{'tie':<12} {'':>10} "
+        f"{float(result.before.tie_probability):>10.4%} "
+        f"{float(result.after.tie_probability):>10.4%}"
+    )
+    click.echo(
+        f"{result.accepted} of {result.steps} moves kept, "
+        f"{result.changed_answers} answers changed, in {result.seconds:.1f}s."
+    )
+
+
+@cli.command()
+@click.option(
+    "-n",
+    "--respondents",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="The number of simulated respondents.",
+)
+@click.option(
+    "-l",
+    "--long-quiz",
+    is_flag=True,
+    default=False,
+    help="Simulate the longer quiz (every variation of each question is asked).",
+)
+@click.option(
+    "--information-gain",
+    is_flag=True,
+    default=False,
+    help="Ask the most informative question first.",
+)
+@click.option("--seed", type=int, default=None, help="The seed of the simulation.")
+def savings(
+    respondents: int, long_quiz: bool, information_gain: bool, seed: Optional[int]
+) -> None:
+    """Measures the questions saved by stopping once the house is decided.
+
+    The respondents answer every question at random.
+    """
+    from sorting_hat.early_stop import simulate_savings
+    from sorting_hat.referential import load_referential
+
+    result = simulate_savings(
+        referential=load_referential(),
+        respondents=respondents,
+        long_quiz=long_quiz,
+        information_gain=information_gain,
+        seed=seed,
+    )
+
+    click.echo(f"Respondents: {result.respondents}")
+    click.echo(f"Questions of a whole quiz: {result.questions:.2f}")
+    click.echo(f"Questions asked on average: {result.asked:.2f}")
+    click.echo(
+        f"Questions saved on average: {result.saved:.2f} ({result.saved_share:.1%})"
+    )
+
+
+@cli.command()
+@click.option(
+    "-n",
+    "--n",
+    "n",
+    type=click.IntRange(min=0),
+    default=1000,
+    show_default=True,
+    help="The number of sortings to generate.",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=None,
+    help="The seed of the simulation. A random one is chosen (and printed on the "
+    "standard error) by default.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_file",
+    type=click.File("w"),
+    default="-",
+    help="The file to write the sortings to. Defaults to the standard output.",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(FORMATS),
+    default="jsonl",
+    show_default=True,
+    help="The format of the sortings.",
+)
+@click.option(
+    "--answers",
+    is_flag=True,
+    default=False,
+    help="Write the answers, as read by `sorting-hat score`, instead of the results.",
+)
+@click.option(
+    "-l",
+    "--long-quiz",
+    is_flag=True,
+    default=False,
+    help="Simulate the longer quiz (every variation of each question is asked).",
+)
+@click.option(
+    "--bias-house",
+    default=None,
+    help="The house the answers are biased towards. Answers are uniform by default.",
+)
+@click.option(
+    "--bias",
+    type=click.FloatRange(min=0),
+    default=2.0,
+    show_default=True,
+    help="With --bias-house, an answer is drawn with a probability proportional to "
+    "1 + bias * its weight for the house.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="The number of processes generating the sortings.",
+)
+def simulate(
+    n: int,
+    seed: Optional[int],
+    output_file: IO[str],
+    output_format: str,
+    answers: bool,
+    long_quiz: bool,
+    bias_house: Optional[str],
+    bias: float,
+    workers: int,
+) -> None:
+    """Generates synthetic sortings, for instance for load tests.
+
+    The same seed gives the same sortings whatever the number of workers.
+    """
+    from sorting_hat.referential import load_referential
+    from sorting_hat.simulate import simulate_to_file
+
+    houses = load_referential().houses
+    if bias_house is not None and bias_house not in houses:
+        raise click.BadParameter(
+            f"The house should be one of {', '.join(houses)}.",
+            param_hint="--bias-house",
+        )
+
+    if seed is None:
+        import secrets
+
+        seed = secrets.randbits(32)
+        click.echo(f"Seed: {seed}", err=True)
+
+    simulate_to_file(
+        f=output_file,
+        n=n,
+        seed=seed,
+        fmt=output_format,
+        answers=answers,
+        long_quiz=long_quiz,
+        profile=bias_house,
+        bias=bias,
+        workers=workers,
+    )
+
+
+@cli.command()
+def packs() -> None:
+    """Lists the quiz packs.
+
+    They are found in the package data and in the directories listed in the
+    SORTING_HAT_PACKS_PATH environment variable.
+    """
+    from sorting_hat.registry import get_registry
+
+    for pack in get_registry().packs.values():
+        click.echo(f"{pack.name:<20} {pack.location}")
+
+
+@cli.command(name="stats")
+@click.argument(
+    "directory",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    required=False,
+    envvar="SORTING_HAT_STATS_DIR",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    default=False,
+    help="Print the merged aggregate as JSON, as in a snapshot.",
+)
+def stats_command(directory: Optional[str], as_json: bool) -> None:
+    """Merges the snapshots of the sortings written with --stats-dir.
+
+    DIRECTORY defaults to SORTING_HAT_STATS_DIR.
+    """
+    from sorting_hat.stats import merge_directory
+
+    if directory is None:
+        raise click.BadParameter(
+            "Give a directory or set SORTING_HAT_STATS_DIR.", param_hint="DIRECTORY"
+        )
+
+    stats = merge_directory(directory=directory)
+
+    if as_json:
+        import json
+
+        click.echo(json.dumps(stats.to_dict(), indent=2))
+        return
+
+    click.echo(f"Sortings: {stats.sortings}")
+    click.echo(f"Ties: {stats.ties} ({stats.tie_rate:.2%})")
+    for house, count in sorted(stats.houses.items()):
+        share = count / stats.sortings if stats.sortings else 0.0
+        click.echo(f"  {house:<12} {count:>10} {share:>8.2%}")
+
+    click.echo("Answers:")
+    per_variation: dict[tuple[str, str], dict[str, int]] = {}
+    for (question_id, variation_id, answer_id), count in stats.answers.items():
+        per_variation.setdefault((question_id, variation_id), {})[answer_id] = count
+    # The ids are sorted as numbers when they are numbers ("2" before "10").
+    for (question_id, variation_id), counts in sorted(
+        per_variation.items(), key=lambda item: [(len(i), i) for i in item[0]]
+    ):
+        frequencies = "  ".join(
+            f"{answer_id}: {count}"
+            for answer_id, count in sorted(
+                counts.items(), key=lambda item: (len(item[0]), item[0])
+            )
+        )
+        click.echo(f"  {question_id}/{variation_id}  {frequencies}")
+
+
+@cli.command()
+@click.argument(
+    "log_dir",
+    metavar="DIRECTORY",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    required=False,
+    envvar="SORTING_HAT_RESULT_LOG",
+)
+@click.option("--house", default=None, help="Keep the sortings won by this house.")
+@click.option(
+    "--since",
+    default=None,
+    help="Keep the sortings since this time: an ISO date or time, or a duration "
+    "before now such as 7d, 12h or 30m.",
+)
+@click.option(
+    "--until",
+    default=None,
+    help="Keep the sortings before this time, given as for --since.",
+)
+@click.option(
+    "--answer",
+    default=None,
+    metavar="QUESTION/VARIATION/ANSWER",
+    help="Keep the sortings with this answer, e.g. 3/2/4.",
+)
+@click.option("--pack", default=None, help="Keep the sortings of this quiz pack.")
+@click.option(
+    "--count",
+    "count_only",
+    is_flag=True,
+    default=False,
+    help="Only print the number of sortings found.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    default=None,
+    help="The maximum number of sortings printed.",
+)
+def query(
+    log_dir: Optional[str],
+    house: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    answer: Optional[str],
+    pack: Optional[str],
+    count_only: bool,
+    limit: Optional[int],
+) -> None:
+    """Finds the sortings kept in a result log written with --log.
+
+    The sortings are printed as JSONL, oldest first. DIRECTORY defaults to
+    SORTING_HAT_RESULT_LOG.
+    """
+    import json
+    from datetime import datetime
+
+    from sorting_hat.result_log import ResultLogReader, parse_time
+
+    if log_dir is None:
+        raise click.BadParameter(
+            "Give a directory or set SORTING_HAT_RESULT_LOG.", param_hint="DIRECTORY"
+        )
+
+    times = {}
+    for name, value in (("since", since), ("until", until)):
+        try:
+            times[name] = None if value is None else parse_time(value)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint=f"--{name}")
+
+    answer_key = None
+    if answer is not None:
+        answer_key = tuple(answer.split("/"))
+        if len(answer_key) != 3:
+            raise click.BadParameter(
+                f"{answer!r} should be QUESTION/VARIATION/ANSWER.",
+                param_hint="--answer",
+            )
+
+    try:
+        reader = ResultLogReader(directory=log_dir)
+        conditions = dict(house=house, answer=answer_key, pack=pack, **times)
+        if count_only:
+            click.echo(reader.count(**conditions))
+            return
+        results = reader.query(limit=limit, **conditions)
+        for result in results:
+            row = result._asdict()
+            row["timestamp"] = (
+                datetime.fromtimestamp(result.timestamp).astimezone().isoformat()
+            )
+            row["answers"] = ["/".join(key) for key in result.answers]
+            click.echo(json.dumps(row, ensure_ascii=False))
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+
+@cli.command(name="compile")
+def compile_command() -> None:
+    """Compiles the referential into the cache directory for a faster startup.
+
+    This is also done automatically the first time the referential is loaded.
+    """
+    import time
+
+    from sorting_hat.cache import compile_referential, load_compiled
+    from sorting_hat.referential import QuizReferential
+
+    start = time.perf_counter()
+    QuizReferential.from_package()
+    csv_time = time.perf_counter() - start
+
+    path = compile_referential()
+
+    start = time.perf_counter()
+    load_compiled()
+    compiled_time = time.perf_counter() - start
+
+    click.echo(f"Compiled referential written to {path} ({path.stat().st_size} bytes).")
+    click.echo(f"Loading from the CSV files: {csv_time * 1000:.2f} ms")
+    click.echo(f"Loading from the compiled referential: {compiled_time * 1000:.2f} ms")
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="The interface.")
+@click.option("--port", type=int, default=8000, show_default=True, help="The port.")
+@click.option(
+    "-l",
+    "--long-quiz",
+    is_flag=True,
+    default=False,
+    help="Use the longer quiz (every variation of each question will be asked).",
+)
+@click.option(
+    "--pack",
+    default="default",
+    show_default=True,
+    help="The quiz pack of the sessions which do not ask for one.",
+)
+@click.option(
+    "--log",
+    "log_dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    envvar="SORTING_HAT_RESULT_LOG",
+    help="Append each completed quiz to the result log of this directory, read with "
+    "`sorting-hat query` (also set with SORTING_HAT_RESULT_LOG).",
+)
+@click.option(
+    "--reload",
+    "reload_data",
+    is_flag=True,
+    default=False,
+    help="Reload a quiz pack when its CSV files change, the quizzes in progress "
+    "keeping the version they started with.",
+)
+@click.option(
+    "--reload-interval",
+    type=click.FloatRange(min=0.1),
+    default=2.0,
+    show_default=True,
+    help="With --reload, the seconds between two checks of the CSV files.",
+)
+def serve(
+    host: str,
+    port: int,
+    long_quiz: bool,
+    pack: str,
+    log_dir: Optional[str],
+    reload_data: bool,
+    reload_interval: float,
+) -> None:
+    """Serves the sorting hat over HTTP, with a JSON API.
+
+    A session can ask for any quiz pack of `sorting-hat packs`.
+    """
+    import asyncio
+
+    from sorting_hat.registry import get_registry
+    from sorting_hat.server import SortingHatServer
+
+    registry = get_registry()
+    try:
+        referential = registry.get(name=pack)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--pack")
+
+    log = None
+    if log_dir is not None:
+        from sorting_hat.result_log import ResultLog
+
+        # Each quiz is written, by a thread of the server, before it is answered,
+        # so that none is lost if the server stops.
+        log = ResultLog(directory=log_dir, referential=referential, buffer_records=1)
+
+    server = SortingHatServer(
+        referential=referential,
+        long_quiz=long_quiz,
+        registry=registry,
+        stats=click.get_current_context().obj,
+        log=log,
+        default_pack=pack,
+    )
+    watchers = []
+    if reload_data:
+        from sorting_hat.reload import watch_registry
+
+        def swap(name: str, referential: "QuizReferential") -> None:
+            """Swaps in the new referential of the default pack of the sessions.
+
+            Args:
+                name: The name of the pack reloaded.
+                referential: Its new referential.
+            """
+            if name == pack:
+                server.referential = referential
+
+        _log_reloads()
+        watchers = watch_registry(
+            registry=registry, on_reload=swap, interval=reload_interval
+        )
+
+    click.echo(f"Serving on http://{host}:{port}")
+    try:
+        asyncio.run(server.serve(host=host, port=port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for watcher in watchers:
+            watcher.stop()
+        if log is not None:
+            log.close()
+
+
+def _log_reloads() -> None:
+    """Writes the logs of the reloads of the quiz data to the standard error."""
+    import logging
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
@@ -0,0 +1,327 @@
+"""This module stops the quiz as soon as the house is decided.
+
+The most and the least each house can gain from a variation are known from the
+referential of weights before any question is asked. Once the leading house is
+ahead of every other house by more than what they can still gain, no answer can
+change the result and the remaining questions are not asked: the house is the
+same as if they had all been answered.
+
+The next variation can also be chosen by expected information gain rather than
+in the order given: the question asked is the one which, on average over its
+answers, leaves the fewest houses able to win.
+"""
+
+from collections import defaultdict
+from math import log2
+from random import Random
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from sorting_hat.referential import QuizReferential
+
+# The margin by which the leader should be ahead, so that a rounding error of the
+# float weights never settles a quiz which could still end in a tie.
+EPSILON = 1e-9
+
+
+class Savings(NamedTuple):
+    """The number of questions saved by stopping early, on average."""
+
+    respondents: int
+    questions: float  # The number of questions of a whole quiz.
+    asked: float
+    saved: float
+    saved_share: float
+
+
+def get_gain_bounds(
+    referential: QuizReferential, question_id: str, variation_id: str
+) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """Gets the most and the least each house can gain from a variation.
+
+    Args:
+        referential: The referential of answers and weights.
+        question_id: The id of the question.
+        variation_id: The id of the variation.
+
+    Returns:
+        The largest and the smallest weight of each house over the answers.
+    """
+    vectors = [
+        referential.weights[(question_id, variation_id, str(answer_id))]
+        for answer_id in range(
+            1, len(referential.answer_texts[(question_id, variation_id)]) + 1
+        )
+    ]
+    gains_per_house = list(zip(*vectors))
+    return (
+        tuple(max(gains) for gains in gains_per_house),
+        tuple(min(gains) for gains in gains_per_house),
+    )
+
+
+def get_decided_house(
+    score: Sequence[float],
+    max_remaining: Sequence[float],
+    min_remaining: Sequence[float],
+) -> Optional[int]:
+    """Gets the house that cannot be caught anymore, if any.
+
+    Args:
+        score: The score of each house.
+        max_remaining: The most each house can still gain.
+        min_remaining: The least each house can still gain.
+
+    Returns:
+        The position of the decided house, or None if the quiz is not decided.
+    """
+    leader = max(range(len(score)), key=score.__getitem__)
+    lowest = score[leader] + min_remaining[leader]
+
+    for house, value in enumerate(score):
+        if house != leader and lowest <= value + max_remaining[house] + EPSILON:
+            return None
+
+    return leader
+
+
+def count_possible_winners(
+    score: Sequence[float],
+    max_remaining: Sequence[float],
+    min_remaining: Sequence[float],
+) -> int:
+    """Counts the houses that can still win (or tie).
+
+    Args:
+        score: The score of each house.
+        max_remaining: The most each house can still gain.
+        min_remaining: The least each house can still gain.
+
+    Returns:
+        The number of houses that can still win.
+    """
+    highest = [value + gain for value, gain in zip(score, max_remaining)]
+    lowest = [value + gain for value, gain in zip(score, min_remaining)]
+
+    return sum(
+        all(
+            highest[house] + EPSILON >= lowest[other]
+            for other in range(len(score))
+            if other != house
+        )
+        for house in range(len(score))
+    )
+
+
+class EarlyStop:
+    """Chooses the next question to ask, until the house is decided.
+
+    Args:
+        referential: The referential of questions, answers and weights.
+        chosen_variations: The variations that can be asked.
+        information_gain: A flag to ask the most informative variation first
+            instead of following the order given. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        referential: QuizReferential,
+        chosen_variations: list[dict[str, str]],
+        information_gain: bool = False,
+    ) -> None:
+        """Initializes the class."""
+        self.referential = referential
+        self.information_gain = information_gain
+        self.remaining = list(chosen_variations)
+        self.asked = 0
+        self._bounds = {
+            (variation["question_id"], variation["variation_id"]): get_gain_bounds(
+                referential=referential,
+                question_id=variation["question_id"],
+                variation_id=variation["variation_id"],
+            )
+            for variation in self.remaining
+        }
+        self._update_remaining_gains()
+
+    def iterate(self, score: dict[str, float]) -> Iterator[dict[str, str]]:
+        """Yields the variations to ask, reading the score as it is updated.
+
+        Args:
+            score: The score of each house, updated in place after each answer.
+
+        Yields:
+            The next variation to ask, until the house is decided.
+        """
+        while True:
+            variation = self.next_variation(
+                score=[score[house] for house in self.referential.houses]
+            )
+            if variation is None:
+                return
+            yield variation
+
+    def next_variation(self, score: Sequence[float]) -> Optional[dict[str, str]]:
+        """Gets the next variation to ask.
+
+        Args:
+            score: The score of each house, in the order of the referential.
+
+        Returns:
+            The next variation, or None if the house is decided or every
+            variation was asked.
+        """
+        if not self.remaining or self.is_decided(score=score):
+            return None
+
+        index = self._get_most_informative(score=score) if self.information_gain else 0
+        variation = self.remaining.pop(index)
+        self.asked += 1
+        self._update_remaining_gains()
+
+        return variation
+
+    def is_decided(self, score: Sequence[float]) -> bool:
+        """Tells whether the remaining questions can still change the house.
+
+        Args:
+            score: The score of each house, in the order of the referential.
+
+        Returns:
+            True if the leading house cannot be caught anymore.
+        """
+        return (
+            get_decided_house(
+                score=score,
+                max_remaining=self.max_remaining,
+                min_remaining=self.min_remaining,
+            )
+            is not None
+        )
+
+    def _update_remaining_gains(self) -> None:
+        """Adds up the most and the least each house can gain from what is left."""
+        number_of_houses = len(self.referential.houses)
+        self.max_remaining = [0.0] * number_of_houses
+        self.min_remaining = [0.0] * number_of_houses
+
+        for variation in self.remaining:
+            highest, lowest = self._bounds[
+                (variation["question_id"], variation["variation_id"])
+            ]
+            for house in range(number_of_houses):
+                self.max_remaining[house] += highest[house]
+                self.min_remaining[house] += lowest[house]
+
+    def _get_most_informative(self, score: Sequence[float]) -> int:
+        """Gets the variation leaving, on average, the fewest possible winners.
+
+        The information gained from an answer is measured as the reduction of the
+        entropy of a uniform belief over the houses that can still win.
+
+        Args:
+            score: The score of each house, in the order of the referential.
+
+        Returns:
+            The position of the variation in the remaining ones.
+        """
+        best_index, best_entropy = 0, float("inf")
+
+        for index, variation in enumerate(self.remaining):
+            question_id = variation["question_id"]
+            variation_id = variation["variation_id"]
+            highest, lowest = self._bounds[(question_id, variation_id)]
+            max_remaining = [
+                total - gain for total, gain in zip(self.max_remaining, highest)
+            ]
+            min_remaining = [
+                total - gain for total, gain in zip(self.min_remaining, lowest)
+            ]
+
+            number_of_answers = len(
+                self.referential.answer_texts[(question_id, variation_id)]
+            )
+            entropy = 0.0
+            for answer_id in range(1, number_of_answers + 1):
+                vector = self.referential.weights[
+                    (question_id, variation_id, str(answer_id))
+                ]
+                entropy += log2(
+                    count_possible_winners(
+                        score=[value + gain for value, gain in zip(score, vector)],
+                        max_remaining=max_remaining,
+                        min_remaining=min_remaining,
+                    )
+                )
+            entropy /= number_of_answers
+
+            if entropy < best_entropy:
+                best_index, best_entropy = index, entropy
+
+        return best_index
+
+
+def simulate_savings(
+    referential: QuizReferential,
+    respondents: int = 1000,
+    long_quiz: bool = False,
+    information_gain: bool = False,
+    seed: Optional[int] = None,
+) -> Savings:
+    """Simulates respondents answering at random to measure the questions saved.
+
+    Args:
+        referential: The referential of questions, answers and weights.
+        respondents: The number of simulated respondents.
+        long_quiz: A flag to ask every variation of each question. Defaults to False.
+        information_gain: A flag to ask the most informative variation first.
+            Defaults to False.
+        seed: The seed of the simulation. Defaults to None (not reproducible).
+
+    Returns:
+        The average number of questions asked and saved.
+    """
+    rng = Random(seed)
+
+    variations_per_question: dict[str, list[dict[str, str]]] = defaultdict(list)
+    for question_id, variation_id in referential.variations:
+        variations_per_question[question_id].append(
+            {"question_id": question_id, "variation_id": variation_id}
+        )
+
+    questions = asked = 0
+    for _ in range(respondents):
+        if long_quiz:
+            chosen_variations = [
+                variation
+                for variations in variations_per_question.values()
+                for variation in variations
+            ]
+        else:
+            chosen_variations = [
+                rng.choice(variations)
+                for variations in variations_per_question.values()
+            ]
+        rng.shuffle(chosen_variations)
+
+        stop = EarlyStop(
+            referential=referential,
+            chosen_variations=chosen_variations,
+            information_gain=information_gain,
+        )
+        score = [0.0] * len(referential.houses)
+        while (variation := stop.next_variation(score=score)) is not None:
+            key = (variation["question_id"], variation["variation_id"])
+            answer_id = rng.randint(1, len(referential.answer_texts[key]))
+            vector = referential.weights[(*key, str(answer_id))]
+            score = [value + gain for value, gain in zip(score, vector)]
+
+        questions += len(chosen_variations)
+        asked += stop.asked
+
+    return Savings(
+        respondents=respondents,
+        questions=questions / respondents,
+        asked=asked / respondents,
+        saved=(questions - asked) / respondents,
+        saved_share=(questions - asked) / questions if questions else 0.0,
+    )
@@ -0,0 +1,246 @@
+"""This module records where the time of a sorting goes.
+
+The main phases of a sorting (loading the referential, choosing the variations,
+asking the questions, scoring, choosing the house and printing it) are wrapped with
+`timed`, which counts the calls of each phase and adds up their wall time. The
+houses chosen and the hits and misses of the caches are counted as well.
+
+Nothing is recorded unless the metrics are enabled, either with the `--profile`
+option of the command line or with the SORTING_HAT_PROFILE environment variable
+set to the path of the report. The report is written when the process exits, as
+JSON or in the text format of Prometheus (when the path ends with ".prom" or when
+SORTING_HAT_PROFILE_FORMAT is set to "prometheus").
+"""
+
+import atexit
+import functools
+import os
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    # Only imported when the metrics are enabled, as scoring imports this module.
+    from pathlib import Path
+
+FORMATS = ("json", "prometheus")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Metrics:
+    """Holds the call counts and the wall time of each phase, and the houses chosen.
+
+    Attributes:
+        enabled: A flag to record the metrics.
+        report: The path and the format of the report written when the process
+            exits, if any.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the class."""
+        self.enabled = False
+        self.report: Optional[tuple["Path", str]] = None
+        self.calls: Counter[str] = Counter()
+        self.seconds: Counter[str] = Counter()
+        self.houses: Counter[str] = Counter()
+        self.cache_lookups: Counter[tuple[str, str]] = Counter()
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Records one call of a phase.
+
+        Args:
+            phase: The name of the phase.
+            seconds: The wall time of the call.
+        """
+        self.calls[phase] += 1
+        self.seconds[phase] += seconds
+
+    def count_house(self, house: str) -> None:
+        """Counts a house chosen by the sorting hat.
+
+        Args:
+            house: The house chosen.
+        """
+        if self.enabled:
+            self.houses[house] += 1
+
+    def count_cache_lookup(self, cache: str, hit: bool) -> None:
+        """Counts a lookup in a cache.
+
+        Args:
+            cache: The name of the cache.
+            hit: A flag telling whether the value was found in the cache.
+        """
+        if self.enabled:
+            self.cache_lookups[(cache, "hit" if hit else "miss")] += 1
+
+    def reset(self) -> None:
+        """Forgets everything recorded so far."""
+        self.calls.clear()
+        self.seconds.clear()
+        self.houses.clear()
+        self.cache_lookups.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Gets the metrics as a dictionary ready to be dumped as JSON.
+
+        Returns:
+            The calls and the wall time of each phase, the count of each house and
+            the hits and misses of each cache.
+        """
+        caches: dict[str, dict[str, int]] = {}
+        for (cache, result), count in sorted(self.cache_lookups.items()):
+            caches.setdefault(cache, {"hit": 0, "miss": 0})[result] = count
+        return {
+            "phases": {
+                phase: {"calls": calls, "seconds": self.seconds[phase]}
+                for phase, calls in sorted(self.calls.items())
+            },
+            "houses": dict(sorted(self.houses.items())),
+            "caches": caches,
+        }
+
+    def to_prometheus(self) -> str:
+        """Gets the metrics in the text format of Prometheus.
+
+        Returns:
+            The metrics, one sample per line.
+        """
+        lines = [
+            "# HELP sorting_hat_phase_calls_total Calls of each phase of a sorting.",
+            "# TYPE sorting_hat_phase_calls_total counter",
+        ]
+        for phase, calls in sorted(self.calls.items()):
+            lines.append(f'sorting_hat_phase_calls_total{{phase="{phase}"}} {calls}')
+
+        lines += [
+            "# HELP sorting_hat_phase_seconds_total Wall time of each phase.",
+            "# TYPE sorting_hat_phase_seconds_total counter",
+        ]
+        for phase, seconds in sorted(self.seconds.items()):
+            lines.append(
+                f'sorting_hat_phase_seconds_total{{phase="{phase}"}} {seconds!r}'
+            )
+
+        lines += [
+            "# HELP sorting_hat_houses_total Houses chosen by the sorting hat.",
+            "# TYPE sorting_hat_houses_total counter",
+        ]
+        for house, count in sorted(self.houses.items()):
+            lines.append(f'sorting_hat_houses_total{{house="{house}"}} {count}')
+
+        lines += [
+            "# HELP sorting_hat_cache_lookups_total Lookups in each cache.",
+            "# TYPE sorting_hat_cache_lookups_total counter",
+        ]
+        for (cache, result), count in sorted(self.cache_lookups.items()):
+            lines.append(
+                f'sorting_hat_cache_lookups_total{{cache="{cache}",result="{result}"}} '
+                f"{count}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: "Path", fmt: str = "json") -> None:
+        """Writes the report atomically, so that a scraper never reads a partial one.
+
+        Args:
+            path: The path of the report.
+            fmt: The format of the report, one of FORMATS.
+        """
+        if fmt == "prometheus":
+            content = self.to_prometheus()
+        else:
+            # Imported here as the metrics are imported by every phase.
+            import json
+
+            content = json.dumps(self.to_dict(), indent=2) + "\n"
+
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_text(content, encoding="utf-8")
+        os.replace(temporary_path, path)
+
+
+METRICS = Metrics()
+
+
+def timed(phase: str) -> Callable[[F], F]:
+    """Records the calls and the wall time of a function as a phase.
+
+    When the metrics are disabled, the only cost is a check of a flag.
+
+    Args:
+        phase: The name of the phase.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(func: F) -> F:
+        """Wraps the function."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            """Calls the function, timing it if the metrics are enabled."""
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.record(phase=phase, seconds=time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def guess_format(path: "Path") -> str:
+    """Guesses the format of a report from its extension.
+
+    Args:
+        path: The path of the report.
+
+    Returns:
+        "prometheus" for a ".prom" file, "json" otherwise.
+    """
+    return "prometheus" if path.suffix == ".prom" else "json"
+
+
+def enable(path: "Path", fmt: Optional[str] = None, at_exit: bool = True) -> None:
+    """Enables the metrics and sets where to write the report.
+
+    Args:
+        path: The path of the report.
+        fmt: The format of the report, one of FORMATS. Defaults to None
+            (guessed from the extension of the path).
+        at_exit: A flag to write the report when the process exits.
+            Defaults to True.
+    """
+    fmt = fmt or guess_format(path=path)
+    if fmt not in FORMATS:
+        raise ValueError(f"The format should be one of {', '.join(FORMATS)}.")
+
+    if at_exit and METRICS.report is None:
+        atexit.register(write_report)
+
+    METRICS.enabled = True
+    METRICS.report = (path, fmt)
+
+
+def write_report() -> None:
+    """Writes the report where it was asked for, if the metrics are enabled."""
+    if METRICS.report is not None:
+        path, fmt = METRICS.report
+        METRICS.dump(path=path, fmt=fmt)
+
+
+if os.environ.get("SORTING_HAT_PROFILE"):
+    from pathlib import Path
+
+    enable(
+        path=Path(os.environ["SORTING_HAT_PROFILE"]),
+        fmt=os.environ.get("SORTING_HAT_PROFILE_FORMAT"),
+    )
@@ -0,0 +1,84 @@
+"""This module defines the compact types the referentials are built from.
+
+A process may hold several referentials (one per quiz pack) and many sessions at
+once, so the values they repeat are only stored once:
+
+- the ids are interned, so "12" is the same string in every key and every pack,
+- the houses are members of the House enum (they still compare, hash and print
+  as their name, so they can be used wherever a house name is expected),
+- the weight vectors are shared: most answers only give points to one or two
+  houses, and the referential only holds a few distinct vectors.
+"""
+
+import sys
+from enum import Enum
+from typing import Union
+
+
+class House(str, Enum):
+    """The houses of the sorting hat."""
+
+    GRYFFONDOR = "gryffondor"
+    POUFSOUFFLE = "poufsouffle"
+    SERDAIGLE = "serdaigle"
+    SERPENTARD = "serpentard"
+
+    def __str__(self) -> str:
+        """Prints the house as its name."""
+        return self.value
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the house as its name."""
+        return format(self.value, format_spec)
+
+
+def to_house(name: str) -> Union[House, str]:
+    """Gets the member of the House enum with a name.
+
+    Args:
+        name: The name of the house.
+
+    Returns:
+        The house, or the interned name if a quiz pack defines another house.
+    """
+    try:
+        return House(name)
+    except ValueError:
+        return sys.intern(name)
+
+
+def intern_id(value: str) -> str:
+    """Interns an id, so that it is stored once whatever the number of keys.
+
+    Args:
+        value: The id of a question, a variation or an answer.
+
+    Returns:
+        The interned id.
+    """
+    return sys.intern(value)
+
+
+class VectorPool:
+    """Shares the identical weight vectors of a referential."""
+
+    __slots__ = ("_vectors",)
+
+    def __init__(self) -> None:
+        """Initializes the class."""
+        self._vectors: dict[tuple[float, ...], tuple[float, ...]] = {}
+
+    def get(self, vector: tuple[float, ...]) -> tuple[float, ...]:
+        """Gets the shared copy of a vector.
+
+        Args:
+            vector: The weight of each house.
+
+        Returns:
+            The first equal vector seen, or the vector itself.
+        """
+        return self._vectors.setdefault(vector, vector)
+
+    def __len__(self) -> int:
+        """Counts the distinct vectors."""
+        return len(self._vectors)
@@ -0,0 +1,274 @@
+"""This module scores a file of answer sheets on several cores.
+
+The file is split into byte ranges which are scored in a pool of processes.
+A boundary between two ranges is never placed between two consecutive rows of the
+same respondent, and the totals of each range are merged in the order of the file.
+The few respondents whose answers still end up in several ranges are gathered
+and scored again as whole sheets, so the results are exactly the same as when the
+file is scored by a single process. Each worker keeps its own cache of the totals
+of the sheets. The answers counted for the statistics by each worker are
+merged into one aggregate.
+
+The workers map the weights from a table file shared by every process (see
+`sorting_hat.shared`) instead of each loading its own copy of the referential.
+"""
+
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, BinaryIO, Iterator, Optional, Union
+
+from sorting_hat.batch import (
+    ANSWER_FIELDS,
+    accumulate_totals,
+    decide_houses,
+    read_answers,
+    write_results,
+)
+from sorting_hat.referential import QuizReferential, load_referential
+from sorting_hat.scoring import ScoreCache
+from sorting_hat.shared import WeightTable, publish_table
+from sorting_hat.stats import SortingStats
+
+# The referential (or the shared weights) of the worker process and its cache of
+# the totals of the sheets, created once when the worker starts.
+_referential: Optional[Union[QuizReferential, WeightTable]] = None
+_cache: Optional[ScoreCache] = None
+
+
+def score_file_parallel(
+    path: str,
+    output_file: IO[str],
+    input_format: str,
+    output_format: str,
+    workers: int,
+    seed: Optional[int] = None,
+    package: str = "sorting_hat.data",
+    stats: Optional[SortingStats] = None,
+    shared: bool = True,
+) -> int:
+    """Scores a file of answer sheets with a pool of processes.
+
+    Args:
+        path: The path of the file with the answer sheets.
+        output_file: The file to write the results to.
+        input_format: The format of the input file, one of FORMATS.
+        output_format: The format of the output file, one of FORMATS.
+        workers: The number of processes.
+        seed: The seed used to break ties. Defaults to None (not reproducible).
+        package: The package containing the referential.
+        stats: The aggregate recording the answers and the outcomes.
+            Defaults to None (nothing is recorded).
+        shared: A flag to map the weights from a table shared by the workers,
+            rather than loading the referential in each of them. Defaults to True.
+
+    Returns:
+        The number of scored answer sheets.
+    """
+    header, ranges = split_file(
+        path=path, fmt=input_format, number_of_chunks=4 * workers
+    )
+    tasks = [(path, input_format, header, start, end) for start, end in ranges]
+    count_answers = stats is not None
+    totals: dict[str, tuple[float, ...]] = {}
+    split: set[str] = set()
+
+    table = None
+    if shared:
+        try:
+            table = str(publish_table(package=package))
+        except OSError:
+            pass  # The cache directory cannot be written to: each worker loads.
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(package, table)
+    ) as executor:
+        for chunk, chunk_stats in executor.map(
+            _accumulate_chunk, [(*task, count_answers) for task in tasks]
+        ):
+            if stats is not None:
+                stats.merge(chunk_stats)
+            for respondent_id, total in chunk:
+                if respondent_id in totals:
+                    split.add(respondent_id)
+                else:
+                    totals[respondent_id] = total
+
+        sheets: dict[str, list[int]] = {}
+        if split:
+            # Gather the whole sheets of these respondents, to score them as a
+            # single process would.
+            respondents = frozenset(split)
+            for chunk in executor.map(
+                _collect_chunk, [(*task, respondents) for task in tasks]
+            ):
+                for respondent_id, position in chunk:
+                    sheets.setdefault(respondent_id, []).append(position)
+
+    referential = load_referential(package=package)
+    cache = ScoreCache(referential=referential)
+    # The respondents keep the position of their first appearance.
+    totals.update(
+        (respondent_id, cache.totals(sheet)) for respondent_id, sheet in sheets.items()
+    )
+    results = decide_houses(
+        totals=totals, houses=referential.houses, seed=seed, stats=stats
+    )
+    write_results(
+        results=results, f=output_file, fmt=output_format, houses=referential.houses
+    )
+    return len(results)
+
+
+def split_file(
+    path: str, fmt: str, number_of_chunks: int
+) -> tuple[bytes, list[tuple[int, int]]]:
+    """Splits a file of answer sheets into byte ranges.
+
+    Args:
+        path: The path of the file with the answer sheets.
+        fmt: The format of the file, one of FORMATS.
+        number_of_chunks: The number of ranges wanted. Fewer ranges are returned
+            if the file is too small.
+
+    Returns:
+        The header of the file (empty for a JSONL file) and the start and end
+        offsets of each range.
+    """
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        header = f.readline() if fmt == "csv" else b""
+        position = (
+            next(csv.reader([header.decode("utf-8")])).index(ANSWER_FIELDS[0])
+            if header
+            else 0
+        )
+        boundaries = [f.tell()]
+
+        for i in range(1, number_of_chunks):
+            target = boundaries[0] + (size - boundaries[0]) * i // number_of_chunks
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target)
+            f.readline()
+            boundary = _next_respondent(f=f, fmt=fmt, position=position)
+            if boundary >= size:
+                break
+            boundaries.append(boundary)
+
+    boundaries.append(size)
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _next_respondent(f: BinaryIO, fmt: str, position: int) -> int:
+    """Finds the start of the next row of a different respondent.
+
+    Args:
+        f: The file, positioned at the start of a row.
+        fmt: The format of the file, one of FORMATS.
+        position: The position of the respondent_id in a row of a CSV file.
+
+    Returns:
+        The offset of the first row whose respondent differs from the current one.
+    """
+    current = None
+
+    while True:
+        offset = f.tell()
+        line = f.readline()
+        if not line:
+            return offset
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            respondent_id = next(csv.reader([line.decode("utf-8")]))[position]
+        else:
+            respondent_id = str(json.loads(line)["respondent_id"])
+        if current is None:
+            current = respondent_id
+        elif respondent_id != current:
+            return offset
+
+
+def _init_worker(package: str, table: Optional[str] = None) -> None:
+    """Loads the referential once when a worker process starts.
+
+    Args:
+        package: The package containing the referential.
+        table: The path of the table of the weights to map instead.
+            Defaults to None (the referential is loaded).
+    """
+    global _referential, _cache
+    if table is not None:
+        _referential = WeightTable(path=table)
+    else:
+        _referential = load_referential(package=package)
+    _cache = ScoreCache(referential=_referential)
+
+
+def _accumulate_chunk(
+    task: tuple[str, str, bytes, int, int, bool]
+) -> tuple[list[tuple[str, tuple[float, ...]]], Optional[SortingStats]]:
+    """Sums the weights of the answers of each respondent in a byte range.
+
+    Args:
+        task: The path of the file, its format, its header, the start and
+            end offsets of the range and a flag to count the answers.
+
+    Returns:
+        The total of each house for each respondent of the range, and the
+        aggregate counting its answers if asked for.
+    """
+    *chunk, count_answers = task
+    stats = SortingStats() if count_answers else None
+    totals = accumulate_totals(
+        answers=_read_chunk(*chunk), referential=_referential, stats=stats, cache=_cache
+    )
+    return list(totals.items()), stats
+
+
+def _collect_chunk(
+    task: tuple[str, str, bytes, int, int, frozenset[str]]
+) -> list[tuple[str, int]]:
+    """Gets each answer of some respondents in a byte range.
+
+    Args:
+        task: The path of the file, its format, its header, the start and
+            end offsets of the range and the respondents to keep.
+
+    Returns:
+        The respondent and the position in the referential of each answer kept.
+    """
+    *chunk, respondents = task
+    positions = _cache.positions
+
+    return [
+        (respondent_id, positions[(question_id, variation_id, answer_id)])
+        for respondent_id, question_id, variation_id, answer_id in _read_chunk(*chunk)
+        if respondent_id in respondents
+    ]
+
+
+def _read_chunk(
+    path: str, fmt: str, header: bytes, start: int, end: int
+) -> Iterator[tuple[str, str, str, str]]:
+    """Reads the answers of a byte range.
+
+    Args:
+        path: The path of the file with the answer sheets.
+        fmt: The format of the file, one of FORMATS.
+        header: The header of the file (empty for a JSONL file).
+        start: The offset of the start of the range.
+        end: The offset of the end of the range.
+
+    Returns:
+        The rows of the answer sheets of the range.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = header + f.read(end - start)
+
+    return read_answers(f=io.StringIO(chunk.decode("utf-8")), fmt=fmt)
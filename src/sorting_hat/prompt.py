@@ -0,0 +1,229 @@
+"""This module defines how the sorting hat talks to the person being sorted.
+
+The sorting hat only asks a question, shows a text and shows the result screen
+through a Prompt, so the same quiz runs with any backend:
+
+- QuestionaryPrompt, the interactive menu of the terminal (the default),
+- StdinPrompt, numbered answers read from a plain input stream, for instance
+  when the standard input is not a terminal,
+- ScriptedPrompt, answers given in advance or drawn at random and nothing shown,
+  to run the real quiz without anyone for tests, soak tests and profiling.
+
+Each backend raises QuizCancelled when no answer can be given, so the caller
+decides whether to exit.
+"""
+
+import abc
+import random
+import sys
+from typing import IO, BinaryIO, Iterable, Optional
+
+
+class QuizCancelled(Exception):
+    """Raised when the person being sorted leaves the quiz."""
+
+
+class Prompt(abc.ABC):
+    """Asks the questions of the quiz and shows its texts.
+
+    A backend implements ask. The texts are printed to the standard output unless
+    a backend does otherwise.
+    """
+
+    @abc.abstractmethod
+    def ask(self, message: str, choices: list[str]) -> int:
+        """Asks a question.
+
+        Args:
+            message: The question.
+            choices: The possible answers.
+
+        Returns:
+            The position of the answer chosen, starting from 1.
+        """
+
+    def show(self, text: str) -> None:
+        """Shows a text.
+
+        Args:
+            text: The text.
+        """
+        print(text)
+
+    def show_result(self, house: str) -> None:
+        """Shows the screen announcing a house.
+
+        Args:
+            house: The house chosen by the sorting hat.
+        """
+        # Imported only now as the result screen is only needed at the end.
+        from sorting_hat.render import write_result
+
+        write_result(house=house)
+
+
+class QuestionaryPrompt(Prompt):
+    """Asks the questions with the interactive menu of questionary."""
+
+    def ask(self, message: str, choices: list[str]) -> int:
+        """Asks a question with a menu of the answers.
+
+        Args:
+            message: The question.
+            choices: The possible answers.
+
+        Returns:
+            The position of the answer chosen, starting from 1.
+        """
+        # Imported only now as the interactive prompt is long to import.
+        import questionary
+
+        answer = questionary.select(
+            message=message, choices=choices, instruction=" ", qmark=""
+        ).ask()
+        if answer is None:
+            # questionary returns None when the menu is left with Ctrl-C.
+            raise QuizCancelled()
+
+        print("\n")
+        return choices.index(answer) + 1
+
+
+class StdinPrompt(Prompt):
+    """Asks the questions with numbered answers on plain text streams.
+
+    Args:
+        input_stream: The stream the answers are read from. Defaults to None
+            (the standard input).
+        output_stream: The stream the questions are written to. Defaults to None
+            (the standard output).
+    """
+
+    def __init__(
+        self,
+        input_stream: Optional[IO[str]] = None,
+        output_stream: Optional[IO[str]] = None,
+    ) -> None:
+        """Initializes the class."""
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+
+    def ask(self, message: str, choices: list[str]) -> int:
+        """Asks a question until a valid number is given.
+
+        Args:
+            message: The question.
+            choices: The possible answers.
+
+        Returns:
+            The position of the answer chosen, starting from 1.
+        """
+        input_stream = self.input_stream or sys.stdin
+        lines = [message] + [f"  {i}. {text}" for i, text in enumerate(choices, 1)]
+        self.show("\n".join(lines))
+
+        while True:
+            self._write(f"Ta réponse (1-{len(choices)}) : ")
+            line = input_stream.readline()
+            if not line:
+                raise QuizCancelled()
+            if line.strip().isdigit() and 1 <= int(line) <= len(choices):
+                self.show("")
+                return int(line)
+
+    def show(self, text: str) -> None:
+        """Writes a text and a new line.
+
+        Args:
+            text: The text.
+        """
+        self._write(text + "\n")
+
+    def show_result(self, house: str) -> None:
+        """Writes the screen announcing a house.
+
+        Args:
+            house: The house chosen by the sorting hat.
+        """
+        if self.output_stream is None:
+            super().show_result(house=house)
+            return
+
+        from sorting_hat.render import render_result
+
+        self._write(render_result(house=house).decode("utf-8"))
+
+    def _write(self, text: str) -> None:
+        """Writes to the output stream and flushes it.
+
+        Args:
+            text: The text.
+        """
+        output_stream = self.output_stream or sys.stdout
+        output_stream.write(text)
+        output_stream.flush()
+
+
+class ScriptedPrompt(Prompt):
+    """Answers the questions without anyone, and shows nothing by default.
+
+    Args:
+        answers: The positions of the answers to give, starting from 1, in the
+            order of the questions. Defaults to None (answers drawn at random).
+        rng: The random generator drawing the answers. Defaults to None
+            (the global one).
+        stream: The binary stream the texts and the result screen are written
+            to, for instance to time the rendering too. Defaults to None
+            (nothing is written).
+    """
+
+    def __init__(
+        self,
+        answers: Optional[Iterable[int]] = None,
+        rng: Optional[random.Random] = None,
+        stream: Optional[BinaryIO] = None,
+    ) -> None:
+        """Initializes the class."""
+        self.answers = iter(answers) if answers is not None else None
+        self.rng = rng
+        self.stream = stream
+
+    def ask(self, message: str, choices: list[str]) -> int:
+        """Gives the next answer of the script.
+
+        Args:
+            message: The question.
+            choices: The possible answers.
+
+        Returns:
+            The position of the answer, starting from 1.
+        """
+        if self.answers is None:
+            return (self.rng or random).randint(1, len(choices))
+
+        answer = next(self.answers, None)
+        if answer is None:
+            raise QuizCancelled()
+        if not 1 <= answer <= len(choices):
+            raise ValueError(f"The answer {answer} is not one of the choices.")
+        return answer
+
+    def show(self, text: str) -> None:
+        """Writes a text to the stream, if any.
+
+        Args:
+            text: The text.
+        """
+        if self.stream is not None:
+            self.stream.write(text.encode("utf-8") + b"\n")
+
+    def show_result(self, house: str) -> None:
+        """Writes the screen announcing a house to the stream, if any.
+
+        Args:
+            house: The house chosen by the sorting hat.
+        """
+        if self.stream is not None:
+            from sorting_hat.render import write_result
+
+            write_result(house=house, stream=self.stream)
@@ -0,0 +1,305 @@
+"""This module defines the referential used by the sorting hat.
+
+The referential gathers the questions, the answers and the weights of the quiz.
+The CSV files are parsed once and indexed by question, variation and answer
+so that every lookup made during a sorting is done in constant time. The rows
+are not kept: only the indexes, built from the compact types of the model module.
+"""
+
+import csv
+import os
+from functools import lru_cache
+from importlib import resources
+from typing import Any, Union
+
+from sorting_hat.metrics import timed
+from sorting_hat.model import House, VectorPool, intern_id, to_house
+
+
+class QuizReferential:
+    """Holds the referential of questions, answers and weights.
+
+    Args:
+        questions: The rows of the referential of questions.
+        answers: The rows of the referential of answers.
+        weights: The rows of the referential of weights.
+    """
+
+    __slots__ = ("variation_texts", "variations", "answer_texts", "houses", "weights")
+
+    def __init__(
+        self,
+        questions: list[dict[str, str]],
+        answers: list[dict[str, str]],
+        weights: list[dict[str, str]],
+    ) -> None:
+        """Initializes the class."""
+        self.variation_texts = self._index_variation_texts(questions=questions)
+        self.variations = list(self.variation_texts)
+        self.answer_texts = self._index_answer_texts(answers=answers)
+        self.houses = self._get_houses(weights=weights)
+        self.weights = self._index_weights(weights=weights, houses=self.houses)
+
+    @classmethod
+    def from_package(
+        cls,
+        package: str = "sorting_hat.data",
+        questions: str = "questions.csv",
+        answers: str = "answers.csv",
+        weights: str = "weights.csv",
+    ) -> "QuizReferential":
+        """Builds the referential from the CSV files of a package.
+
+        Args:
+            package: The package containing the CSV files.
+            questions: The filename with the referential of questions to ask.
+            answers: The filename with the referential of answers.
+            weights: The filename with the referential of weights for each question.
+
+        Returns:
+            The referential.
+        """
+        return cls(
+            questions=_load(package=package, filename=questions),
+            answers=_load(package=package, filename=answers),
+            weights=_load(package=package, filename=weights),
+        )
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: Any,
+        questions: str = "questions.csv",
+        answers: str = "answers.csv",
+        weights: str = "weights.csv",
+    ) -> "QuizReferential":
+        """Builds the referential from the CSV files of a directory.
+
+        Args:
+            directory: The directory containing the CSV files, a Path or a
+                directory of the package data.
+            questions: The filename with the referential of questions to ask.
+            answers: The filename with the referential of answers.
+            weights: The filename with the referential of weights for each question.
+
+        Returns:
+            The referential.
+        """
+        return cls(
+            questions=_read(path=directory.joinpath(questions)),
+            answers=_read(path=directory.joinpath(answers)),
+            weights=_read(path=directory.joinpath(weights)),
+        )
+
+    @classmethod
+    def from_indexes(
+        cls,
+        variation_texts: dict[tuple[str, str], str],
+        answer_texts: dict[tuple[str, str], list[str]],
+        houses: tuple[str, ...],
+        weights: dict[tuple[str, str, str], tuple[float, ...]],
+    ) -> "QuizReferential":
+        """Builds the referential from indexes already built, without any parsing.
+
+        Args:
+            variation_texts: The text of each variation keyed by
+                (question_id, variation_id).
+            answer_texts: The texts of the answers keyed by (question_id, variation_id).
+            houses: The houses, giving the order of the weight vectors.
+            weights: The weight of each house keyed by
+                (question_id, variation_id, answer_id).
+
+        Returns:
+            The referential.
+        """
+        pool = VectorPool()
+        referential = cls.__new__(cls)
+        referential.variation_texts = {
+            _variation_key(*key): text for key, text in variation_texts.items()
+        }
+        referential.variations = list(referential.variation_texts)
+        referential.answer_texts = {
+            _variation_key(*key): texts for key, texts in answer_texts.items()
+        }
+        referential.houses = tuple(to_house(house) for house in houses)
+        referential.weights = {
+            _answer_key(*key): pool.get(vector) for key, vector in weights.items()
+        }
+        return referential
+
+    @staticmethod
+    def _index_variation_texts(
+        questions: list[dict[str, str]]
+    ) -> dict[tuple[str, str], str]:
+        """Indexes the text of each variation.
+
+        Args:
+            questions: The rows of the referential of questions.
+
+        Returns:
+            The text of each variation keyed by (question_id, variation_id).
+        """
+        return {
+            _variation_key(question["question_id"], question["variation_id"]): question[
+                "variation_text"
+            ]
+            for question in questions
+        }
+
+    @staticmethod
+    def _index_answer_texts(
+        answers: list[dict[str, str]]
+    ) -> dict[tuple[str, str], list[str]]:
+        """Indexes the possible answers of each variation.
+
+        The answers are kept in the order of the referential so that the position
+        of an answer in the list gives its answer_id (minus one).
+
+        Args:
+            answers: The rows of the referential of answers.
+
+        Returns:
+            The texts of the answers keyed by (question_id, variation_id).
+        """
+        answer_texts: dict[tuple[str, str], list[str]] = {}
+
+        for answer in answers:
+            key = _variation_key(answer["question_id"], answer["variation_id"])
+            answer_texts.setdefault(key, []).append(answer["answer_text"])
+
+        return answer_texts
+
+    @staticmethod
+    def _get_houses(weights: list[dict[str, str]]) -> tuple[Union[House, str], ...]:
+        """Gets the houses in the order they appear in the referential of weights.
+
+        Args:
+            weights: The rows of the referential of weights.
+
+        Returns:
+            The houses.
+        """
+        return tuple(
+            to_house(house) for house in dict.fromkeys(w["house"] for w in weights)
+        )
+
+    @staticmethod
+    def _index_weights(
+        weights: list[dict[str, str]], houses: tuple[str, ...]
+    ) -> dict[tuple[str, str, str], tuple[float, ...]]:
+        """Indexes the weights of each answer.
+
+        Each answer gets a dense vector, one weight per house, and the identical
+        vectors are shared.
+
+        Args:
+            weights: The rows of the referential of weights.
+            houses: The houses, giving the order of the weight vectors.
+
+        Returns:
+            The weight of each house keyed by (question_id, variation_id, answer_id).
+        """
+        position = {house: i for i, house in enumerate(houses)}
+        indexed_weights: dict[tuple[str, str, str], list[float]] = {}
+
+        for weight in weights:
+            key = _answer_key(
+                weight["question_id"], weight["variation_id"], weight["answer_id"]
+            )
+            vector = indexed_weights.setdefault(key, [0.0] * len(houses))
+            vector[position[weight["house"]]] += float(weight["weight"])
+
+        pool = VectorPool()
+        return {key: pool.get(tuple(vector)) for key, vector in indexed_weights.items()}
+
+
+def _variation_key(question_id: str, variation_id: str) -> tuple[str, str]:
+    """Builds the key of a variation from interned ids.
+
+    Args:
+        question_id: The id of the question.
+        variation_id: The id of the variation.
+
+    Returns:
+        The key (question_id, variation_id).
+    """
+    return intern_id(question_id), intern_id(variation_id)
+
+
+def _answer_key(
+    question_id: str, variation_id: str, answer_id: str
+) -> tuple[str, str, str]:
+    """Builds the key of an answer from interned ids.
+
+    Args:
+        question_id: The id of the question.
+        variation_id: The id of the variation.
+        answer_id: The id of the answer.
+
+    Returns:
+        The key (question_id, variation_id, answer_id).
+    """
+    return intern_id(question_id), intern_id(variation_id), intern_id(answer_id)
+
+
+def _load(package: str, filename: str) -> list[dict[str, str]]:
+    """Loads one of the input files (the questions, the answers or the weights).
+
+    Args:
+        package: The package containing the file.
+        filename: The filename to load.
+
+    Returns:
+        A list of rows.
+    """
+    with resources.open_text(package=package, resource=filename, encoding="utf-8") as f:
+        return list(csv.DictReader(f=f))
+
+
+def _read(path: Any) -> list[dict[str, str]]:
+    """Reads one of the input files from a path.
+
+    Args:
+        path: The path of the file, a Path or a file of the package data.
+
+    Returns:
+        A list of rows.
+    """
+    with path.open("r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f=f))
+
+
+@lru_cache(maxsize=None)
+def load_referential(package: str = "sorting_hat.data") -> QuizReferential:
+    """Loads the referential of a package once per process.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The referential, read by read_referential on first use.
+    """
+    return read_referential(package=package)
+
+
+@timed("load_referential")
+def read_referential(package: str = "sorting_hat.data") -> QuizReferential:
+    """Reads the referential of a package, as its files are now.
+
+    The referential is read from its compiled form in the cache directory, which is
+    built on first use. Set the SORTING_HAT_NO_CACHE environment variable to parse
+    the CSV files instead.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The referential.
+    """
+    if os.environ.get("SORTING_HAT_NO_CACHE"):
+        return QuizReferential.from_package(package=package)
+
+    # Imported here as the cache module depends on this one.
+    from sorting_hat.cache import load_compiled
+
+    return load_compiled(package=package)
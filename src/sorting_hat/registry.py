@@ -0,0 +1,293 @@
+"""This module finds the quiz packs and keeps the ones in use in memory.
+
+A quiz pack is a set of the three CSV files of a referential (questions.csv,
+answers.csv and weights.csv), for instance in another language or with the
+weights of a season. The packs are found:
+
+- in the package data: the default pack, named "default", and each directory of
+  `sorting_hat/data/packs`,
+- in extra directories, given to the registry or listed in the
+  SORTING_HAT_PACKS_PATH environment variable (separated as in PATH): each
+  directory holding the three files, or each of its subdirectories holding them,
+  is a pack named after it.
+
+Each pack is loaded on first use and kept in a bounded LRU cache, so a process
+serving several packs switches from one to another without reading the disk again.
+The cache is guarded by a lock, as the packs can be swapped by a watcher thread
+(see `sorting_hat.reload`) while they are looked up.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional, Union
+
+from sorting_hat.referential import QuizReferential, read_referential
+
+DEFAULT_PACK = "default"
+
+FILENAMES = ("questions.csv", "answers.csv", "weights.csv")
+
+
+class Pack(NamedTuple):
+    """Where to find a quiz pack."""
+
+    name: str
+    location: Union[Path, Any]  # A directory, or a directory of the package data.
+    builtin: bool
+
+
+class PackRegistry:
+    """Finds the quiz packs and loads them on demand into a bounded LRU cache.
+
+    Args:
+        extra_dirs: The directories to look for packs in, besides the package data
+            and SORTING_HAT_PACKS_PATH. Defaults to none.
+        max_packs: The number of packs kept in memory. Defaults to 8.
+        max_bytes: The approximate memory the packs kept may use, in bytes.
+            Defaults to None (no limit).
+    """
+
+    def __init__(
+        self,
+        extra_dirs: Iterable[Union[str, Path]] = (),
+        max_packs: int = 8,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """Initializes the class."""
+        self.extra_dirs = [Path(directory) for directory in extra_dirs]
+        self.extra_dirs += [
+            Path(directory)
+            for directory in os.environ.get("SORTING_HAT_PACKS_PATH", "").split(
+                os.pathsep
+            )
+            if directory
+        ]
+        self.max_packs = max_packs
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds: dict[str, float] = {}
+        self._packs: Optional[dict[str, Pack]] = None
+        self._loaded: OrderedDict[str, tuple[QuizReferential, int]] = OrderedDict()
+        # The number of times each pack was replaced, to tell whether a pack read
+        # while it was replaced is already out of date.
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def packs(self) -> dict[str, Pack]:
+        """The packs found, by name. They are looked for on first access."""
+        if self._packs is None:
+            self.refresh()
+        return self._packs  # type: ignore[return-value]
+
+    def refresh(self) -> None:
+        """Looks for the packs again, for instance after adding a directory."""
+        packs = {DEFAULT_PACK: Pack(DEFAULT_PACK, "sorting_hat.data", builtin=True)}
+
+        builtin_packs = resources.files("sorting_hat.data").joinpath("packs")
+        if builtin_packs.is_dir():
+            for directory in sorted(builtin_packs.iterdir(), key=lambda d: d.name):
+                if _is_pack(directory):
+                    packs[directory.name] = Pack(directory.name, directory, True)
+
+        for extra_dir in self.extra_dirs:
+            candidates = [extra_dir] if _is_pack(extra_dir) else []
+            if extra_dir.is_dir():
+                candidates += sorted(d for d in extra_dir.iterdir() if _is_pack(d))
+            for directory in candidates:
+                # The first pack found with a name wins, as in PATH.
+                packs.setdefault(directory.name, Pack(directory.name, directory, False))
+
+        self._packs = packs
+
+    def get(self, name: str = DEFAULT_PACK) -> QuizReferential:
+        """Gets the referential of a pack, loading it if it is not in memory.
+
+        Args:
+            name: The name of the pack.
+
+        Returns:
+            The referential.
+        """
+        with self._lock:
+            entry = self._loaded.get(name)
+            if entry is not None:
+                self.hits += 1
+                self._loaded.move_to_end(name)
+                return entry[0]
+            self.misses += 1
+
+        try:
+            pack = self.packs[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown pack {name!r}, it should be one of {', '.join(self.packs)}."
+            ) from None
+
+        # The files are read without holding the lock, so that the packs in memory
+        # can still be looked up meanwhile.
+        while True:
+            generation = self._generations.get(name, 0)
+            start = time.perf_counter()
+            if name == DEFAULT_PACK:
+                # Not the referential of the process, which a reload does not swap.
+                referential = read_referential(package=pack.location)
+            else:
+                referential = QuizReferential.from_directory(directory=pack.location)
+            seconds = time.perf_counter() - start
+            size = estimate_size(referential=referential)
+
+            with self._lock:
+                if self._generations.get(name, 0) != generation:
+                    continue  # Replaced while it was read: read it again.
+                self.load_seconds[name] = seconds
+                entry = self._loaded.get(name)
+                if entry is not None:
+                    # Loaded by another thread meanwhile: keep a single referential.
+                    self._loaded.move_to_end(name)
+                    return entry[0]
+
+                self._loaded[name] = (referential, size)
+                self.size += size
+                while len(self._loaded) > 1 and (
+                    len(self._loaded) > self.max_packs
+                    or (self.max_bytes is not None and self.size > self.max_bytes)
+                ):
+                    _, (_, evicted_size) = self._loaded.popitem(last=False)
+                    self.size -= evicted_size
+                    self.evictions += 1
+
+                return referential
+
+    def replace(self, name: str, referential: QuizReferential) -> bool:
+        """Swaps in a new referential for a pack kept in memory.
+
+        The entry is replaced under the lock of the cache, so a lookup from
+        another thread gets either the previous referential or the new one, and a
+        pack being read meanwhile is read again.
+
+        Args:
+            name: The name of the pack.
+            referential: The new referential of the pack.
+
+        Returns:
+            True if the pack was in memory, False if it will be read on first use.
+        """
+        size = estimate_size(referential=referential)
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            entry = self._loaded.get(name)
+            if entry is None:
+                return False
+
+            self._loaded[name] = (referential, size)
+            self.size += size - entry[1]
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        """Gets the counters of the cache of packs.
+
+        Returns:
+            The packs in memory, their approximate size, the hits, misses and
+            evictions, the hit rate and the last load time of each pack.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "loaded": list(self._loaded),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "load_seconds": dict(self.load_seconds),
+            }
+
+
+def _is_pack(directory: Any) -> bool:
+    """Tells whether a directory holds the three files of a referential.
+
+    Args:
+        directory: The directory, a Path or a directory of the package data.
+
+    Returns:
+        True if the directory is a pack.
+    """
+    return directory.is_dir() and all(
+        directory.joinpath(filename).is_file() for filename in FILENAMES
+    )
+
+
+def estimate_size(referential: QuizReferential) -> int:
+    """Estimates the memory used by a referential.
+
+    Args:
+        referential: The referential.
+
+    Returns:
+        The approximate size, in bytes, of its indexes and of the objects they hold.
+    """
+    seen: set[int] = set()
+    size = 0
+    stack: list[Any] = [
+        referential.variation_texts,
+        referential.variations,
+        referential.answer_texts,
+        referential.houses,
+        referential.weights,
+    ]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+
+    return size
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> PackRegistry:
+    """Gets the registry shared by the whole process.
+
+    Returns:
+        The registry, looking for packs in SORTING_HAT_PACKS_PATH.
+    """
+    return PackRegistry()
+
+
+def resolve_referential(
+    referential: Optional[QuizReferential] = None, pack: Optional[str] = None
+) -> QuizReferential:
+    """Gets the referential given, or the one of a pack.
+
+    Args:
+        referential: The referential to use. Defaults to None.
+        pack: The name of the pack to use instead. Defaults to None
+            (the default pack, if no referential is given).
+
+    Returns:
+        The referential.
+    """
+    if referential is not None and pack is not None:
+        raise ValueError("Give either a referential or a pack, not both.")
+
+    if referential is not None:
+        return referential
+
+    return get_registry().get(name=pack or DEFAULT_PACK)
@@ -0,0 +1,246 @@
+"""This module reloads the quiz data of a long-running process when it changes.
+
+A ReferentialWatcher polls the modification time and the size of the three CSV
+files of a pack. When they change, the referential is rebuilt on a background
+thread and checked by validate_referential. If it is valid, it is handed to a
+callback which swaps it in with a single assignment, so requests are still handled
+while the files are read and the referential is built. If it is not, the previous
+referential is kept until the files change again.
+
+Each reload is logged, with its build time and the version of the files (the
+start of the SHA-256 digest of their content), on the "sorting_hat.reload" logger.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from importlib import resources
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from sorting_hat.referential import QuizReferential
+from sorting_hat.registry import FILENAMES, PackRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def validate_referential(referential: QuizReferential) -> None:
+    """Checks that a referential can be used to sort someone.
+
+    Args:
+        referential: The referential.
+
+    Raises:
+        ValueError: If a variation has no answers, if an answer has no weights,
+            if weights are given to an unknown answer or if the weights of an
+            answer do not sum to 1.
+    """
+    problems = []
+    answers = set()
+
+    for question_id, variation_id in referential.variations:
+        texts = referential.answer_texts.get((question_id, variation_id))
+        if not texts:
+            problems.append(f"{question_id}/{variation_id} has no answers")
+            continue
+        for answer_id in range(1, len(texts) + 1):
+            key = (question_id, variation_id, str(answer_id))
+            answers.add(key)
+            if key not in referential.weights:
+                problems.append(f"{'/'.join(key)} has no weights")
+
+    for key, vector in referential.weights.items():
+        if key not in answers:
+            problems.append(f"{'/'.join(key)} has weights but is not an answer")
+        elif not math.isclose(sum(vector), 1.0, abs_tol=1e-9):
+            problems.append(f"the weights of {'/'.join(key)} sum to {sum(vector):g}")
+
+    if problems:
+        more = f" and {len(problems) - 5} more" if len(problems) > 5 else ""
+        raise ValueError(
+            f"The referential is not valid: {', '.join(problems[:5])}{more}."
+        )
+
+
+class ReferentialWatcher:
+    """Rebuilds the referential of a pack when its CSV files change.
+
+    Args:
+        name: The name of the pack, for the logs.
+        directory: The directory holding the CSV files, a Path, a directory of the
+            package data stored on disk or the name of such a package.
+        on_reload: The function swapping in the new referential, called with the
+            referential and its version.
+        interval: The number of seconds between two checks of the files.
+            Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        directory: Any,
+        on_reload: Callable[[QuizReferential, str], None],
+        interval: float = 2.0,
+    ) -> None:
+        """Initializes the class."""
+        if isinstance(directory, str):
+            directory = resources.files(directory)
+        self.name = name
+        self.directory = directory
+        self.on_reload = on_reload
+        self.interval = interval
+        self.paths = [Path(str(directory.joinpath(name))) for name in FILENAMES]
+        self.reloads = 0
+        self.failures = 0
+        self.version = self._hash()
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stat(self) -> tuple[tuple[int, int], ...]:
+        """Gets the modification time and the size of each file.
+
+        Returns:
+            The signature of the files, which changes when one of them is written.
+        """
+        signature = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                signature.append((-1, -1))
+            else:
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _hash(self) -> str:
+        """Hashes the content of the files.
+
+        Returns:
+            The first 12 hexadecimal digits of the digest, or "" if a file is missing.
+        """
+        digest = hashlib.sha256()
+        try:
+            for path in self.paths:
+                digest.update(path.read_bytes())
+        except OSError:
+            return ""
+        return digest.hexdigest()[:12]
+
+    def check(self) -> bool:
+        """Reloads the referential if the files changed since the last check.
+
+        Returns:
+            True if a new referential was swapped in.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+
+        start = time.perf_counter()
+        version = self._hash()
+        try:
+            referential = QuizReferential.from_directory(directory=self.directory)
+            validate_referential(referential=referential)
+        except (OSError, ValueError, KeyError) as error:
+            self.failures += 1
+            logger.error(
+                "Kept version %s of pack %s, version %s is not valid: %s",
+                self.version,
+                self.name,
+                version,
+                error,
+            )
+            referential = None
+        build_seconds = time.perf_counter() - start
+
+        if self._stat() != signature:
+            # The files were written again while being read: check them once more
+            # on the next poll, whatever the outcome of this build.
+            return False
+        self._signature = signature
+        if referential is None:
+            return False
+
+        self.on_reload(referential, version)
+        self.reloads += 1
+        logger.info(
+            "Reloaded pack %s: version %s (was %s), built in %.1f ms",
+            self.name,
+            version,
+            self.version,
+            build_seconds * 1000,
+        )
+        self.version = version
+        return True
+
+    def start(self) -> None:
+        """Starts checking the files on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"reload-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Checks the files every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("The reload of pack %s failed.", self.name)
+
+    def stop(self) -> None:
+        """Stops the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def watch_registry(
+    registry: PackRegistry,
+    on_reload: Optional[Callable[[str, QuizReferential], None]] = None,
+    interval: float = 2.0,
+) -> list[ReferentialWatcher]:
+    """Starts watching every pack of a registry.
+
+    A pack reloaded replaces the one the registry keeps in memory, if any.
+
+    Args:
+        registry: The registry of the packs.
+        on_reload: A function also called with the name and the new referential
+            of each pack reloaded. Defaults to None.
+        interval: The number of seconds between two checks of the files.
+            Defaults to 2.
+
+    Returns:
+        The watchers, already started.
+    """
+    watchers = []
+    for pack in registry.packs.values():
+
+        def swap(
+            referential: QuizReferential, version: str, name: str = pack.name
+        ) -> None:
+            """Swaps in the new referential of a pack.
+
+            Args:
+                referential: The new referential.
+                version: The version of its files.
+                name: The name of the pack.
+            """
+            registry.replace(name=name, referential=referential)
+            if on_reload is not None:
+                on_reload(name, referential)
+
+        watcher = ReferentialWatcher(
+            name=pack.name, directory=pack.location, on_reload=swap, interval=interval
+        )
+        watcher.start()
+        watchers.append(watcher)
+    return watchers
@@ -0,0 +1,118 @@
+"""This module renders the screen announcing the house chosen by the sorting hat.
+
+The ASCII art of each house is stored in the data files of the package and read
+once, already encoded in UTF-8. The whole screen (the banner, the art and the
+welcome message) is built into a single buffer, cached for each house, so that it
+is written to a terminal, a log or a socket with a single write.
+"""
+
+import sys
+from functools import lru_cache
+from importlib import resources
+from typing import BinaryIO, Optional
+
+from sorting_hat.metrics import timed
+from sorting_hat.model import House
+
+_WELCOME_MESSAGES = {
+    House.GRYFFONDOR: "On a vu pire que Gryffondor, tu ne t'en sors pas si mal !",
+    House.POUFSOUFFLE: "Ils sont gentils les Poufsouffle, c'est déjà quelque chose !",
+    House.SERDAIGLE: "Serdaigle, vraiment ? Et bien... bon courage ?",
+    House.SERPENTARD: "Aaah Serpentard ! Welcome my friend !",
+}
+
+
+def _check_house(house: str) -> House:
+    """Checks that a house exists.
+
+    Args:
+        house: The house to check.
+
+    Returns:
+        The member of the House enum.
+    """
+    try:
+        return House(house)
+    except ValueError:
+        raise ValueError(
+            f"The house should be one of {', '.join(map(str, House))}."
+        ) from None
+
+
+def get_welcome_message(house: str) -> str:
+    """Gets a different welcome message for each house.
+
+    Args:
+        house: The house for which to get the welcome message.
+
+    Returns:
+        The welcome message.
+    """
+    return _WELCOME_MESSAGES[_check_house(house=house)]
+
+
+@lru_cache(maxsize=None)
+def get_house_art(house: str) -> bytes:
+    """Gets the ASCII art of a house, encoded in UTF-8.
+
+    Args:
+        house: The house for which to get the ASCII art.
+
+    Returns:
+        The ASCII art.
+    """
+    house = _check_house(house=house)
+
+    return resources.files("sorting_hat.data").joinpath(f"art/{house}.txt").read_bytes()
+
+
+@lru_cache(maxsize=None)
+def render_result(house: str) -> bytes:
+    """Renders the screen announcing a house.
+
+    Args:
+        house: The house chosen by the sorting hat.
+
+    Returns:
+        The banner, the ASCII art and the welcome message, encoded in UTF-8.
+    """
+    house = _check_house(house=house)
+
+    banner = (
+        "\n-------------------- Le choix a été fait !  --------------------\n"
+        f"\n---------- La maison {house.capitalize()} te souhaite la bienvenue !"
+        " ----------\n\n\n"
+    )
+    welcome_message = (
+        f"\n\n---------- {get_welcome_message(house=house)} ----------\n\n"
+    )
+
+    return b"".join(
+        (
+            banner.encode("utf-8"),
+            get_house_art(house=house),
+            welcome_message.encode("utf-8"),
+        )
+    )
+
+
+@timed("write_result")
+def write_result(house: str, stream: Optional[BinaryIO] = None) -> None:
+    """Writes the screen announcing a house with a single write.
+
+    Args:
+        house: The house chosen by the sorting hat.
+        stream: The binary stream to write to. Defaults to None (the standard output).
+    """
+    content = render_result(house=house)
+
+    if stream is None:
+        sys.stdout.flush()
+        stream = getattr(sys.stdout, "buffer", None)
+        if stream is None:
+            # The standard output was replaced by a text-only stream.
+            sys.stdout.write(content.decode("utf-8"))
+            return
+
+    stream.write(content)
+    stream.flush()
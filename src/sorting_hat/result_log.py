@@ -0,0 +1,1033 @@
+"""This module keeps every sorting in an append-only binary log, for auditing.
+
+Each sorting is appended as a record of a fixed size, so the log can be read
+back without parsing and a record is found from its position alone:
+
+- the time of the sorting, in microseconds since the epoch,
+- a hash of the respondent (the first 8 bytes of its BLAKE2b digest),
+- the score of each house,
+- the quiz pack, the winning house and whether it was drawn among tied houses,
+- the answer given to each variation logged (0 if not asked).
+
+The records are appended to segments of at most `segment_records` records
+(``segment-000000.log``, ``segment-000001.log``, ...). Next to each segment, a
+small side index gives, for each block of `block_records` consecutive records,
+the first and last times and the number of sortings won by each house. A
+``meta.json`` file describes the layout of the records: the houses, the names
+of the packs and the tables of the variations. The houses are the same for every
+pack, the variations are not: the packs are mapped to the columns of a single
+table, and a pack bringing variations the table does not have yet starts a new
+segment, whose records have a column more for each of them.
+
+A ResultLogReader maps the segments into memory and scans them in place: the
+index skips the blocks outside a time range or without the house looked for,
+counts the blocks entirely matched without reading them, and a column of the
+records (a house, a pack or the answer to a variation) is read with a single
+strided slice. The `sorting-hat query` command is built on top of it.
+
+Only one ResultLog should append to a directory at a time. The index of the
+last segment is only written once a block is full or the log is closed, so after
+a crash it is completed from the records on the next opening.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from sorting_hat.registry import DEFAULT_PACK
+
+if TYPE_CHECKING:
+    from sorting_hat.referential import QuizReferential
+
+FORMAT_VERSION = 2
+
+# The versions of meta.json which can be read, the first one with a single table.
+_READABLE_VERSIONS = (1, FORMAT_VERSION)
+
+SEGMENT_RECORDS = 1 << 20
+
+BLOCK_RECORDS = 4096
+
+_META = "meta.json"
+
+_INDEX_MAGIC = b"SHIX"
+
+# The magic, the number of records indexed and the number of records per block.
+_INDEX_HEADER = struct.Struct("<4sII")
+
+_TIE = 1
+
+
+class LoggedResult(NamedTuple):
+    """A sorting read back from the log."""
+
+    timestamp: float  # In seconds since the epoch.
+    respondent: str  # The hash of the respondent, in hexadecimal.
+    pack: str
+    house: str
+    tie: bool
+    scores: dict[str, float]
+    answers: list[tuple[str, str, str]]  # The question_id, variation_id, answer_id.
+
+
+def hash_respondent(respondent_id: str) -> int:
+    """Hashes a respondent, so that the log does not hold who was sorted.
+
+    Args:
+        respondent_id: The id of the respondent.
+
+    Returns:
+        The first 8 bytes of the BLAKE2b digest of the id, as an integer.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(respondent_id.encode("utf-8"), digest_size=8).digest(),
+        "little",
+    )
+
+
+def parse_time(value: str, now: Optional[float] = None) -> float:
+    """Parses a time given on the command line.
+
+    Args:
+        value: An ISO 8601 date or date and time (in local time unless it has
+            an offset), or a duration before now such as "7d", "12h" or "30m".
+        now: The current time, in seconds since the epoch. Defaults to None
+            (the time of the call).
+
+    Returns:
+        The time, in seconds since the epoch.
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([dhms])", value.strip())
+    if match is not None:
+        seconds = {"d": 86400, "h": 3600, "m": 60, "s": 1}[match[2]]
+        return (time.time() if now is None else now) - float(match[1]) * seconds
+
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise ValueError(
+            f"{value!r} should be an ISO date or a duration such as 7d or 12h."
+        ) from None
+
+
+class _Columns:
+    """The answer columns of the records of some segments.
+
+    Args:
+        first_segment: The number of the first segment written with the table.
+        variations: The (question_id, variation_id) of each answer column.
+        tail: The offset of the bytes following the scores in a record.
+    """
+
+    __slots__ = ("first_segment", "variations", "offsets", "record_size")
+
+    def __init__(
+        self, first_segment: int, variations: Sequence[tuple[str, str]], tail: int
+    ) -> None:
+        """Initializes the class."""
+        self.first_segment = first_segment
+        self.variations = tuple(variations)
+        # One byte for the pack, the house and the flags, then the answers.
+        self.offsets = {key: tail + 3 + i for i, key in enumerate(self.variations)}
+        self.record_size = -(-(tail + 3 + len(self.variations)) // 8) * 8
+
+
+class _Layout:
+    """Describes the records of a log, as saved in its meta.json file.
+
+    Args:
+        houses: The houses, giving the order of the scores.
+        tables: The first segment and the (question_id, variation_id) of each
+            answer column of each table of variations, in order.
+        packs: The names of the packs, whose position is stored in the records.
+        segment_records: The maximum number of records of a segment.
+        block_records: The number of records of a block of the side indexes.
+    """
+
+    def __init__(
+        self,
+        houses: Sequence[str],
+        tables: Iterable[tuple[int, Sequence[tuple[str, str]]]],
+        packs: list[str],
+        segment_records: int,
+        block_records: int,
+    ) -> None:
+        """Initializes the class."""
+        self.houses = tuple(houses)
+        self.packs = packs
+        self.segment_records = segment_records
+        self.block_records = block_records
+
+        # The time, the hash of the respondent and the scores, then the bytes of
+        # the columns of the table of the segment.
+        self.head = struct.Struct(f"<qQ{len(self.houses)}d")
+        self.tail = self.head.size
+        self.block = struct.Struct(f"<qq{len(self.houses)}I")
+        self.tables = [
+            _Columns(first_segment=first_segment, variations=variations, tail=self.tail)
+            for first_segment, variations in tables
+        ]
+
+    def columns(self, segment: int) -> _Columns:
+        """Gets the table of the variations of a segment.
+
+        Args:
+            segment: The number of the segment.
+
+        Returns:
+            The last table started at or before the segment.
+        """
+        for table in reversed(self.tables):
+            if table.first_segment <= segment:
+                return table
+        return self.tables[0]
+
+    def add_table(
+        self, first_segment: int, variations: Sequence[tuple[str, str]]
+    ) -> None:
+        """Starts a new table of the variations, replacing one of the same segment.
+
+        Args:
+            first_segment: The number of the first segment written with the table.
+            variations: The (question_id, variation_id) of each answer column.
+        """
+        if self.tables[-1].first_segment == first_segment:
+            self.tables.pop()
+        self.tables.append(
+            _Columns(first_segment=first_segment, variations=variations, tail=self.tail)
+        )
+
+    @classmethod
+    def load(cls, directory: Path) -> "_Layout":
+        """Reads the layout of a log.
+
+        Args:
+            directory: The directory of the log.
+
+        Returns:
+            The layout.
+        """
+        data = json.loads((directory / _META).read_text(encoding="utf-8"))
+        if data.get("version") not in _READABLE_VERSIONS:
+            raise ValueError(f"{directory} is not a result log of this version.")
+
+        tables = data.get("tables", [[0, data.get("variations")]])
+        return cls(
+            houses=data["houses"],
+            tables=[
+                (first_segment, [tuple(key.split("/")) for key in variations])
+                for first_segment, variations in tables
+            ],
+            packs=data["packs"],
+            segment_records=data["segment_records"],
+            block_records=data["block_records"],
+        )
+
+    def dump(self, directory: Path) -> None:
+        """Writes the layout atomically.
+
+        Args:
+            directory: The directory of the log.
+        """
+        path = directory / _META
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_text(
+            json.dumps(
+                {
+                    "version": FORMAT_VERSION,
+                    "houses": list(map(str, self.houses)),
+                    "tables": [
+                        [
+                            table.first_segment,
+                            ["/".join(key) for key in table.variations],
+                        ]
+                        for table in self.tables
+                    ],
+                    "packs": self.packs,
+                    "segment_records": self.segment_records,
+                    "block_records": self.block_records,
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temporary_path, path)
+
+
+class _SegmentIndex:
+    """The side index of a segment: the times and the houses of each block.
+
+    Args:
+        layout: The layout of the records.
+        record_size: The size of the records of the segment.
+    """
+
+    __slots__ = ("layout", "record_size", "records", "blocks")
+
+    def __init__(self, layout: _Layout, record_size: int) -> None:
+        """Initializes the class."""
+        self.layout = layout
+        self.record_size = record_size
+        self.records = 0
+        # The first time, the last time and the number of sortings of each house.
+        self.blocks: list[list[int]] = []
+
+    def add(self, timestamp: int, house: int) -> None:
+        """Indexes the next record of the segment.
+
+        Args:
+            timestamp: The time of the record, in microseconds.
+            house: The position of its house.
+        """
+        if self.records % self.layout.block_records == 0:
+            self.blocks.append([timestamp, timestamp] + [0] * len(self.layout.houses))
+        block = self.blocks[-1]
+        block[0] = min(block[0], timestamp)
+        block[1] = max(block[1], timestamp)
+        block[2 + house] += 1
+        self.records += 1
+
+    def extend(self, data: Any, records: int) -> None:
+        """Indexes the records of a segment which are not indexed yet.
+
+        Args:
+            data: The content of the segment.
+            records: The number of records of the segment.
+        """
+        layout = self.layout
+        house_offset = layout.tail + 1
+        for position in range(self.records, records):
+            offset = position * self.record_size
+            self.add(
+                timestamp=struct.unpack_from("<q", data, offset)[0],
+                house=data[offset + house_offset],
+            )
+
+    def dump(self, path: Path) -> None:
+        """Writes the index atomically.
+
+        Args:
+            path: The path of the index.
+        """
+        parts = [
+            _INDEX_HEADER.pack(_INDEX_MAGIC, self.records, self.layout.block_records)
+        ]
+        parts += [self.layout.block.pack(*block) for block in self.blocks]
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_bytes(b"".join(parts))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(
+        cls, path: Path, layout: _Layout, record_size: int, data: Any, records: int
+    ) -> "_SegmentIndex":
+        """Reads the index of a segment, completing it from the records if needed.
+
+        Args:
+            path: The path of the index.
+            layout: The layout of the records.
+            record_size: The size of the records of the segment.
+            data: The content of the segment.
+            records: The number of records of the segment.
+
+        Returns:
+            The index of every record of the segment.
+        """
+        index = cls(layout=layout, record_size=record_size)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            content = b""
+
+        if len(content) >= _INDEX_HEADER.size:
+            magic, indexed, block_records = _INDEX_HEADER.unpack_from(content)
+            if (
+                magic == _INDEX_MAGIC
+                and block_records == layout.block_records
+                and indexed <= records
+            ):
+                index.records = indexed
+                index.blocks = [
+                    list(block)
+                    for block in layout.block.iter_unpack(content[_INDEX_HEADER.size :])
+                ]
+
+        index.extend(data=data, records=records)
+        return index
+
+
+def _segment_path(directory: Path, number: int) -> Path:
+    """Gets the path of a segment.
+
+    Args:
+        directory: The directory of the log.
+        number: The number of the segment.
+
+    Returns:
+        The path of the segment.
+    """
+    return directory / f"segment-{number:06d}.log"
+
+
+def _segment_number(path: Path) -> int:
+    """Gets the number of a segment.
+
+    Args:
+        path: The path of the segment.
+
+    Returns:
+        The number of the segment.
+    """
+    return int(path.stem.split("-")[1])
+
+
+def _segment_paths(directory: Path) -> list[Path]:
+    """Lists the segments of a log, in order.
+
+    Args:
+        directory: The directory of the log.
+
+    Returns:
+        The paths of the segments.
+    """
+    return sorted(directory.glob("segment-*.log"))
+
+
+def _map(path: Path) -> Optional[mmap.mmap]:
+    """Maps a segment into memory, read-only.
+
+    Args:
+        path: The path of the segment.
+
+    Returns:
+        The content of the segment, or None if it is empty.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ResultLog:
+    """Appends the sortings to a segmented binary log.
+
+    The records are buffered and written once `buffer_records` are waiting, when
+    flush is called and when the log is closed.
+
+    Args:
+        directory: The directory of the log, created if needed.
+        referential: The referential giving the houses and the variations of a new
+            log, added to an existing one with add_referential. Defaults to None
+            (the default referential for a new log, none for an existing one).
+        segment_records: The maximum number of records of a segment of a new log.
+            Defaults to SEGMENT_RECORDS.
+        block_records: The number of records of a block of the side indexes of a
+            new log. Defaults to BLOCK_RECORDS.
+        buffer_records: The number of records buffered before they are written.
+            Defaults to BLOCK_RECORDS (1 writes each record at once).
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        referential: Optional["QuizReferential"] = None,
+        segment_records: int = SEGMENT_RECORDS,
+        block_records: int = BLOCK_RECORDS,
+        buffer_records: int = BLOCK_RECORDS,
+    ) -> None:
+        """Initializes the class."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.buffer_records = buffer_records
+
+        existing = (self.directory / _META).exists()
+        if existing:
+            self.layout = _Layout.load(directory=self.directory)
+        else:
+            if referential is None:
+                from sorting_hat.referential import load_referential
+
+                referential = load_referential()
+            self.layout = _Layout(
+                houses=list(map(str, referential.houses)),
+                tables=[(0, referential.variations)],
+                packs=[DEFAULT_PACK],
+                segment_records=segment_records,
+                block_records=block_records,
+            )
+            self.layout.dump(directory=self.directory)
+
+        self._houses = {house: i for i, house in enumerate(self.layout.houses)}
+        self._buffer = bytearray()
+        self._pending = 0
+
+        paths = _segment_paths(directory=self.directory)
+        self._number = _segment_number(path=paths[-1]) if paths else 0
+        self._open_segment()
+        if existing and referential is not None:
+            self.add_referential(referential=referential)
+
+    def _open_segment(self) -> None:
+        """Opens the current segment for appending, dropping a partial last record."""
+        self._columns = self.layout.columns(segment=self._number)
+        record_size = self._columns.record_size
+        path = _segment_path(directory=self.directory, number=self._number)
+        path.touch()
+        size = path.stat().st_size
+        records = size // record_size
+        if size != records * record_size:
+            os.truncate(path, records * record_size)
+
+        data = _map(path=path)
+        try:
+            self._index = _SegmentIndex.load(
+                path=path.with_suffix(".idx"),
+                layout=self.layout,
+                record_size=record_size,
+                data=data,
+                records=records,
+            )
+        finally:
+            if data is not None:
+                data.close()
+        self._full_blocks = self._index.records // self.layout.block_records
+        self._file = open(path, "ab")
+
+    @property
+    def record_size(self) -> int:
+        """The size of the records of the current segment, in bytes."""
+        return self._columns.record_size
+
+    def check_referential(self, referential: "QuizReferential") -> None:
+        """Checks that the sortings of a referential can be logged, without writing.
+
+        Args:
+            referential: The referential.
+        """
+        if tuple(map(str, referential.houses)) != self.layout.houses:
+            raise ValueError(
+                f"The log in {self.directory} holds the scores of the houses "
+                f"{', '.join(self.layout.houses)}, not of the houses of this pack."
+            )
+
+    def add_referential(self, referential: "QuizReferential") -> None:
+        """Makes the log ready for the sortings of a referential, such as a pack.
+
+        Its variations missing from the table of the current segment are added as
+        new columns, from a new segment on.
+
+        Args:
+            referential: The referential.
+        """
+        self.check_referential(referential=referential)
+
+        variations = self._columns.variations
+        missing = [
+            key for key in referential.variations if key not in self._columns.offsets
+        ]
+        if not missing:
+            return
+
+        if self._index.records:
+            self.close()
+            self._number += 1
+        else:
+            self._file.close()
+        self.layout.add_table(
+            first_segment=self._number, variations=variations + tuple(missing)
+        )
+        self.layout.dump(directory=self.directory)
+        self._open_segment()
+
+    def append(
+        self,
+        respondent_id: str,
+        answers: Iterable[tuple[str, str, str]],
+        house: str,
+        scores: Union[dict[str, float], Sequence[float]],
+        pack: str = DEFAULT_PACK,
+        tie: bool = False,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Appends a sorting to the log.
+
+        Args:
+            respondent_id: The id of the respondent, only its hash is kept.
+            answers: The question_id, the variation_id and the answer_id of each
+                answer.
+            house: The winning house.
+            scores: The score of each house, by house or in the order of the houses.
+            pack: The name of the quiz pack. Defaults to DEFAULT_PACK.
+            tie: A flag telling whether the house was drawn among tied houses.
+                Defaults to False.
+            timestamp: The time of the sorting, in seconds since the epoch.
+                Defaults to None (now).
+        """
+        layout = self.layout
+        if isinstance(scores, dict):
+            scores = [scores.get(house_name, 0.0) for house_name in layout.houses]
+        house_position = self._houses[house]
+        microseconds = int((time.time() if timestamp is None else timestamp) * 1e6)
+
+        record = bytearray(self._columns.record_size)
+        layout.head.pack_into(
+            record, 0, microseconds, hash_respondent(respondent_id), *scores
+        )
+        record[layout.tail] = self._get_pack_position(pack=pack)
+        record[layout.tail + 1] = house_position
+        record[layout.tail + 2] = _TIE if tie else 0
+        for question_id, variation_id, answer_id in answers:
+            try:
+                column = self._columns.offsets[(question_id, variation_id)]
+            except KeyError:
+                raise ValueError(
+                    f"The variation {question_id}/{variation_id} is not one of the "
+                    f"variations of the log in {self.directory}, add its referential "
+                    "first."
+                ) from None
+            record[column] = int(answer_id)
+
+        self._buffer += record
+        self._pending += 1
+        self._index.add(timestamp=microseconds, house=house_position)
+
+        if self._index.records >= layout.segment_records:
+            self._roll()
+        elif self._pending >= self.buffer_records:
+            self.flush()
+
+    def _get_pack_position(self, pack: str) -> int:
+        """Gets the position of a pack, adding it to the layout if it is new.
+
+        Args:
+            pack: The name of the pack.
+
+        Returns:
+            The position stored in the records.
+        """
+        try:
+            return self.layout.packs.index(pack)
+        except ValueError:
+            if len(self.layout.packs) > 255:
+                raise ValueError("A result log holds at most 256 packs.") from None
+            self.layout.packs.append(pack)
+            self.layout.dump(directory=self.directory)
+            return len(self.layout.packs) - 1
+
+    def flush(self) -> None:
+        """Writes the buffered records, and the index once a block is full."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+        self._pending = 0
+        full_blocks = self._index.records // self.layout.block_records
+        if full_blocks != self._full_blocks:
+            self._index.dump(path=Path(self._file.name).with_suffix(".idx"))
+            self._full_blocks = full_blocks
+
+    def _roll(self) -> None:
+        """Closes the full segment and starts the next one."""
+        self.close()
+        self._number += 1
+        self._open_segment()
+
+    def close(self) -> None:
+        """Writes what is buffered and the index, and closes the segment."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._index.dump(path=Path(self._file.name).with_suffix(".idx"))
+        self._file.close()
+
+    def __enter__(self) -> "ResultLog":
+        """Returns the log, closed at the end of the block."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Closes the log."""
+        self.close()
+
+
+class _Filters(NamedTuple):
+    """The conditions of a query, in the units of the records."""
+
+    since: Optional[int]  # In microseconds, included.
+    until: Optional[int]  # In microseconds, excluded.
+    house: Optional[int]  # The position of the house.
+    columns: list[tuple[int, int]]  # The offset and the value of a byte column.
+    answer: Optional[tuple[tuple[str, str], int]]  # The variation and the answer.
+
+
+class ResultLogReader:
+    """Queries a result log, mapping its segments into memory.
+
+    The segments and their indexes are read when the reader is created: records
+    appended later are not seen.
+
+    Args:
+        directory: The directory of the log.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """Initializes the class."""
+        self.directory = Path(directory)
+        if not (self.directory / _META).exists():
+            raise ValueError(f"{self.directory} is not a result log.")
+
+        self.layout = _Layout.load(directory=self.directory)
+        self.segments: list[tuple[Path, _SegmentIndex, _Columns]] = []
+        for path in _segment_paths(directory=self.directory):
+            columns = self.layout.columns(segment=_segment_number(path=path))
+            records = path.stat().st_size // columns.record_size
+            data = _map(path=path)
+            try:
+                index = _SegmentIndex.load(
+                    path=path.with_suffix(".idx"),
+                    layout=self.layout,
+                    record_size=columns.record_size,
+                    data=data,
+                    records=records,
+                )
+            finally:
+                if data is not None:
+                    data.close()
+            self.segments.append((path, index, columns))
+
+    def __len__(self) -> int:
+        """Counts the records of the log."""
+        return sum(index.records for _, index, _ in self.segments)
+
+    def _get_filters(
+        self,
+        house: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+        answer: Optional[tuple[str, str, str]],
+        pack: Optional[str],
+    ) -> Optional[_Filters]:
+        """Converts the conditions of a query to the units of the records.
+
+        Args:
+            house: The winning house.
+            since: The earliest time, in seconds since the epoch.
+            until: The time before which the sortings took place.
+            answer: The question_id, variation_id and answer_id of an answer given.
+            pack: The name of the quiz pack.
+
+        Returns:
+            The conditions, or None if no record can match them.
+        """
+        layout = self.layout
+        columns = []
+
+        house_position = None
+        if house is not None:
+            if house not in layout.houses:
+                raise ValueError(
+                    f"The house should be one of {', '.join(layout.houses)}."
+                )
+            house_position = layout.houses.index(house)
+            columns.append((layout.tail + 1, house_position))
+
+        if pack is not None:
+            if pack not in layout.packs:
+                return None
+            columns.append((layout.tail, layout.packs.index(pack)))
+
+        answer_column = None
+        if answer is not None:
+            question_id, variation_id, answer_id = answer
+            key = (question_id, variation_id)
+            if not any(key in table.offsets for table in layout.tables):
+                raise ValueError(f"Unknown variation {question_id}/{variation_id}.")
+            if not answer_id.isdigit() or not 0 < int(answer_id) < 256:
+                return None
+            answer_column = (key, int(answer_id))
+
+        return _Filters(
+            since=None if since is None else int(since * 1e6),
+            until=None if until is None else int(until * 1e6),
+            house=house_position,
+            columns=columns,
+            answer=answer_column,
+        )
+
+    def count(
+        self,
+        house: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        answer: Optional[tuple[str, str, str]] = None,
+        pack: Optional[str] = None,
+    ) -> int:
+        """Counts the sortings matching every condition given.
+
+        Args:
+            house: The winning house. Defaults to None (any house).
+            since: The earliest time, in seconds since the epoch. Defaults to None.
+            until: The time before which the sortings took place. Defaults to None.
+            answer: The question_id, variation_id and answer_id of an answer given.
+                Defaults to None (any answers).
+            pack: The name of the quiz pack. Defaults to None (any pack).
+
+        Returns:
+            The number of sortings.
+        """
+        filters = self._get_filters(
+            house=house, since=since, until=until, answer=answer, pack=pack
+        )
+        if filters is None:
+            return 0
+
+        total = 0
+        for data, columns, runs, found in self._scan(filters=filters):
+            size = columns.record_size
+            for start, end, inside, house_count in runs:
+                if not inside:
+                    total += sum(
+                        1
+                        for _ in self._positions(data, size, start, end, inside, found)
+                    )
+                elif not found.columns:
+                    total += end - start
+                elif len(found.columns) == 1 and found.house is not None:
+                    total += house_count
+                else:
+                    column, value = self._match(data, size, start, end, found)
+                    total += column.count(value)
+        return total
+
+    def query(
+        self,
+        house: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        answer: Optional[tuple[str, str, str]] = None,
+        pack: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[LoggedResult]:
+        """Reads the sortings matching every condition given, in the order of the log.
+
+        Args:
+            house: The winning house. Defaults to None (any house).
+            since: The earliest time, in seconds since the epoch. Defaults to None.
+            until: The time before which the sortings took place. Defaults to None.
+            answer: The question_id, variation_id and answer_id of an answer given.
+                Defaults to None (any answers).
+            pack: The name of the quiz pack. Defaults to None (any pack).
+            limit: The maximum number of sortings. Defaults to None (no limit).
+
+        Yields:
+            The sortings.
+        """
+        filters = self._get_filters(
+            house=house, since=since, until=until, answer=answer, pack=pack
+        )
+        if filters is None or limit == 0:
+            return
+
+        found = 0
+        for data, columns, runs, segment_filters in self._scan(filters=filters):
+            for start, end, inside, _ in runs:
+                for position in self._positions(
+                    data, columns.record_size, start, end, inside, segment_filters
+                ):
+                    yield self._decode(data=data, columns=columns, position=position)
+                    found += 1
+                    if found == limit:
+                        return
+
+    def _scan(
+        self, filters: _Filters
+    ) -> Iterator[tuple[Any, _Columns, list[tuple[int, int, bool, int]], _Filters]]:
+        """Maps the segments holding matching blocks, one at a time.
+
+        Args:
+            filters: The conditions of the query.
+
+        Yields:
+            The content of each segment, its table of the variations, the runs of
+            blocks to read and the conditions in the columns of the segment. A run
+            is the first position and the position after the last record of the
+            run, a flag telling whether the whole run is in the time range and the
+            number of its sortings won by the house looked for. The consecutive
+            blocks entirely in the time range are read as a single run.
+        """
+        block_records = self.layout.block_records
+        for path, index, columns in self.segments:
+            segment_filters = filters
+            if filters.answer is not None:
+                key, answer_id = filters.answer
+                if key not in columns.offsets:
+                    continue  # The variation was not logged yet in this segment.
+                segment_filters = filters._replace(
+                    columns=[*filters.columns, (columns.offsets[key], answer_id)]
+                )
+
+            runs: list[tuple[int, int, bool, int]] = []
+            for number, block in enumerate(index.blocks):
+                first, last = block[0], block[1]
+                if filters.since is not None and last < filters.since:
+                    continue
+                if filters.until is not None and first >= filters.until:
+                    continue
+                house_count = 0
+                if filters.house is not None:
+                    house_count = block[2 + filters.house]
+                    if not house_count:
+                        continue
+                inside = (filters.since is None or first >= filters.since) and (
+                    filters.until is None or last < filters.until
+                )
+                start = number * block_records
+                end = min(start + block_records, index.records)
+                if inside and runs and runs[-1][2] and runs[-1][1] == start:
+                    start, _, _, previous_count = runs.pop()
+                    house_count += previous_count
+                runs.append((start, end, inside, house_count))
+            if not runs:
+                continue
+
+            data = _map(path=path)
+            if data is None:
+                continue
+            try:
+                yield data, columns, runs, segment_filters
+            finally:
+                data.close()
+
+    def _match(
+        self, data: Any, size: int, start: int, end: int, filters: _Filters
+    ) -> tuple[bytes, int]:
+        """Reads the byte columns of the conditions of consecutive records.
+
+        Each column is read with a single strided slice. Several columns are
+        combined into a mask holding 1 for the records matching all of them: the
+        columns are compared at once by translating their bytes and by a bitwise
+        AND on integers, without a loop over the records.
+
+        Args:
+            data: The content of the segment.
+            size: The size of the records of the segment.
+            start: The position of the first record.
+            end: The position after the last record.
+            filters: The conditions of the query, with at least one column.
+
+        Returns:
+            The column, or the mask, and the byte a matching record holds.
+        """
+        columns = [
+            (data[start * size + offset : end * size : size], value)
+            for offset, value in filters.columns
+        ]
+        if len(columns) == 1:
+            return columns[0]
+
+        mask = -1
+        for column, value in columns:
+            table = bytearray(256)
+            table[value] = 1
+            mask &= int.from_bytes(column.translate(table), "little")
+        return mask.to_bytes(end - start, "little"), 1
+
+    def _positions(
+        self,
+        data: Any,
+        size: int,
+        start: int,
+        end: int,
+        inside: bool,
+        filters: _Filters,
+    ) -> Iterator[int]:
+        """Finds the records of a run of blocks matching the conditions.
+
+        Args:
+            data: The content of the segment.
+            size: The size of the records of the segment.
+            start: The position of the first record of the run.
+            end: The position after the last record of the run.
+            inside: A flag telling whether the whole run is in the time range.
+            filters: The conditions of the query.
+
+        Yields:
+            The position of each matching record in the segment.
+        """
+        candidates: Iterable[int] = range(start, end)
+        if filters.columns:
+            column, value = self._match(data, size, start, end, filters)
+            candidates = _find_all(column=column, value=value, start=start)
+        if inside:
+            yield from candidates
+            return
+
+        for position in candidates:
+            timestamp = struct.unpack_from("<q", data, position * size)[0]
+            if (filters.since is None or timestamp >= filters.since) and (
+                filters.until is None or timestamp < filters.until
+            ):
+                yield position
+
+    def _decode(self, data: Any, columns: _Columns, position: int) -> LoggedResult:
+        """Decodes a record.
+
+        Args:
+            data: The content of the segment.
+            columns: The table of the variations of the segment.
+            position: The position of the record in the segment.
+
+        Returns:
+            The sorting.
+        """
+        layout = self.layout
+        base = position * columns.record_size
+        microseconds, respondent, *scores = layout.head.unpack_from(data, base)
+        tail = data[base + layout.tail : base + columns.record_size]
+        return LoggedResult(
+            timestamp=microseconds / 1e6,
+            respondent=f"{respondent:016x}",
+            pack=layout.packs[tail[0]],
+            house=layout.houses[tail[1]],
+            tie=bool(tail[2] & _TIE),
+            scores=dict(zip(layout.houses, scores)),
+            answers=[
+                (question_id, variation_id, str(answer_id))
+                for (question_id, variation_id), answer_id in zip(
+                    columns.variations, tail[3:]
+                )
+                if answer_id
+            ],
+        )
+
+
+def _find_all(column: bytes, value: int, start: int) -> Iterator[int]:
+    """Finds every occurrence of a byte in a column.
+
+    Args:
+        column: The byte of each record.
+        value: The byte looked for.
+        start: The position of the first record of the column.
+
+    Yields:
+        The position of each record holding the byte.
+    """
+    find = column.find
+    position = find(value)
+    while position != -1:
+        yield start + position
+        position = find(value, position + 1)
@@ -0,0 +1,183 @@
+"""This module defines how the answers are turned into a house.
+
+The functions below are shared by every way of running the sorting hat:
+the interactive quiz as well as the headless scoring of answer sheets.
+The ScoreCache memoizes the totals of whole answer sheets, which repeat a lot
+when many sheets are scored at once.
+"""
+
+from collections import OrderedDict, defaultdict
+from collections.abc import Sequence
+from operator import add
+from random import Random, choice
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from sorting_hat.metrics import METRICS
+
+if TYPE_CHECKING:
+    from sorting_hat.referential import QuizReferential
+
+
+def update_score(
+    referential: "QuizReferential",
+    answer: dict[str, str],
+    current_score: defaultdict[str, float],
+) -> defaultdict[str, float]:
+    """Updates the score after a new answer.
+
+    Args:
+        referential: The referential holding the weights.
+        answer: The answer given to a specific question.
+        current_score: The current state of the score that should be updated.
+
+    Returns:
+        The updated score.
+    """
+    key = (answer["question_id"], answer["variation_id"], answer["answer_id"])
+
+    for house, weight in zip(referential.houses, referential.weights[key]):
+        current_score[house] += weight
+
+    return current_score
+
+
+def get_winning_house(score: dict[str, float], rng: Optional[Random] = None) -> str:
+    """Gets the winning house.
+
+    In case of a tie, the winning house is chosen at random between the houses
+    with the best score.
+
+    Args:
+        score: The results once the questionary is done.
+        rng: The random generator used to break a tie. Defaults to the global one.
+
+    Returns:
+        The winning house.
+    """
+    best_houses = get_best_houses(score=score)
+
+    if len(best_houses) == 1:
+        return best_houses[0]
+
+    return choice(best_houses) if rng is None else rng.choice(best_houses)
+
+
+def get_best_houses(score: dict[str, float]) -> list[str]:
+    """Gets the houses with the best score.
+
+    Args:
+        score: The results once the questionary is done.
+
+    Returns:
+        The houses with the best score, more than one in case of a tie.
+    """
+    best_score = max(score.values())
+    return [house for house, value in score.items() if value == best_score]
+
+
+class ScoreCache:
+    """Memoizes the total of each house of whole answer sheets.
+
+    A sheet is canonicalized into the sorted positions of its answers in the
+    referential, so the same answers given in any order share an entry. The
+    weights are summed in that order too, so a sheet always gets the same totals,
+    to the last bit. The totals of the `max_sheets` sheets used most recently are
+    kept. Only the totals are cached: a tie is still broken by the caller.
+
+    Args:
+        referential: The referential holding the weights.
+        max_sheets: The number of sheets kept. Defaults to 65 536 (0 keeps none).
+
+    Attributes:
+        positions: The position of each answer, keyed by (question_id,
+            variation_id, answer_id).
+    """
+
+    __slots__ = (
+        "max_sheets",
+        "positions",
+        "hits",
+        "misses",
+        "evictions",
+        "_vectors",
+        "_zeros",
+        "_totals",
+    )
+
+    def __init__(
+        self, referential: "QuizReferential", max_sheets: int = 65_536
+    ) -> None:
+        """Initializes the class."""
+        self.max_sheets = max_sheets
+        # A shared table of weights already indexes its answers, in the same order.
+        positions = getattr(referential.weights, "positions", None)
+        if positions is None:
+            positions = {key: i for i, key in enumerate(referential.weights)}
+        self.positions = positions
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        vectors = referential.weights.values()
+        # The rows of a shared table of weights are views, sliced when used.
+        self._vectors = vectors if isinstance(vectors, Sequence) else list(vectors)
+        self._zeros = (0.0,) * len(referential.houses)
+        self._totals: OrderedDict[tuple[int, ...], tuple[float, ...]] = OrderedDict()
+
+    def totals(self, positions: Iterable[int]) -> tuple[float, ...]:
+        """Gets the total of each house of an answer sheet.
+
+        Args:
+            positions: The position of each answer of the sheet, in any order.
+
+        Returns:
+            The total of each house, in the order of the referential.
+        """
+        sheet = tuple(sorted(positions))
+        totals = self._totals.get(sheet)
+        if totals is not None:
+            self.hits += 1
+            METRICS.count_cache_lookup(cache="score", hit=True)
+            self._totals.move_to_end(sheet)
+            return totals
+
+        self.misses += 1
+        METRICS.count_cache_lookup(cache="score", hit=False)
+        # Added one by one, as the built-in sum may compensate the rounding errors
+        # and give other floats than the interactive quiz.
+        totals = self._zeros
+        vectors = self._vectors
+        for i in sheet:
+            totals = tuple(map(add, totals, vectors[i]))
+
+        if self.max_sheets:
+            self._totals[sheet] = totals
+            if len(self._totals) > self.max_sheets:
+                self._totals.popitem(last=False)
+                self.evictions += 1
+
+        return totals
+
+    def __len__(self) -> int:
+        """Gets the number of sheets kept."""
+        return len(self._totals)
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of the sheets whose totals were found in the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Gets the counters of the cache.
+
+        Returns:
+            The number of sheets kept, of hits, of misses and of evictions, and
+            the hit rate.
+        """
+        return {
+            "sheets": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
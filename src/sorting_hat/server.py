@@ -0,0 +1,543 @@
+"""This module serves the sorting hat over HTTP.
+
+The server only relies on asyncio and speaks a small subset of HTTP/1.1 with JSON
+bodies, enough for many users to be sorted at the same time:
+
+- ``POST /sessions`` starts a quiz and returns its session_id, with an optional
+  body ``{"pack": "<name>"}`` to use another quiz pack than the default one,
+- ``GET /sessions/<session_id>/question`` gets the next question to answer,
+- ``POST /sessions/<session_id>/answers`` answers it with ``{"answer_id": "2"}``,
+- ``GET /sessions/<session_id>/result`` gets the house once every question is answered,
+- ``GET /stats`` gets the aggregate of the houses, the answers and the ties of the
+  quizzes completed so far.
+
+The referential is loaded once and shared, read-only, by every session (the other
+packs are loaded on demand by a registry, which keeps them in memory). The state
+of each quiz is packed into a bounded store, which evicts the quizzes left idle.
+
+The referential of a pack can be swapped while the server runs (see
+`sorting_hat.reload`): each quiz keeps the version of the referential it was
+started with, and a version is dropped once no quiz kept can still use it.
+
+The event loop only handles the state of the quizzes, in memory. The work which
+waits on the disk is done by threads: a pack read for the first time is loaded
+by the default executor of the loop, and the result log is written by a thread
+of its own, in the order of the quizzes, before the response is sent.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from sorting_hat.metrics import METRICS
+from sorting_hat.referential import QuizReferential
+from sorting_hat.registry import DEFAULT_PACK, PackRegistry
+from sorting_hat.render import get_welcome_message
+from sorting_hat.scoring import get_best_houses
+from sorting_hat.session import QuizSession, SessionStore
+from sorting_hat.stats import SortingStats
+
+if TYPE_CHECKING:
+    from sorting_hat.result_log import ResultLog
+
+_ROUTE = re.compile(r"^/sessions/(?P<session_id>[^/]+)/(?P<action>\w+)$")
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+}
+
+_MAX_BODY_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """An error sent back to the client with an HTTP status.
+
+    Args:
+        status: The HTTP status of the response.
+        message: The description of the error.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initializes the class."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SortingHatServer:
+    """Sorts users into houses through an HTTP/JSON API.
+
+    Args:
+        referential: The referential shared by every session.
+        long_quiz: A flag to ask every variation of each question. Defaults to False.
+        sessions: The store of the quizzes in progress. Defaults to None (a store
+            with the default limits).
+        registry: The registry of the quiz packs a session can ask for.
+            Defaults to None (only the default referential is served).
+        stats: The aggregate recording the answers and the outcomes of the
+            quizzes. Defaults to None (a new aggregate).
+        log: The result log each completed quiz is appended to. Defaults to None
+            (nothing is kept).
+        default_pack: The name of the pack of the referential, under which the
+            quizzes started without a pack are logged. Defaults to "default".
+    """
+
+    def __init__(
+        self,
+        referential: QuizReferential,
+        long_quiz: bool = False,
+        sessions: Optional[SessionStore] = None,
+        registry: Optional[PackRegistry] = None,
+        stats: Optional[SortingStats] = None,
+        log: Optional["ResultLog"] = None,
+        default_pack: str = DEFAULT_PACK,
+    ) -> None:
+        """Initializes the class."""
+        self.referential = referential
+        self.long_quiz = long_quiz
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.registry = registry
+        self.stats = stats if stats is not None else SortingStats()
+        self.log = log
+        self.default_pack = default_pack
+        # The referentials the quizzes were started with, by version: the
+        # referential and the last time a quiz used it.
+        self._versions: dict[int, tuple[QuizReferential, float]] = {}
+        self._version_numbers: dict[int, int] = {}
+        self._next_version = 1
+        # The writes to the log queued while a request is routed, and the thread
+        # running them while the server is serving.
+        self._log_writes: list[Callable[[], None]] = []
+        self._log_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="sorting-hat-log")
+            if log is not None
+            else None
+        )
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """Serves the API until cancelled.
+
+        Args:
+            host: The interface to listen on.
+            port: The port to listen on.
+        """
+        server = await asyncio.start_server(self.handle, host=host, port=port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._log_executor is not None:
+                # The writes queued are finished before the log can be closed.
+                self._log_executor.shutdown(wait=True)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handles the requests of one connection, kept alive between requests.
+
+        Args:
+            reader: The stream to read the requests from.
+            writer: The stream to write the responses to.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, _ = request_line.split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    try:
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        raise HTTPError(400, "Invalid Content-Length.") from None
+                    if length > _MAX_BODY_SIZE:
+                        raise HTTPError(413, "The body is too large.")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.respond(
+                        method=method, path=target.split("?", 1)[0], body=body
+                    )
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    _response(status=status, payload=payload, keep_alive=keep_alive)
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method: str, path: str, body: bytes) -> tuple[int, Any]:
+        """Routes a request as dispatch does, without blocking the event loop.
+
+        A pack not in memory yet is loaded by the default executor before the
+        session is started, and the log is written by the thread of the log.
+
+        Args:
+            method: The HTTP method of the request.
+            path: The path of the request.
+            body: The body of the request.
+
+        Returns:
+            The HTTP status and the JSON payload of the response.
+        """
+        loop = asyncio.get_running_loop()
+        if path == "/sessions" and method == "POST" and self.registry is not None:
+            pack = _parse_pack(body=body)
+            if pack:
+                try:
+                    await loop.run_in_executor(None, self.registry.get, pack)
+                except ValueError:
+                    pass  # An unknown pack, reported by the route.
+
+        try:
+            return self._route(method=method, path=path, body=body)
+        finally:
+            writes, self._log_writes = self._log_writes, []
+            if writes:
+                try:
+                    await loop.run_in_executor(self._log_executor, _run_all, writes)
+                except Exception:
+                    # The quiz is complete whether or not it could be logged.
+                    logger.exception("The result log could not be written.")
+
+    def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, Any]:
+        """Routes a request to the matching endpoint, writing the log at once.
+
+        Args:
+            method: The HTTP method of the request.
+            path: The path of the request.
+            body: The body of the request.
+
+        Returns:
+            The HTTP status and the JSON payload of the response.
+        """
+        try:
+            return self._route(method=method, path=path, body=body)
+        finally:
+            writes, self._log_writes = self._log_writes, []
+            _run_all(writes)
+
+    def _route(self, method: str, path: str, body: bytes) -> tuple[int, Any]:
+        """Routes a request to the matching endpoint, queuing the writes to the log.
+
+        Args:
+            method: The HTTP method of the request.
+            path: The path of the request.
+            body: The body of the request.
+
+        Returns:
+            The HTTP status and the JSON payload of the response.
+        """
+        if path == "/sessions":
+            if method != "POST":
+                raise HTTPError(405, "Use POST to start a session.")
+            return 201, self.start_session(pack=_parse_pack(body=body))
+
+        if path == "/stats":
+            if method != "GET":
+                raise HTTPError(405, "Use GET to get the statistics.")
+            return 200, self.stats.to_dict()
+
+        match = _ROUTE.match(path)
+        if match is None:
+            raise HTTPError(404, f"Unknown path {path}.")
+
+        session_id, action = match["session_id"], match["action"]
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, f"Unknown session {session_id}.")
+
+        if action == "question" and method == "GET":
+            return 200, self.get_question(session=session)
+        if action == "answers" and method == "POST":
+            try:
+                answer_id = str(json.loads(body)["answer_id"])
+            except (ValueError, KeyError, TypeError):
+                raise HTTPError(400, 'The body should be {"answer_id": ...}.') from None
+            payload = self.post_answer(
+                session=session, answer_id=answer_id, session_id=session_id
+            )
+            self.sessions.put(session_id=session_id, session=session)
+            return 200, payload
+        if action == "result" and method == "GET":
+            return 200, self.get_result(session_id=session_id, session=session)
+
+        raise HTTPError(405, f"{method} is not allowed on {path}.")
+
+    def start_session(self, pack: Optional[str] = None) -> dict[str, Any]:
+        """Starts a new quiz.
+
+        Args:
+            pack: The name of the quiz pack. Defaults to None (the default
+                referential).
+
+        Returns:
+            The id of the session and the number of questions.
+        """
+        referential = self._get_referential(pack=pack or "")
+        if self.log is not None:
+            # Checked before the quiz, so that its sorting can be logged at the end.
+            try:
+                self.log.check_referential(referential=referential)
+            except ValueError as error:
+                raise HTTPError(409, str(error)) from None
+            self._log_writes.append(
+                partial(self.log.add_referential, referential=referential)
+            )
+        session = QuizSession.start(
+            referential=referential,
+            long_quiz=self.long_quiz,
+            pack=pack or "",
+            version=self._get_version(referential=referential),
+        )
+
+        session_id = secrets.token_hex(8)
+        self.sessions.put(session_id=session_id, session=session)
+
+        return {"session_id": session_id, "number_of_questions": len(session.order)}
+
+    def get_question(self, session: QuizSession) -> dict[str, Any]:
+        """Gets the next question of a quiz.
+
+        Args:
+            session: The session of the quiz.
+
+        Returns:
+            The question, its position and the possible answers.
+        """
+        if session.is_complete:
+            raise HTTPError(409, "Every question has been answered.")
+
+        referential = self._get_session_referential(session=session)
+        variation = session.current_variation(referential=referential)
+        key = (variation["question_id"], variation["variation_id"])
+
+        return {
+            "position": session.cursor + 1,
+            "number_of_questions": len(session.order),
+            "question_id": variation["question_id"],
+            "variation_id": variation["variation_id"],
+            "text": referential.variation_texts[key],
+            "answers": [
+                {"answer_id": str(answer_id), "text": text}
+                for answer_id, text in enumerate(referential.answer_texts[key], start=1)
+            ],
+        }
+
+    def post_answer(
+        self, session: QuizSession, answer_id: str, session_id: str = ""
+    ) -> dict[str, Any]:
+        """Answers the next question of a quiz.
+
+        Args:
+            session: The session of the quiz.
+            answer_id: The answer given.
+            session_id: The id of the session, the respondent of the result log.
+                Defaults to "".
+
+        Returns:
+            The number of questions left.
+        """
+        if session.is_complete:
+            raise HTTPError(409, "Every question has been answered.")
+
+        referential = self._get_session_referential(session=session)
+        variation = session.current_variation(referential=referential)
+        try:
+            session.answer(referential=referential, answer_id=answer_id)
+        except ValueError as error:
+            raise HTTPError(400, str(error)) from None
+
+        self.stats.count_answer(
+            variation["question_id"], variation["variation_id"], answer_id
+        )
+        if session.is_complete:
+            best_houses = get_best_houses(
+                score=dict(zip(referential.houses, session.score))
+            )
+            house = session.get_winning_house(referential=referential)
+            METRICS.count_house(house=house)
+            self.stats.record(house=house, tie=len(best_houses) > 1)
+            if self.log is not None:
+                self._log_writes.append(
+                    partial(
+                        self.log.append,
+                        respondent_id=session_id,
+                        answers=session.get_answers(referential=referential),
+                        house=house,
+                        scores=session.score,
+                        pack=session.pack or self.default_pack,
+                        tie=len(best_houses) > 1,
+                    )
+                )
+
+        return {"remaining": len(session.order) - session.cursor}
+
+    def get_result(self, session_id: str, session: QuizSession) -> dict[str, Any]:
+        """Gets the house of a finished quiz.
+
+        Args:
+            session_id: The id of the session of the quiz.
+            session: The session of the quiz.
+
+        Returns:
+            The house, the score of each house and the welcome message.
+        """
+        if not session.is_complete:
+            raise HTTPError(409, "Some questions have not been answered yet.")
+
+        referential = self._get_session_referential(session=session)
+        house = session.get_winning_house(referential=referential)
+
+        return {
+            "session_id": session_id,
+            "house": house,
+            "scores": dict(zip(referential.houses, session.score)),
+            "welcome_message": get_welcome_message(house=house),
+        }
+
+    def _get_version(self, referential: QuizReferential) -> int:
+        """Gets the version of a referential, numbering it on first use.
+
+        The versions no quiz used for longer than the TTL of the store are dropped:
+        the quizzes which could use them have been evicted.
+
+        Args:
+            referential: The current referential of a pack.
+
+        Returns:
+            The version of the referential.
+        """
+        now = self.sessions.clock()
+        deadline = now - self.sessions.ttl
+        for version, (old_referential, last_use) in list(self._versions.items()):
+            if last_use <= deadline:
+                del self._versions[version]
+                del self._version_numbers[id(old_referential)]
+
+        version = self._version_numbers.get(id(referential))
+        if version is None:
+            version = self._next_version
+            self._next_version = self._next_version % 0xFFFF + 1
+            self._version_numbers[id(referential)] = version
+        self._versions[version] = (referential, now)
+        return version
+
+    def _get_session_referential(self, session: QuizSession) -> QuizReferential:
+        """Gets the referential a quiz was started with.
+
+        Args:
+            session: The session of the quiz.
+
+        Returns:
+            The referential.
+        """
+        if not session.version:
+            return self._get_referential(pack=session.pack)
+
+        entry = self._versions.get(session.version)
+        if entry is None:
+            raise HTTPError(
+                409, "The quiz data of this session is gone, start a new session."
+            )
+        self._versions[session.version] = (entry[0], self.sessions.clock())
+        return entry[0]
+
+    def _get_referential(self, pack: str) -> QuizReferential:
+        """Gets the referential of a quiz pack.
+
+        Args:
+            pack: The name of the pack, "" for the default referential.
+
+        Returns:
+            The referential.
+        """
+        if not pack:
+            return self.referential
+        if self.registry is None:
+            raise HTTPError(404, "This server only serves the default quiz pack.")
+
+        try:
+            return self.registry.get(name=pack)
+        except ValueError as error:
+            raise HTTPError(404, str(error)) from None
+
+
+def _parse_pack(body: bytes) -> Optional[str]:
+    """Reads the pack asked for in the body of a request starting a session.
+
+    Args:
+        body: The body of the request.
+
+    Returns:
+        The name of the pack, or None for the default one.
+    """
+    try:
+        pack = json.loads(body).get("pack") if body.strip() else None
+    except (ValueError, AttributeError):
+        raise HTTPError(400, 'The body should be {"pack": ...}.') from None
+    if pack is not None and not isinstance(pack, str):
+        raise HTTPError(400, "The pack should be given by its name, as a string.")
+
+    return pack
+
+
+def _run_all(calls: list[Callable[[], None]]) -> None:
+    """Runs calls in order.
+
+    Args:
+        calls: The calls.
+    """
+    for call in calls:
+        call()
+
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    """Builds an HTTP response with a JSON body.
+
+    Args:
+        status: The HTTP status.
+        payload: The JSON payload.
+        keep_alive: A flag to keep the connection open.
+
+    Returns:
+        The raw response.
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
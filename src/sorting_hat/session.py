@@ -0,0 +1,379 @@
+"""This module defines the state of a quiz and where it is kept between requests.
+
+A quiz in progress is entirely described by a seed (used to break a tie at the
+end), the order of the variations to ask, the answers already given and the score
+of each house. This state is packed into a few dozen bytes so that
+an interrupted quiz can be resumed later, and so that a server can keep a very large
+number of idle quizzes in a bounded store.
+"""
+
+import secrets
+import struct
+import sys
+import time
+from collections import OrderedDict
+from operator import add
+from random import Random
+from typing import Callable, Optional
+
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.referential import QuizReferential
+from sorting_hat.scoring import get_winning_house
+
+FORMAT_VERSION = 4
+
+# The version, the seed, the cursor, the number of variations, of houses, the
+# length of the name of the pack and the version of the referential.
+_HEADER = struct.Struct("<BQBBBBH")
+
+
+class QuizSession:
+    """Holds the state of a quiz.
+
+    Args:
+        seed: The seed used to shuffle the questions and to break a tie.
+        order: The position in the referential of each variation to ask, in order.
+        cursor: The number of questions already answered.
+        score: The score of each house, in the order of the referential.
+        pack: The name of the quiz pack. Defaults to "" (the default referential).
+        answers: The position of each answer given, starting from 1, in the order
+            of the questions. Defaults to b"" (none).
+        version: The version of the referential the quiz was started with, as
+            numbered by the server when the quiz data is reloaded. Defaults to 0
+            (the current referential of the pack).
+    """
+
+    __slots__ = ("seed", "order", "cursor", "score", "pack", "answers", "version")
+
+    def __init__(
+        self,
+        seed: int,
+        order: bytes,
+        cursor: int,
+        score: tuple[float, ...],
+        pack: str = "",
+        answers: bytes = b"",
+        version: int = 0,
+    ) -> None:
+        """Initializes the class."""
+        self.seed = seed
+        self.order = order
+        self.cursor = cursor
+        self.score = score
+        self.pack = pack
+        self.answers = answers
+        self.version = version
+
+    @classmethod
+    def start(
+        cls,
+        referential: QuizReferential,
+        long_quiz: bool = False,
+        seed: Optional[int] = None,
+        pack: str = "",
+        version: int = 0,
+    ) -> "QuizSession":
+        """Starts a new quiz.
+
+        Args:
+            referential: The referential of questions, answers and weights.
+            long_quiz: A flag to ask every variation of each question.
+                Defaults to False.
+            seed: The seed used to shuffle the questions and to break a tie.
+                Defaults to None (a random seed).
+            pack: The name of the quiz pack the referential comes from.
+                Defaults to "" (the default referential).
+            version: The version of the referential. Defaults to 0 (the current
+                referential of the pack).
+
+        Returns:
+            The state of the new quiz.
+        """
+        if seed is None:
+            seed = secrets.randbits(63)
+
+        positions = {key: i for i, key in enumerate(referential.variations)}
+        order = [
+            positions[(variation["question_id"], variation["variation_id"])]
+            for variation in ChooseVariations(
+                referential=referential, long_quiz=long_quiz
+            ).run()
+        ]
+        # Shuffle the order of the questions to add more randomness.
+        Random(seed).shuffle(order)
+
+        return cls(
+            seed=seed,
+            order=bytes(order),
+            cursor=0,
+            score=(0.0,) * len(referential.houses),
+            pack=pack,
+            version=version,
+        )
+
+    @property
+    def is_complete(self) -> bool:
+        """Tells whether every question has been answered."""
+        return self.cursor >= len(self.order)
+
+    def current_variation(self, referential: QuizReferential) -> dict[str, str]:
+        """Gets the variation to ask next.
+
+        Args:
+            referential: The referential the quiz was started with.
+
+        Returns:
+            The question_id and the variation_id of the next question.
+        """
+        if self.is_complete:
+            raise ValueError("Every question has been answered.")
+
+        question_id, variation_id = referential.variations[self.order[self.cursor]]
+        return {"question_id": question_id, "variation_id": variation_id}
+
+    def get_answers(self, referential: QuizReferential) -> list[tuple[str, str, str]]:
+        """Gets the answers given so far.
+
+        Args:
+            referential: The referential the quiz was started with.
+
+        Returns:
+            The question_id, the variation_id and the answer_id of each answer.
+        """
+        return [
+            (*referential.variations[position], str(answer_id))
+            for position, answer_id in zip(self.order, self.answers)
+        ]
+
+    def answer(self, referential: QuizReferential, answer_id: str) -> None:
+        """Answers the next question.
+
+        Args:
+            referential: The referential the quiz was started with.
+            answer_id: The answer given.
+        """
+        variation = self.current_variation(referential=referential)
+        key = (variation["question_id"], variation["variation_id"], answer_id)
+
+        try:
+            vector = referential.weights[key]
+        except KeyError:
+            raise ValueError(f"Unknown answer {answer_id}.") from None
+
+        self.score = tuple(map(add, self.score, vector))
+        # The answer ids of a referential are the positions of the answers.
+        self.answers += bytes((int(answer_id),))
+        self.cursor += 1
+
+    def get_winning_house(self, referential: QuizReferential) -> str:
+        """Gets the winning house once every question has been answered.
+
+        A tie is broken with the seed of the quiz, so the house is always the same.
+
+        Args:
+            referential: The referential the quiz was started with.
+
+        Returns:
+            The winning house.
+        """
+        if not self.is_complete:
+            raise ValueError("Some questions have not been answered yet.")
+
+        return get_winning_house(
+            score=dict(zip(referential.houses, self.score)), rng=Random(self.seed)
+        )
+
+    def to_bytes(self) -> bytes:
+        """Packs the state of the quiz.
+
+        Returns:
+            The packed state.
+        """
+        pack = self.pack.encode("utf-8")
+        return (
+            _HEADER.pack(
+                FORMAT_VERSION,
+                self.seed,
+                self.cursor,
+                len(self.order),
+                len(self.score),
+                len(pack),
+                self.version,
+            )
+            + self.order
+            + self.answers
+            + struct.pack(f"<{len(self.score)}d", *self.score)
+            + pack
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "QuizSession":
+        """Unpacks the state of a quiz.
+
+        Args:
+            data: The packed state.
+
+        Returns:
+            The state of the quiz.
+        """
+        if data[0] != FORMAT_VERSION:
+            raise ValueError(f"Unknown version {data[0]} of a packed quiz.")
+
+        (
+            _,
+            seed,
+            cursor,
+            number_of_variations,
+            number_of_houses,
+            pack_length,
+            version,
+        ) = _HEADER.unpack_from(data)
+
+        answers = _HEADER.size + number_of_variations
+        start = answers + cursor
+        end = start + 8 * number_of_houses
+        return cls(
+            seed=seed,
+            order=bytes(data[_HEADER.size : answers]),
+            cursor=cursor,
+            score=struct.unpack_from(f"<{number_of_houses}d", data, start),
+            pack=str(data[end : end + pack_length], "utf-8"),
+            answers=bytes(data[answers:start]),
+            version=version,
+        )
+
+
+class SessionStore:
+    """Keeps packed quizzes, evicting the least recently used and the idle ones.
+
+    Args:
+        ttl: The number of seconds after which a quiz not accessed is evicted.
+            Defaults to one day.
+        max_bytes: The approximate memory the store may use, in bytes.
+            Defaults to 512 MiB, enough for about a million quizzes.
+        clock: The function giving the current time, in seconds.
+    """
+
+    # The approximate memory used by an entry besides its key and its value:
+    # the slot of the dictionary, the link of the ordered dictionary and the tuple.
+    ENTRY_OVERHEAD = 200
+
+    def __init__(
+        self,
+        ttl: float = 24 * 3600.0,
+        max_bytes: int = 512 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initializes the class."""
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Gets the number of quizzes kept."""
+        return len(self._entries)
+
+    def get(self, session_id: str) -> Optional[QuizSession]:
+        """Gets a quiz, which becomes the most recently used.
+
+        Args:
+            session_id: The id of the quiz.
+
+        Returns:
+            The quiz, or None if it is unknown or was evicted.
+        """
+        now = self.clock()
+        self._evict_expired(now=now)
+
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries[session_id] = (now, entry[1])
+        self._entries.move_to_end(session_id)
+        return QuizSession.from_bytes(entry[1])
+
+    def put(self, session_id: str, session: QuizSession) -> None:
+        """Stores a quiz, which becomes the most recently used.
+
+        Args:
+            session_id: The id of the quiz.
+            session: The quiz.
+        """
+        now = self.clock()
+        self.delete(session_id=session_id)
+
+        data = session.to_bytes()
+        self._entries[session_id] = (now, data)
+        self.size += self._entry_size(session_id=session_id, data=data)
+
+        self._evict_expired(now=now)
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            self._pop_oldest()
+
+    def delete(self, session_id: str) -> None:
+        """Removes a quiz, if it is kept.
+
+        Args:
+            session_id: The id of the quiz.
+        """
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self.size -= self._entry_size(session_id=session_id, data=entry[1])
+
+    def stats(self) -> dict[str, float]:
+        """Gets the counters of the store.
+
+        Returns:
+            The number of quizzes, the memory used, the hits, misses and evictions
+            and the hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _evict_expired(self, now: float) -> None:
+        """Evicts the quizzes not accessed for longer than the TTL.
+
+        The entries are ordered by last access, so only the oldest are checked.
+
+        Args:
+            now: The current time, in seconds.
+        """
+        deadline = now - self.ttl
+        while self._entries:
+            last_access, _ = next(iter(self._entries.values()))
+            if last_access > deadline:
+                break
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        """Evicts the least recently used quiz."""
+        session_id, (_, data) = self._entries.popitem(last=False)
+        self.size -= self._entry_size(session_id=session_id, data=data)
+        self.evictions += 1
+
+    def _entry_size(self, session_id: str, data: bytes) -> int:
+        """Gets the approximate memory used by an entry.
+
+        Args:
+            session_id: The id of the quiz.
+            data: The packed quiz.
+
+        Returns:
+            The approximate size of the entry, in bytes.
+        """
+        return sys.getsizeof(session_id) + sys.getsizeof(data) + self.ENTRY_OVERHEAD
@@ -0,0 +1,234 @@
+"""This module shares the weights of a referential between processes.
+
+Scoring answer sheets only needs the ids of the answers and their weights, not the
+texts of the questions. These are packed into a table file next to the compiled
+referential, in the cache directory: the weights as doubles and the ids as one
+block of text. Each worker process maps the file read-only, so its pages are kept
+once by the system whatever the number of workers, and a worker starts by mapping
+the file instead of loading and indexing the whole referential. Its weights are
+read-only views on the mapped file, never copied into the worker: what a worker
+still keeps to itself is the index of the ids (the position of each answer, which
+its ScoreCache shares) and the totals cached by its ScoreCache.
+
+The file is tagged with the hash of the CSV files, and replaced atomically when
+they change: the workers which mapped the previous file keep reading it.
+"""
+
+import mmap
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Iterator, Union
+
+from sorting_hat.cache import _write, get_cache_dir, hash_package
+from sorting_hat.referential import QuizReferential, load_referential
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"SHWT"
+# The magic, the version, the hash of the CSV files, the number of answers, of
+# houses and the size of the ids, padded so that the weights are aligned.
+_HEADER = struct.Struct("<4sH32sIII6x")
+
+
+def get_table_path(package: str = "sorting_hat.data") -> Path:
+    """Gets the path of the table of the weights of a package.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The path of the table.
+    """
+    return get_cache_dir() / f"{package}.weights"
+
+
+def dump_table(referential: QuizReferential, digest: bytes) -> bytes:
+    """Packs the ids of the answers and the weights of a referential.
+
+    Args:
+        referential: The referential.
+        digest: The hash of the CSV files the referential was built from.
+
+    Returns:
+        The packed table.
+    """
+    number_of_houses = len(referential.houses)
+    ids = "\n".join(
+        [*referential.houses, *("\t".join(key) for key in referential.weights)]
+    ).encode("utf-8")
+    weights = [weight for vector in referential.weights.values() for weight in vector]
+
+    return (
+        _HEADER.pack(
+            _MAGIC,
+            FORMAT_VERSION,
+            digest,
+            len(referential.weights),
+            number_of_houses,
+            len(ids),
+        )
+        + struct.pack(f"={len(weights)}d", *weights)
+        + ids
+    )
+
+
+def publish_table(package: str = "sorting_hat.data") -> Path:
+    """Writes the table of a package to the cache directory, unless it is current.
+
+    Args:
+        package: The package containing the CSV files.
+
+    Returns:
+        The path of the table, to be mapped by each worker with WeightTable.
+    """
+    digest = hash_package(package=package)
+    path = get_table_path(package=package)
+
+    try:
+        with path.open("rb") as f:
+            magic, version, table_digest, *_ = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        pass
+    else:
+        if (magic, version, table_digest) == (_MAGIC, FORMAT_VERSION, digest):
+            return path
+
+    _write(
+        path=path,
+        content=dump_table(
+            referential=load_referential(package=package), digest=digest
+        ),
+    )
+    return path
+
+
+class _Rows(Sequence):
+    """The rows of a flat view of weights, each one sliced when it is read.
+
+    Args:
+        values: The weights of every answer, one row after another.
+        width: The number of weights of a row.
+    """
+
+    __slots__ = ("values", "width", "_length")
+
+    def __init__(self, values: memoryview, width: int) -> None:
+        """Initializes the class."""
+        self.values = values
+        self.width = width
+        self._length = len(values) // width if width else 0
+
+    def __len__(self) -> int:
+        """Gets the number of rows."""
+        return self._length
+
+    def __getitem__(self, index: int) -> memoryview:  # type: ignore[override]
+        """Gets a row.
+
+        Args:
+            index: The position of the row.
+
+        Returns:
+            A read-only view on the weights of the row.
+        """
+        if not -self._length <= index < self._length:
+            raise IndexError("The table has no such row.")
+        start = index % self._length * self.width
+        return self.values[start : start + self.width]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        """Iterates over the rows."""
+        return map(self.__getitem__, range(self._length))
+
+
+class _Weights(Mapping):
+    """The rows of a table keyed by (question_id, variation_id, answer_id).
+
+    Args:
+        positions: The position of each answer in the table.
+        rows: The rows of the table.
+    """
+
+    __slots__ = ("positions", "rows")
+
+    def __init__(self, positions: dict[tuple[str, ...], int], rows: _Rows) -> None:
+        """Initializes the class."""
+        self.positions = positions
+        self.rows = rows
+
+    def __getitem__(self, key: tuple[str, ...]) -> memoryview:
+        """Gets the weights of an answer.
+
+        Args:
+            key: The question_id, the variation_id and the answer_id.
+
+        Returns:
+            A read-only view on the weights.
+        """
+        return self.rows[self.positions[key]]
+
+    def __iter__(self) -> Iterator[tuple[str, ...]]:
+        """Iterates over the answers, in the order of the table."""
+        return iter(self.positions)
+
+    def __len__(self) -> int:
+        """Gets the number of answers."""
+        return len(self.positions)
+
+    def values(self) -> _Rows:  # type: ignore[override]
+        """Gets the rows, without slicing them."""
+        return self.rows
+
+
+class WeightTable:
+    """The ids of the answers and the weights of a referential, mapped from a table.
+
+    It can be given instead of a referential to ScoreCache, accumulate_totals and
+    decide_houses, which only read its houses and its weights.
+
+    Args:
+        path: The path of the table, written by publish_table.
+
+    Attributes:
+        houses: The houses, in order.
+        weights: The weights of each house keyed by (question_id, variation_id,
+            answer_id), each one a read-only view on the mapped file.
+    """
+
+    __slots__ = ("path", "houses", "weights", "_mmap")
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Initializes the class."""
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        (
+            magic,
+            version,
+            _,
+            number_of_answers,
+            number_of_houses,
+            ids_size,
+        ) = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} is not a table of weights of this version.")
+
+        start = _HEADER.size
+        end = start + 8 * number_of_answers * number_of_houses
+        if end + ids_size != len(view):
+            raise ValueError(f"The table of weights {self.path} is truncated.")
+        values = view[start:end].cast("d")
+        ids = [sys.intern(value) for value in str(view[end:], "utf-8").split("\n")]
+
+        self.houses = tuple(ids[:number_of_houses])
+        self.weights = _Weights(
+            positions={
+                tuple(key.split("\t")): i
+                for i, key in enumerate(ids[number_of_houses:])
+            },
+            rows=_Rows(values=values, width=number_of_houses),
+        )
@@ -0,0 +1,373 @@
+"""This module generates synthetic sortings, for instance for load tests.
+
+Each simulated respondent gets a variation of each question (or every variation
+for the long quiz), in a random order, and answers them either uniformly at random
+or following a profile biased towards a house. The answers are scored directly,
+without any prompt.
+
+The respondents are generated in blocks of BLOCK_SIZE, each block with its own
+random generator seeded from the seed and the position of the block. A block is
+thus the same whatever the process generating it, and the output of a seed is the
+same whatever the number of processes.
+"""
+
+import csv
+import io
+from bisect import bisect
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from random import Random
+from typing import IO, Iterator, NamedTuple, Optional
+
+from sorting_hat.batch import ANSWER_FIELDS, FORMATS, ScoredSheet, write_results
+from sorting_hat.metrics import METRICS
+from sorting_hat.referential import QuizReferential, load_referential
+from sorting_hat.scoring import ScoreCache, get_best_houses
+
+BLOCK_SIZE = 10_000
+
+
+class Sorting(NamedTuple):
+    """A simulated sorting."""
+
+    respondent_id: str
+    answers: list[tuple[str, str, str]]  # The question_id, variation_id, answer_id.
+    house: str
+    scores: tuple[float, ...]  # In the order of the houses of the referential.
+
+
+class Simulator:
+    """Generates synthetic sortings.
+
+    Args:
+        referential: The referential of questions, answers and weights.
+        seed: The seed of the simulation.
+        long_quiz: A flag to ask every variation of each question. Defaults to False.
+        profile: The house the answers are biased towards. Defaults to None
+            (uniform answers).
+        bias: How strongly the answers favor the house of the profile: an answer
+            is drawn with a probability proportional to 1 + bias * its weight for
+            that house. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        referential: QuizReferential,
+        seed: int,
+        long_quiz: bool = False,
+        profile: Optional[str] = None,
+        bias: float = 2.0,
+    ) -> None:
+        """Initializes the class."""
+        if profile is not None and profile not in referential.houses:
+            raise ValueError(
+                f"The profile should be one of {', '.join(referential.houses)}."
+            )
+
+        self.referential = referential
+        self.seed = seed
+        self.long_quiz = long_quiz
+        self.profile = profile
+        self.bias = bias
+        # The sheets are summed as `sorting-hat score` sums them.
+        self.cache = ScoreCache(referential=referential)
+
+        self._variations_per_question: dict[str, list[tuple[str, str]]] = defaultdict(
+            list
+        )
+        for key in referential.variations:
+            self._variations_per_question[key[0]].append(key)
+
+        # For each variation: its answers, their positions in the referential and,
+        # for a profile, the cumulative probabilities of the answers.
+        self._answers: dict[
+            tuple[str, str], tuple[list[str], list[int], Optional[list[float]]]
+        ] = {}
+        for key in referential.variations:
+            answer_ids = [
+                str(answer_id)
+                for answer_id in range(1, len(referential.answer_texts[key]) + 1)
+            ]
+            vectors = [
+                referential.weights[(*key, answer_id)] for answer_id in answer_ids
+            ]
+            cumulative = None
+            if profile is not None:
+                house = referential.houses.index(profile)
+                cumulative, total = [], 0.0
+                for vector in vectors:
+                    total += 1.0 + bias * vector[house]
+                    cumulative.append(total)
+            positions = [
+                self.cache.positions[(*key, answer_id)] for answer_id in answer_ids
+            ]
+            self._answers[key] = (answer_ids, positions, cumulative)
+
+    def generate(self, n: int, start: int = 0) -> Iterator[Sorting]:
+        """Generates sortings.
+
+        Args:
+            n: The number of sortings.
+            start: The position of the first sorting. Defaults to 0.
+
+        Yields:
+            The sortings of the respondents start to start + n - 1.
+        """
+        end = start + n
+        for block in range(start // BLOCK_SIZE, (end - 1) // BLOCK_SIZE + 1):
+            block_start = block * BLOCK_SIZE
+            for position, sorting in enumerate(
+                self.generate_block(block=block), start=block_start
+            ):
+                if position >= end:
+                    return
+                if position >= start:
+                    METRICS.count_house(house=sorting.house)
+                    yield sorting
+
+    def generate_block(self, block: int) -> Iterator[Sorting]:
+        """Generates a block of sortings with its own random generator.
+
+        Args:
+            block: The position of the block.
+
+        Yields:
+            The BLOCK_SIZE sortings of the block.
+        """
+        rng = Random(f"{self.seed}:{block}")
+        random = rng.random
+        houses = self.referential.houses
+        totals = self.cache.totals
+        questions = list(self._variations_per_question.values())
+        all_variations = list(self.referential.variations)
+
+        for position in range(block * BLOCK_SIZE, (block + 1) * BLOCK_SIZE):
+            if self.long_quiz:
+                variations = all_variations[:]
+            else:
+                variations = [keys[int(random() * len(keys))] for keys in questions]
+            rng.shuffle(variations)
+
+            answers = []
+            sheet = []
+            for key in variations:
+                answer_ids, positions, cumulative = self._answers[key]
+                if cumulative is None:
+                    i = int(random() * len(answer_ids))
+                else:
+                    i = bisect(cumulative, random() * cumulative[-1])
+                answers.append((key[0], key[1], answer_ids[i]))
+                sheet.append(positions[i])
+            total = totals(sheet)
+
+            respondent_id = str(position)
+            score = dict(zip(houses, total))
+            best_houses = get_best_houses(score=score)
+            if len(best_houses) == 1:
+                house = best_houses[0]
+            else:
+                # Broken as `sorting-hat score --seed` would break it.
+                house = Random(f"{self.seed}:{respondent_id}").choice(best_houses)
+
+            yield Sorting(respondent_id, answers, house, total)
+
+
+def render_sortings(
+    sortings: Iterator[Sorting],
+    fmt: str,
+    houses: tuple[str, ...],
+    answers: bool = False,
+) -> str:
+    """Renders sortings as the rows of a file, without the CSV header.
+
+    Args:
+        sortings: The sortings.
+        fmt: The format of the file, one of FORMATS.
+        houses: The houses, giving the order of the scores.
+        answers: A flag to render the answers, as read by `sorting-hat score`,
+            instead of the results. Defaults to False.
+
+    Returns:
+        The rows.
+    """
+    f = io.StringIO()
+
+    if not answers:
+        write_results(
+            results=(
+                ScoredSheet(
+                    sorting.respondent_id,
+                    sorting.house,
+                    dict(zip(houses, sorting.scores)),
+                )
+                for sorting in sortings
+            ),
+            f=f,
+            fmt=fmt,
+            houses=houses,
+        )
+        if fmt == "csv":
+            # The header is written once, before the first block.
+            return f.getvalue().split("\n", 1)[1]
+        return f.getvalue()
+
+    if fmt == "csv":
+        csv.writer(f, lineterminator="\n").writerows(
+            (sorting.respondent_id, *answer)
+            for sorting in sortings
+            for answer in sorting.answers
+        )
+    elif fmt == "jsonl":
+        for sorting in sortings:
+            for question_id, variation_id, answer_id in sorting.answers:
+                f.write(
+                    f'{{"respondent_id": "{sorting.respondent_id}", '
+                    f'"question_id": "{question_id}", '
+                    f'"variation_id": "{variation_id}", '
+                    f'"answer_id": "{answer_id}"}}\n'
+                )
+    else:
+        raise ValueError(f"The format should be one of {', '.join(FORMATS)}.")
+
+    return f.getvalue()
+
+
+def simulate_to_file(
+    f: IO[str],
+    n: int,
+    seed: int,
+    fmt: str = "jsonl",
+    answers: bool = False,
+    long_quiz: bool = False,
+    profile: Optional[str] = None,
+    bias: float = 2.0,
+    workers: int = 1,
+    package: str = "sorting_hat.data",
+) -> None:
+    """Generates sortings and writes them to a file.
+
+    Args:
+        f: The file to write to.
+        n: The number of sortings.
+        seed: The seed of the simulation.
+        fmt: The format of the file, one of FORMATS. Defaults to "jsonl".
+        answers: A flag to write the answers, as read by `sorting-hat score`,
+            instead of the results. Defaults to False.
+        long_quiz: A flag to ask every variation of each question. Defaults to False.
+        profile: The house the answers are biased towards. Defaults to None
+            (uniform answers).
+        bias: How strongly the answers favor the house of the profile.
+        workers: The number of processes generating the blocks. Defaults to 1.
+        package: The package containing the referential.
+    """
+    referential = load_referential(package=package)
+    if fmt == "csv":
+        header = (
+            ANSWER_FIELDS
+            if answers
+            else ("respondent_id", "house") + referential.houses
+        )
+        csv.writer(f, lineterminator="\n").writerow(header)
+
+    tasks = (
+        (
+            package,
+            seed,
+            fmt,
+            answers,
+            long_quiz,
+            profile,
+            bias,
+            start,
+            min(BLOCK_SIZE, n - start),
+        )
+        for start in range(0, n, BLOCK_SIZE)
+    )
+
+    if workers == 1:
+        for task in tasks:
+            f.write(_render_task(task))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(METRICS.enabled,)
+    ) as executor:
+        # The blocks are written in order, whatever the process generating them.
+        # Only two blocks per process are submitted ahead of the one being written,
+        # so that a slow output does not keep every rendered block in memory.
+        window: deque[Future[tuple[str, Counter[str]]]] = deque()
+        for task in tasks:
+            window.append(executor.submit(_render_block, task))
+            if len(window) >= 2 * workers:
+                _write_block(f=f, block=window.popleft().result())
+        while window:
+            _write_block(f=f, block=window.popleft().result())
+
+
+def _init_worker(profile: bool) -> None:
+    """Enables the metrics of a worker process as in the parent.
+
+    Args:
+        profile: A flag telling whether the metrics of the parent are enabled.
+    """
+    METRICS.enabled = profile
+    METRICS.reset()
+
+
+def _write_block(f: IO[str], block: tuple[str, Counter[str]]) -> None:
+    """Writes a block rendered by a worker and counts its houses in the parent.
+
+    Args:
+        f: The file to write to.
+        block: The rows and the houses counted by the worker.
+    """
+    rows, houses = block
+    f.write(rows)
+    METRICS.houses.update(houses)
+
+
+def _render_block(
+    task: tuple[str, int, str, bool, bool, Optional[str], float, int, int]
+) -> tuple[str, Counter[str]]:
+    """Generates and renders the sortings of a block in a worker process.
+
+    Args:
+        task: The task of _render_task.
+
+    Returns:
+        The rows and the houses counted, sent back to the parent which writes the
+        report of the metrics.
+    """
+    METRICS.houses.clear()
+    rows = _render_task(task)
+    return rows, METRICS.houses.copy()
+
+
+def _render_task(
+    task: tuple[str, int, str, bool, bool, Optional[str], float, int, int]
+) -> str:
+    """Generates and renders the sortings of a block.
+
+    Args:
+        task: The package of the referential, the seed, the format, the flag to
+            render the answers, the flag of the long quiz, the profile, the bias,
+            the position of the first sorting and the number of sortings.
+
+    Returns:
+        The rows.
+    """
+    package, seed, fmt, answers, long_quiz, profile, bias, start, n = task
+    referential = load_referential(package=package)
+    simulator = Simulator(
+        referential=referential,
+        seed=seed,
+        long_quiz=long_quiz,
+        profile=profile,
+        bias=bias,
+    )
+    return render_sortings(
+        sortings=simulator.generate(n=n, start=start),
+        fmt=fmt,
+        houses=referential.houses,
+        answers=answers,
+    )
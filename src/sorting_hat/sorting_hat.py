@@ -1,53 +1,93 @@
 """This module will play the role of the sorting hat.
 
 By default seven questions will be asked and one of the four houses
-will be chosen from the answers.
+will be chosen from the answers. The questions are asked through a prompt
+(the interactive menu by default, see the prompt module).
 """
 
-import csv
-import sys
+import random
 from collections import defaultdict
-from importlib import resources
-from random import shuffle
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
 
-import questionary
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.metrics import METRICS, timed
+from sorting_hat.prompt import Prompt, QuestionaryPrompt
+from sorting_hat.referential import QuizReferential
+from sorting_hat.registry import resolve_referential
+from sorting_hat.scoring import get_best_houses, get_winning_house, update_score
 
-from sorting_hat.print_house_ascii import print_house_ascii
+if TYPE_CHECKING:
+    from sorting_hat.stats import SortingStats
+
+
+class SortingResult(NamedTuple):
+    """The result of a sorting."""
+
+    house: str
+    scores: dict[str, float]
+    answers: list[dict[str, str]]  # The question_id, variation_id and answer_id.
 
 
 class SortingHat:
     """Sorts someone into one of the four houses.
 
     Args:
-        questions: The filename with the referential of questions to ask.
-        answers: The filename with the referential of answers.
-        weights: The filename with the referential of weights for each question.
+        referential: The referential of questions, answers and weights.
+            Defaults to None (the referential of the pack).
         chosen_variations: The randomly chosen variation for each question.
+            Defaults to None (a variation of each question is chosen).
+        early_stop: A flag to stop asking questions once the house is decided.
+            Defaults to False.
+        information_gain: A flag to ask the most informative question first,
+            used with early_stop. Defaults to False.
+        rng: The random generator used to shuffle the questions and to break a tie.
+            Defaults to None (the global one).
+        pack: The name of the quiz pack to use instead of a referential.
+            Defaults to None (the default pack, if no referential is given).
+        stats: The aggregate recording the answers and the outcome.
+            Defaults to None (nothing is recorded).
+        prompt: The prompt asking the questions and showing the result.
+            Defaults to None (the interactive menu).
     """
 
     def __init__(
         self,
-        questions: str,
-        answers: str,
-        weights: str,
-        chosen_variations: list[dict[str, str]],
+        referential: Optional[QuizReferential] = None,
+        chosen_variations: Optional[list[dict[str, str]]] = None,
+        early_stop: bool = False,
+        information_gain: bool = False,
+        rng: Optional[random.Random] = None,
+        pack: Optional[str] = None,
+        stats: Optional["SortingStats"] = None,
+        prompt: Optional[Prompt] = None,
     ) -> None:
         """Initializes the class."""
-        self.questions_filename = questions
-        self.answers_filename = answers
-        self.weights_filename = weights
+        self.referential = resolve_referential(referential=referential, pack=pack)
+
+        if chosen_variations is None:
+            chosen_variations = ChooseVariations(
+                referential=self.referential, rng=rng
+            ).run()
         self.chosen_variations = chosen_variations
+        self.early_stop = early_stop
+        self.information_gain = information_gain
+        self.rng = rng
+        self.stats = stats
+        self.prompt = prompt if prompt is not None else QuestionaryPrompt()
+
+    def run(self) -> SortingResult:
+        """Sorts someone into one of the four houses.
 
-    def run(self) -> None:
-        """Sorts someone into one of the four houses."""
-        questions = self._load(filename=self.questions_filename)
-        answers = self._load(filename=self.answers_filename)
-        weights = self._load(filename=self.weights_filename)
+        Returns:
+            The house, the score of each house and the answers given.
 
+        Raises:
+            QuizCancelled: If the person being sorted leaves the quiz.
+        """
         # Shuffle the order of the questions to add more randomness.
-        shuffle(x=self.chosen_variations)
+        (self.rng or random).shuffle(x=self.chosen_variations)
 
-        print(
+        self.prompt.show(
             "\n-------------------- "
             "La cérémonie de répartition va débuter !"
             " --------------------\n"
@@ -55,76 +95,58 @@ class SortingHat:
 
         current_score = defaultdict(float)
 
-        for variation in self.chosen_variations:
-            answer = self._ask_question(
-                questions=questions, answers=answers, variation=variation
-            )
+        variations: Iterable[dict[str, str]] = self.chosen_variations
+        if self.early_stop:
+            from sorting_hat.early_stop import EarlyStop
+
+            # The score is updated in place, so the next question is chosen from it.
+            variations = EarlyStop(
+                referential=self.referential,
+                chosen_variations=self.chosen_variations,
+                information_gain=self.information_gain,
+            ).iterate(score=current_score)
+
+        answers = []
+        for variation in variations:
+            answer = self._ask_question(variation=variation)
+            answers.append(answer)
+            if self.stats is not None:
+                self.stats.count_answer(**answer)
             current_score = self._update_score(
-                weights=weights, answer=answer, current_score=current_score
+                referential=self.referential, answer=answer, current_score=current_score
             )
 
-        winning_house = self._get_winning_house(score=current_score)
+        winning_house = self._get_winning_house(score=current_score, rng=self.rng)
+        METRICS.count_house(house=winning_house)
+        if self.stats is not None:
+            self.stats.record(
+                house=winning_house,
+                tie=len(get_best_houses(score=current_score)) > 1,
+            )
 
-        print(
-            f"\n-------------------- "
-            f"Le choix a été fait ! "
-            f" --------------------\n"
-            f"\n---------- "
-            f"La maison {winning_house.capitalize()} te souhaite la bienvenue !"
-            f" ----------\n"
-        )
+        self.prompt.show_result(house=winning_house)
 
-        print_house_ascii(house=winning_house)
-        self._print_welcome_message(house=winning_house)
+        return SortingResult(
+            house=winning_house, scores=dict(current_score), answers=answers
+        )
 
-    def _ask_question(
-        self,
-        questions: list[dict[str, str]],
-        answers: list[dict[str, str]],
-        variation: dict[str, str],
-    ) -> dict[str, str]:
+    @timed("ask_question")
+    def _ask_question(self, variation: dict[str, str]) -> dict[str, str]:
         """Asks a question and gets the answer back.
 
         Args:
-            questions: The referential of questions.
-            answers: The referential of answers.
             variation: The chosen variation of the question.
 
         Returns:
             A dictionary with the question_id, the variation_id, and the answer_id.
         """
-        for question in questions:
-            if (
-                question["question_id"] == variation["question_id"]
-                and question["variation_id"] == variation["variation_id"]
-            ):
-                variation_text = question["variation_text"]
-                break
-
-        answer_text: list[str] = []
-
-        for answer in answers:
-            if (
-                answer["question_id"] == variation["question_id"]
-                and answer["variation_id"] == variation["variation_id"]
-            ):
-                answer_text.append(answer["answer_text"])
-
-        try:
-            answer_id = str(
-                answer_text.index(
-                    questionary.select(
-                        message=variation_text,
-                        choices=answer_text,
-                        instruction=" ",
-                        qmark="",
-                    ).ask()
-                )
-                + 1  # Add 1 to offset the index and match the referential.
+        key = (variation["question_id"], variation["variation_id"])
+        answer_id = str(
+            self.prompt.ask(
+                message=self.referential.variation_texts[key],
+                choices=self.referential.answer_texts[key],
             )
-            print("\n")
-        except ValueError:
-            sys.exit()
+        )
 
         return {
             "question_id": variation["question_id"],
@@ -133,54 +155,31 @@ class SortingHat:
         }
 
     @staticmethod
-    def _load(filename: str) -> list[dict[str, str]]:
-        """Loads one of the input files (the questions, the answers or the weights).
-
-        Args:
-            filename: The filename to load.
-
-        Returns:
-            A list of rows.
-        """
-        rows = []
-
-        with resources.open_text(
-            package="sorting_hat.data", resource=filename, encoding="utf-8"
-        ) as f:
-            reader = csv.DictReader(f=f)
-            for row in reader:
-                rows.append(row)
-
-        return rows
-
-    @staticmethod
+    @timed("update_score")
     def _update_score(
-        weights: list[dict[str, str]],
+        referential: QuizReferential,
         answer: dict[str, str],
         current_score: defaultdict[str, float],
     ) -> defaultdict[str, float]:
         """Updates the score after a new answer.
 
         Args:
-            weights: The referential of weights.
+            referential: The referential holding the weights.
             answer: The answer given to a specific question.
             current_score: The current state of the score that should be updated.
 
         Returns:
             The updated score.
         """
-        for weight in weights:
-            if (
-                weight["question_id"] == answer["question_id"]
-                and weight["variation_id"] == answer["variation_id"]
-                and weight["answer_id"] == answer["answer_id"]
-            ):
-                current_score[weight["house"]] += float(weight["weight"])
-
-        return current_score
+        return update_score(
+            referential=referential, answer=answer, current_score=current_score
+        )
 
     @staticmethod
-    def _get_winning_house(score: dict[str, float]) -> str:
+    @timed("get_winning_house")
+    def _get_winning_house(
+        score: dict[str, float], rng: Optional[random.Random] = None
+    ) -> str:
         """Gets the winning house.
 
         In case of a tie, the winning house is chosen at random between the houses
@@ -188,52 +187,10 @@ class SortingHat:
 
         Args:
             score: The results once the questionary is done.
+            rng: The random generator used to break a tie. Defaults to None
+                (the global one).
 
         Returns:
             The winning house.
         """
-        # Shuffle the dictionary to add more randomness in case of a tie.
-        shuffled_score = list(score.items())
-
-        shuffle(x=shuffled_score)
-        shuffled_score = dict(shuffled_score)
-
-        return max(shuffled_score, key=shuffled_score.get)
-
-    @staticmethod
-    def _print_welcome_message(house: str) -> None:
-        """Prints a different welcome message for each house.
-
-        Args:
-            house: The house for which to print the welcome message.
-        """
-        houses = ("gryffondor", "poufsouffle", "serdaigle", "serpentard")
-
-        if house not in houses:
-            raise ValueError(f"The house should be one of {', '.join(houses)}.")
-
-        if house == "gryffondor":
-            print(
-                "\n---------- "
-                "On a vu pire que Gryffondor, tu ne t'en sors pas si mal !"
-                " ----------\n"
-            )
-
-        if house == "poufsouffle":
-            print(
-                "\n---------- "
-                "Ils sont gentils les Poufsouffle, c'est déjà quelque chose !"
-                " ----------\n"
-            )
-
-        if house == "serdaigle":
-            print(
-                "\n---------- "
-                "Serdaigle, vraiment ? Et bien... bon courage ?"
-                " ----------\n"
-            )
-
-        if house == "serpentard":
-            print(
-                "\n---------- " "Aaah Serpentard ! Welcome my friend !" " ----------\n"
-            )
+        return get_winning_house(score=score, rng=rng)
@@ -0,0 +1,209 @@
+"""This module aggregates the outcomes of the sortings without storing them.
+
+A SortingStats counts the houses chosen, the answers given to each variation and
+the sortings whose house had to be drawn among tied houses. Recording a sorting
+only increments counters, so the cost does not grow with the number of sortings.
+
+Two aggregates are merged by adding their counters: the merge is associative and
+commutative, so the aggregates of several workers, processes or machines can be
+merged in any order. An aggregate is saved as a small JSON snapshot; the
+`sorting-hat stats` command merges a directory of snapshots.
+
+The command line writes a snapshot when a command is done if it is given
+`--stats-dir` or if the SORTING_HAT_STATS_DIR environment variable is set.
+"""
+
+import json
+import os
+import socket
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+FORMAT_VERSION = 1
+
+SNAPSHOT_SUFFIX = ".stats.json"
+
+
+class SortingStats:
+    """Counts the houses, the answers and the ties of many sortings.
+
+    Attributes:
+        sortings: The number of sortings.
+        ties: The number of sortings whose house was drawn among tied houses.
+        houses: The number of sortings won by each house.
+        answers: The number of times each answer was given, keyed by
+            (question_id, variation_id, answer_id).
+    """
+
+    __slots__ = ("sortings", "ties", "houses", "answers")
+
+    def __init__(self) -> None:
+        """Initializes the class."""
+        self.sortings = 0
+        self.ties = 0
+        self.houses: Counter[str] = Counter()
+        self.answers: Counter[tuple[str, str, str]] = Counter()
+
+    def count_answer(self, question_id: str, variation_id: str, answer_id: str) -> None:
+        """Counts an answer.
+
+        Args:
+            question_id: The question answered.
+            variation_id: The variation of the question answered.
+            answer_id: The answer given.
+        """
+        self.answers[(question_id, variation_id, answer_id)] += 1
+
+    def record(self, house: str, tie: bool = False) -> None:
+        """Records the outcome of a sorting.
+
+        Args:
+            house: The house chosen.
+            tie: A flag telling whether the house was drawn among tied houses.
+                Defaults to False.
+        """
+        self.sortings += 1
+        self.ties += tie
+        self.houses[house] += 1
+
+    @property
+    def tie_rate(self) -> float:
+        """The share of the sortings which ended in a tie."""
+        return self.ties / self.sortings if self.sortings else 0.0
+
+    def merge(self, other: "SortingStats") -> "SortingStats":
+        """Adds the counters of another aggregate to this one.
+
+        Args:
+            other: The other aggregate.
+
+        Returns:
+            This aggregate, updated.
+        """
+        self.sortings += other.sortings
+        self.ties += other.ties
+        self.houses.update(other.houses)
+        self.answers.update(other.answers)
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the counters of two aggregates."""
+        if not isinstance(other, SortingStats):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Gets the counters as a dictionary ready to be dumped as JSON.
+
+        The answers are keyed by "question_id/variation_id/answer_id".
+
+        Returns:
+            The counters.
+        """
+        return {
+            "version": FORMAT_VERSION,
+            "sortings": self.sortings,
+            "ties": self.ties,
+            "houses": dict(sorted(self.houses.items())),
+            "answers": {
+                "/".join(key): count for key, count in sorted(self.answers.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SortingStats":
+        """Builds an aggregate from its dictionary.
+
+        Args:
+            data: The dictionary, as returned by to_dict.
+
+        Returns:
+            The aggregate.
+        """
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError("The snapshot is not an aggregate of this version.")
+
+        stats = cls()
+        stats.sortings = data["sortings"]
+        stats.ties = data["ties"]
+        stats.houses.update(data["houses"])
+        for key, count in data["answers"].items():
+            question_id, variation_id, answer_id = key.split("/")
+            stats.answers[(question_id, variation_id, answer_id)] = count
+        return stats
+
+    def dump(self, path: Path) -> None:
+        """Writes a snapshot atomically, so that a reader never sees a partial one.
+
+        Args:
+            path: The path of the snapshot.
+        """
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary_path.write_text(
+            json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8"
+        )
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SortingStats":
+        """Reads a snapshot.
+
+        Args:
+            path: The path of the snapshot.
+
+        Returns:
+            The aggregate.
+        """
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def merge_all(aggregates: Iterable[SortingStats]) -> SortingStats:
+    """Merges several aggregates into a new one.
+
+    Args:
+        aggregates: The aggregates.
+
+    Returns:
+        The aggregate of every sorting.
+    """
+    merged = SortingStats()
+    for stats in aggregates:
+        merged.merge(stats)
+    return merged
+
+
+def merge_directory(directory: Union[str, Path]) -> SortingStats:
+    """Merges the snapshots of a directory.
+
+    Args:
+        directory: The directory holding the snapshots.
+
+    Returns:
+        The aggregate of every sorting of the snapshots.
+    """
+    return merge_all(
+        SortingStats.load(path)
+        for path in sorted(Path(directory).glob(f"*{SNAPSHOT_SUFFIX}"))
+    )
+
+
+def write_snapshot(stats: SortingStats, directory: Union[str, Path]) -> Path:
+    """Writes a snapshot under a name of its own in a directory.
+
+    Args:
+        stats: The aggregate.
+        directory: The directory of the snapshots, created if needed.
+
+    Returns:
+        The path of the snapshot.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / (
+        f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        f"{SNAPSHOT_SUFFIX}"
+    )
+    stats.dump(path=path)
+    return path
@@ -0,0 +1,205 @@
+"""This module scores an unbounded stream of answers.
+
+The answers of many respondents can be interleaved in the stream.
+Only the answers of the respondents whose quiz is not complete yet are kept,
+and a result is emitted as soon as a respondent has answered every question.
+Respondents who stop answering are forgotten after a while so that the memory
+used stays flat however long the stream is.
+
+The referential can be swapped while the stream is scored (see
+`sorting_hat.reload`): the respondents who already gave an answer are scored with
+the referential they started with, the new ones with the new referential.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from sorting_hat.batch import ScoredSheet, decide_houses
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.referential import QuizReferential
+from sorting_hat.scoring import ScoreCache
+from sorting_hat.stats import SortingStats
+
+
+class _Version(NamedTuple):
+    """A referential with what is needed to score a quiz with it."""
+
+    referential: QuizReferential
+    cache: ScoreCache
+    number_of_questions: int
+
+
+class StreamScorer:
+    """Scores the answers of many respondents as they arrive.
+
+    Args:
+        referential: The referential holding the weights.
+        long_quiz: A flag to tell whether every variation of each question is
+            asked or not. Defaults to False.
+        idle_timeout: The number of seconds after which a respondent without any
+            new answer is evicted. Defaults to one hour.
+        max_pending: The maximum number of incomplete quizzes kept at once,
+            the least recently active one is evicted first. Defaults to 100 000.
+        seed: The seed used to break ties. Defaults to None (not reproducible).
+        clock: The function giving the current time, in seconds.
+        stats: The aggregate recording the answers and the outcomes.
+            Defaults to None (nothing is recorded).
+    """
+
+    def __init__(
+        self,
+        referential: QuizReferential,
+        long_quiz: bool = False,
+        idle_timeout: float = 3600.0,
+        max_pending: int = 100_000,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        stats: Optional[SortingStats] = None,
+    ) -> None:
+        """Initializes the class."""
+        self.stats = stats
+        self.long_quiz = long_quiz
+        self.idle_timeout = idle_timeout
+        self.max_pending = max_pending
+        self.clock = clock
+        self.evicted = 0
+        self.seed = seed
+        self.reload(referential=referential)
+        # For each respondent: the time of the last answer, the position of the
+        # answer to each question and the version of the referential they started
+        # with, ordered from the least recently active.
+        self._pending: OrderedDict[
+            str, tuple[float, dict[tuple[str, ...], int], _Version]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Gets the number of incomplete quizzes currently kept."""
+        return len(self._pending)
+
+    def reload(self, referential: QuizReferential) -> None:
+        """Swaps in a new referential for the respondents yet to start.
+
+        Args:
+            referential: The new referential.
+        """
+        version = _Version(
+            referential=referential,
+            cache=ScoreCache(referential=referential),
+            number_of_questions=len(
+                ChooseVariations(
+                    referential=referential, long_quiz=self.long_quiz
+                ).run()
+            ),
+        )
+        self.referential = referential
+        self.cache = version.cache
+        self._version = version
+
+    def run(
+        self, answers: Iterable[tuple[str, str, str, str]]
+    ) -> Iterator[ScoredSheet]:
+        """Scores a stream of answers.
+
+        Args:
+            answers: The respondent_id, the question_id, the variation_id and
+                the answer_id of each answer.
+
+        Yields:
+            The result of each respondent as soon as their quiz is complete.
+        """
+        for answer in answers:
+            result = self.add(*answer)
+            if result is not None:
+                yield result
+
+    def add(
+        self, respondent_id: str, question_id: str, variation_id: str, answer_id: str
+    ) -> Optional[ScoredSheet]:
+        """Adds an answer to the quiz of a respondent.
+
+        If a question is answered twice, the last answer is kept.
+
+        Args:
+            respondent_id: The respondent giving the answer.
+            question_id: The question answered.
+            variation_id: The variation of the question answered.
+            answer_id: The answer given.
+
+        Returns:
+            The result of the respondent if their quiz is now complete.
+        """
+        now = self.clock()
+        # Evicted first, so that the answer is looked up in the version which
+        # will hold the sheet: a respondent back after the timeout starts again.
+        self._evict(now=now)
+
+        entry = self._pending.get(respondent_id)
+        version = self._version if entry is None else entry[2]
+        try:
+            position = version.cache.positions[(question_id, variation_id, answer_id)]
+        except KeyError:
+            raise ValueError(
+                f"Unknown answer {question_id}/{variation_id}/{answer_id} "
+                f"for respondent {respondent_id!r}."
+            ) from None
+
+        if self.stats is not None:
+            self.stats.count_answer(question_id, variation_id, answer_id)
+
+        entry = self._pending.pop(respondent_id, None)
+        answered = {} if entry is None else entry[1]
+        key = (question_id, variation_id) if self.long_quiz else (question_id,)
+        answered[key] = position
+
+        if len(answered) == version.number_of_questions:
+            return self._score(
+                respondent_id=respondent_id, answered=answered, version=version
+            )
+
+        self._pending[respondent_id] = (now, answered, version)
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.evicted += 1
+
+        return None
+
+    def _evict(self, now: float) -> None:
+        """Evicts the respondents idle for longer than the timeout.
+
+        Args:
+            now: The current time, in seconds.
+        """
+        deadline = now - self.idle_timeout
+
+        while self._pending:
+            last_seen = next(iter(self._pending.values()))[0]
+            if last_seen > deadline:
+                break
+            self._pending.popitem(last=False)
+            self.evicted += 1
+
+    def _score(
+        self,
+        respondent_id: str,
+        answered: dict[tuple[str, ...], int],
+        version: _Version,
+    ) -> ScoredSheet:
+        """Scores a complete quiz.
+
+        Args:
+            respondent_id: The respondent who completed the quiz.
+            answered: The position of the answer to each question.
+            version: The referential the respondent started with.
+
+        Returns:
+            The winning house and the total of each house.
+        """
+        (result,) = decide_houses(
+            totals={respondent_id: version.cache.totals(answered.values())},
+            houses=version.referential.houses,
+            seed=self.seed,
+            stats=self.stats,
+        )
+
+        return result
@@ -0,0 +1,186 @@
+"""This module scores millions of answer sheets at once with NumPy.
+
+NumPy is an optional dependency, installed with `pip install sorting-hat[numpy]`.
+
+The weights are flattened into a dense matrix with one row per answer, indexed by
+the code of the answer (its position in the referential, as in ScoreCache), and a
+last row of zeros for the code -1, which pads the shorter sheets. A batch of N
+sheets of at most k answers is an (N, k) array of codes: the totals are gathered
+from the matrix one column at a time, after the codes of each sheet are sorted
+(unless they already are, as when the answers are given in the order of the
+questions), so the weights are added in the same order as by ScoreCache and the
+totals are the same floats, to the last bit. The ties are then broken at random
+among the best houses, for the whole batch at once.
+
+Only VectorizedScorer.score works on the whole batch at once: it is about 50
+times as fast as ScoreCache on a million sheets (see benchmarks/vectorized.py),
+short of a hundred. VectorizedScorer.score_answers, the engine of `sorting-hat
+score`, only takes the totals and the houses without a tie from it: the rows are
+gathered into sheets, each tie is broken with the generator of its respondent and
+the results are built one respondent at a time in Python, which leaves it about
+1.4 times as fast as the default engine.
+"""
+
+from functools import reduce
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from sorting_hat.batch import ScoredSheet, gather_sheets, record_rng
+from sorting_hat.metrics import METRICS
+from sorting_hat.scoring import get_winning_house
+
+if TYPE_CHECKING:
+    from sorting_hat.referential import QuizReferential
+    from sorting_hat.stats import SortingStats
+
+
+class VectorizedResult(NamedTuple):
+    """The outcome of a batch of answer sheets."""
+
+    winners: np.ndarray  # The position of the winning house of each sheet, (N,).
+    scores: np.ndarray  # The total of each house of each sheet, (N, houses).
+    ties: np.ndarray  # Whether several houses had the best total, (N,).
+
+
+class VectorizedScorer:
+    """Scores batches of answer sheets with NumPy.
+
+    Args:
+        referential: The referential holding the weights.
+
+    Attributes:
+        codes: The code of each answer, keyed by (question_id, variation_id,
+            answer_id).
+        houses: The houses, in the order of the columns of the scores.
+        matrix: The weights of each answer, one row per code, with a last row of
+            zeros for the padding code -1.
+    """
+
+    def __init__(self, referential: "QuizReferential") -> None:
+        """Initializes the class."""
+        self.codes = {key: i for i, key in enumerate(referential.weights)}
+        self.houses = referential.houses
+        self.matrix = np.zeros((len(self.codes) + 1, len(self.houses)))
+        if self.codes:
+            self.matrix[:-1] = list(referential.weights.values())
+        # The first weight gathered stands for 0.0 + weight in ScoreCache, which
+        # only differs from the weight for -0.0.
+        self.matrix += 0.0
+        self.matrix.setflags(write=False)
+
+    def encode(self, sheets: Iterable[Sequence[int]]) -> np.ndarray:
+        """Packs answer sheets into an array of codes.
+
+        Args:
+            sheets: The codes of the answers of each sheet.
+
+        Returns:
+            An (N, k) array of codes, k being the length of the longest sheet,
+            the shorter sheets being padded with -1.
+        """
+        sheets = list(sheets)
+        lengths = np.fromiter(map(len, sheets), dtype=np.intp, count=len(sheets))
+        width = int(lengths.max()) if len(sheets) else 0
+        codes = np.full((len(sheets), width), -1, dtype=np.int32)
+        codes[np.arange(width) < lengths[:, np.newaxis]] = np.fromiter(
+            chain.from_iterable(sheets), dtype=np.int32, count=int(lengths.sum())
+        )
+        return codes
+
+    def score(self, codes: np.ndarray, seed: Optional[int] = None) -> VectorizedResult:
+        """Scores a batch of answer sheets.
+
+        Args:
+            codes: An (N, k) array of the codes of the answers of each sheet, in
+                any order, padded with -1.
+            seed: The seed of the generator breaking the ties. Defaults to None
+                (not reproducible).
+
+        Returns:
+            The winning house, the totals and the ties of each sheet.
+        """
+        codes = np.asarray(codes)
+        if codes.ndim != 2:
+            raise ValueError(f"The codes should be an (N, k) array, not {codes.shape}.")
+        if codes.size and (codes.min() < -1 or codes.max() >= len(self.codes)):
+            raise ValueError(f"The codes should be in [-1, {len(self.codes)}).")
+
+        # The answers are handled one column at a time, each column contiguous.
+        columns = np.ascontiguousarray(codes.T)
+        if any((after < before).any() for before, after in zip(columns, columns[1:])):
+            columns = np.ascontiguousarray(np.sort(codes, axis=1).T)
+        if not len(columns):
+            columns = np.full((1, len(codes)), -1)
+
+        # The mode "wrap" takes the row of zeros for -1, and is not buffered as the
+        # mode "raise" is (the codes were checked above).
+        scores = self.matrix.take(columns[0], axis=0, mode="wrap")
+        gathered = np.empty_like(scores)
+        for column in columns[1:]:
+            self.matrix.take(column, axis=0, out=gathered, mode="wrap")
+            scores += gathered
+
+        # One view per house, the houses being few and the sheets many.
+        houses = scores.T
+        is_best = (houses == reduce(np.maximum, houses)).view(np.uint8)
+        ties = reduce(np.add, is_best) > 1
+        winners = np.zeros(len(codes), dtype=np.intp)
+        for position in range(1, len(houses)):
+            winners += is_best[position] * position
+
+        tied = np.flatnonzero(ties)
+        if len(tied):
+            # Each tied house draws a key: the best one wins, uniformly among them.
+            keys = np.random.default_rng(seed).random((len(houses), len(tied)))
+            winners[tied] = np.where(is_best[:, tied], keys, -1.0).argmax(axis=0)
+
+        return VectorizedResult(winners=winners, scores=scores, ties=ties)
+
+    def score_answers(
+        self,
+        answers: Iterable[tuple[str, str, str, str]],
+        seed: Optional[int] = None,
+        stats: Optional["SortingStats"] = None,
+    ) -> list[ScoredSheet]:
+        """Scores the answer sheets of several respondents, as batch.score_answers.
+
+        Only the totals and the houses without a tie are computed by the kernel.
+        A tie is broken in Python with the generator of the respondent, as in
+        batch.decide_houses, so that the results are the same as with the pure
+        Python scoring.
+
+        Args:
+            answers: The rows of the answer sheets.
+            seed: The seed used to break ties. Defaults to None (not reproducible).
+            stats: The aggregate recording the answers and the outcomes.
+                Defaults to None (nothing is recorded).
+
+        Returns:
+            The winning house and the total of each house for each respondent.
+        """
+        sheets = gather_sheets(answers=answers, positions=self.codes, stats=stats)
+        result = self.score(codes=self.encode(sheets.values()))
+        houses = self.houses
+
+        results = []
+        for respondent_id, totals, winner, tie in zip(
+            sheets,
+            result.scores.tolist(),
+            result.winners.tolist(),
+            result.ties.tolist(),
+        ):
+            score = dict(zip(houses, totals))
+            if tie:
+                house = get_winning_house(
+                    score=score, rng=record_rng(seed=seed, respondent_id=respondent_id)
+                )
+            else:
+                house = houses[winner]
+            METRICS.count_house(house=house)
+            if stats is not None:
+                stats.record(house=house, tie=tie)
+            results.append(ScoredSheet(respondent_id, house, score))
+
+        return results
@@ -1,20 +1,18 @@
 """This module tests that the data used for the sorting hat are correct."""
 
-import csv
-from collections import defaultdict
-from importlib import resources
+from sorting_hat.model import House
+from sorting_hat.referential import QuizReferential
 
 
 def test_weights_sum_to_one() -> None:
     """Tests that the weights for each question sum to 1."""
-    weights_per_answer = defaultdict(float)
+    referential = QuizReferential.from_package()
 
-    with resources.open_text(
-        package="sorting_hat.data", resource="weights.csv", encoding="utf-8"
-    ) as f:
-        reader = csv.DictReader(f=f)
-        for row in reader:
-            key = row["question_id"] + row["variation_id"] + row["answer_id"]
-            weights_per_answer[key] += float(row["weight"])
+    assert set(map(sum, referential.weights.values())) == {1.0}
 
-    assert set(weights_per_answer.values()) == {1.0}
+
+def test_houses_are_known() -> None:
+    """Tests that the weights are given to the four houses of the House enum."""
+    referential = QuizReferential.from_package()
+
+    assert referential.houses == tuple(House)
@@ -0,0 +1,67 @@
+"""This module tests the exact distribution of the houses."""
+
+import itertools
+from fractions import Fraction
+
+from sorting_hat.analyze import analyze
+from sorting_hat.referential import load_referential
+
+CHOSEN_VARIATIONS = [
+    {"question_id": "1", "variation_id": "2"},
+    {"question_id": "3", "variation_id": "1"},
+    {"question_id": "5", "variation_id": "4"},
+    {"question_id": "6", "variation_id": "3"},
+]
+
+
+def test_analyze_matches_brute_force() -> None:
+    """Tests the probabilities against every combination of answers."""
+    referential = load_referential()
+    keys = [
+        (variation["question_id"], variation["variation_id"])
+        for variation in CHOSEN_VARIATIONS
+    ]
+    answers = [range(1, len(referential.answer_texts[key]) + 1) for key in keys]
+    combinations = list(itertools.product(*answers))
+    expected = dict.fromkeys(referential.houses, Fraction(0))
+
+    for combination in combinations:
+        score = [Fraction(0)] * len(referential.houses)
+        for (question_id, variation_id), answer_id in zip(keys, combination):
+            vector = referential.weights[(question_id, variation_id, str(answer_id))]
+            score = [s + Fraction(repr(w)) for s, w in zip(score, vector)]
+        best_houses = [
+            house
+            for house, value in zip(referential.houses, score)
+            if value == max(score)
+        ]
+        for house in best_houses:
+            expected[house] += Fraction(1, len(combinations) * len(best_houses))
+
+    result = analyze(referential=referential, chosen_variations=CHOSEN_VARIATIONS)
+
+    assert result.probabilities == expected
+
+
+def test_analyze_sums_to_one() -> None:
+    """Tests that the probabilities of the houses sum to 1 in every mode."""
+    referential = load_referential()
+
+    for long_quiz in (False, True):
+        result = analyze(referential=referential, long_quiz=long_quiz)
+        assert sum(result.probabilities.values()) == 1
+        assert sum(result.from_ties.values()) == result.tie_probability
+
+
+def test_analyze_with_priors() -> None:
+    """Tests that a certain answer gives a certain house."""
+    referential = load_referential()
+    chosen_variations = [{"question_id": "1", "variation_id": "1"}]
+
+    result = analyze(
+        referential=referential,
+        chosen_variations=chosen_variations,
+        priors={("1", "1"): [1, 0, 0, 0]},
+    )
+
+    assert result.probabilities["serdaigle"] == 1
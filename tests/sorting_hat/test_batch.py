@@ -0,0 +1,71 @@
+"""This module tests the headless scoring of answer sheets."""
+
+import io
+from collections import defaultdict
+
+import pytest
+
+from sorting_hat.batch import read_answers, score_answers, score_file
+from sorting_hat.referential import load_referential
+from sorting_hat.scoring import update_score
+
+ANSWERS_CSV = """respondent_id,question_id,variation_id,answer_id
+alice,1,1,1
+bob,1,2,3
+alice,2,1,2
+bob,2,3,1
+alice,3,1,4
+"""
+
+
+def test_score_answers_matches_update_score() -> None:
+    """Tests that the totals are the same as the ones of the interactive quiz."""
+    referential = load_referential()
+    rows = list(read_answers(f=io.StringIO(ANSWERS_CSV), fmt="csv"))
+
+    results = score_answers(answers=rows, referential=referential, seed=1)
+
+    assert [result.respondent_id for result in results] == ["alice", "bob"]
+    for result in results:
+        score = defaultdict(float)
+        for respondent_id, question_id, variation_id, answer_id in rows:
+            if respondent_id == result.respondent_id:
+                answer = {
+                    "question_id": question_id,
+                    "variation_id": variation_id,
+                    "answer_id": answer_id,
+                }
+                update_score(
+                    referential=referential, answer=answer, current_score=score
+                )
+        assert result.scores == score
+        assert score[result.house] == max(score.values())
+
+
+def test_score_file_is_reproducible_with_a_seed() -> None:
+    """Tests that the same seed gives the same output, in CSV or in JSONL."""
+    referential = load_referential()
+    outputs = []
+
+    for _ in range(2):
+        output = io.StringIO()
+        score_file(
+            input_file=io.StringIO(ANSWERS_CSV),
+            output_file=output,
+            referential=referential,
+            input_format="csv",
+            output_format="jsonl",
+            seed=42,
+        )
+        outputs.append(output.getvalue())
+
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0].splitlines()) == 2
+
+
+def test_score_answers_rejects_unknown_answers() -> None:
+    """Tests that an answer missing from the referential raises an error."""
+    with pytest.raises(ValueError, match="Unknown answer"):
+        score_answers(
+            answers=[("alice", "1", "1", "9")], referential=load_referential()
+        )
@@ -0,0 +1,45 @@
+"""This module tests the compiled form of the referential."""
+
+from pathlib import Path
+
+import pytest
+
+from sorting_hat.cache import dump, get_cache_path, hash_package, load, load_compiled
+from sorting_hat.referential import QuizReferential
+
+
+def test_dump_and_load_give_the_same_referential() -> None:
+    """Tests that nothing is lost when packing the referential."""
+    referential = QuizReferential.from_package()
+    digest = hash_package()
+
+    loaded = load(content=dump(referential=referential, digest=digest), digest=digest)
+
+    for name in QuizReferential.__slots__:
+        assert getattr(loaded, name) == getattr(referential, name)
+
+
+def test_stale_or_corrupted_content_is_rejected() -> None:
+    """Tests that a compiled referential built from other CSV files is not used."""
+    content = dump(referential=QuizReferential.from_package(), digest=b"0" * 32)
+
+    assert load(content=content, digest=hash_package()) is None
+    with pytest.raises(ValueError):
+        load(content=content[:-1])
+
+
+def test_load_compiled_builds_the_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that the cache is built on first use and rebuilt when stale."""
+    monkeypatch.setenv("SORTING_HAT_CACHE_DIR", str(tmp_path))
+    path = get_cache_path()
+
+    referential = load_compiled()
+    assert path.exists()
+
+    path.write_bytes(dump(referential=referential, digest=b"0" * 32))
+    loaded = load_compiled()
+    for name in QuizReferential.__slots__:
+        assert getattr(loaded, name) == getattr(referential, name)
+    assert load(content=path.read_bytes(), digest=hash_package()) is not None
@@ -0,0 +1,59 @@
+"""This module tests the calibration of the weights."""
+
+import io
+from fractions import Fraction
+
+from sorting_hat.calibrate import IncrementalEvaluator, calibrate, write_weights
+from sorting_hat.referential import QuizReferential, load_referential
+
+
+def test_incremental_evaluation_matches_a_full_evaluation() -> None:
+    """Tests that moving weight gives the distribution of a new evaluation."""
+    referential = load_referential()
+    evaluator = IncrementalEvaluator(
+        referential=referential, scale=10, respondents=2000, seed=1
+    )
+    key = ("1", "1", "3")
+    expected = evaluator.distribution_after(key=key, source=3, destination=0, amount=4)
+    evaluator.move(key=key, source=3, destination=0, amount=4)
+
+    weights = dict(referential.weights)
+    weights[key] = (0.4, 0.0, 0.0, 0.6)
+    moved = QuizReferential.from_indexes(
+        variation_texts=referential.variation_texts,
+        answer_texts=referential.answer_texts,
+        houses=referential.houses,
+        weights=weights,
+    )
+    fresh = IncrementalEvaluator(referential=moved, scale=10, respondents=2000, seed=1)
+
+    assert evaluator.distribution() == expected == fresh.distribution()
+    assert evaluator.shares == fresh.shares
+
+
+def test_calibration_gets_closer_to_the_target() -> None:
+    """Tests that the calibrated weights still sum to one and reach the target."""
+    result = calibrate(
+        referential=load_referential(),
+        target={"serpentard": 0.2},
+        steps=300,
+        respondents=2000,
+    )
+
+    def error(probabilities: dict[str, Fraction]) -> float:
+        """Gets the squared distance to the target."""
+        return sum(
+            (float(probabilities[house]) - share) ** 2
+            for house, share in result.target.items()
+        )
+
+    assert result.target["gryffondor"] == result.target["serdaigle"] == 0.8 / 3
+    assert error(result.after.probabilities) < error(result.before.probabilities)
+    assert result.changed_answers > 0
+    for vector in result.referential.weights.values():
+        assert sum(map(Fraction, map(repr, vector))) == 1
+        assert min(vector) >= 0
+
+    f = io.StringIO()
+    write_weights(referential=result.referential, f=f)
+    assert len(f.getvalue().splitlines()) == 1 + 4 * len(result.referential.weights)
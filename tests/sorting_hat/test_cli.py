@@ -0,0 +1,61 @@
+"""This module tests the commands available after installing the library."""
+
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from sorting_hat.cli import cli
+
+
+def test_help_does_not_import_the_interactive_prompt() -> None:
+    """Tests that `sorting-hat --help` does not import the interactive prompt."""
+    code = (
+        "import sys\n"
+        "from sorting_hat.cli import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in "
+        "('questionary', 'prompt_toolkit') or m == 'sorting_hat.render'))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert process.stdout.splitlines()[-1] == "[]"
+
+
+def test_score_command() -> None:
+    """Tests that the score command reads answer sheets from the standard input."""
+    answers = "respondent_id,question_id,variation_id,answer_id\nalice,1,1,1\n"
+
+    result = CliRunner().invoke(
+        cli, ["score", "--input-format", "csv", "--seed", "1"], input=answers
+    )
+
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1].startswith("alice,serdaigle,")
+
+
+def test_score_command_with_the_numpy_engine() -> None:
+    """Tests that both engines write the same results."""
+    pytest.importorskip("numpy")
+    answers = (
+        "respondent_id,question_id,variation_id,answer_id\n"
+        "alice,1,1,1\nbob,1,2,3\nalice,2,1,2\nbob,2,3,1\n"
+    )
+
+    results = [
+        CliRunner().invoke(
+            cli,
+            ["score", "--input-format", "csv", "--seed", "1", "--engine", engine],
+            input=answers,
+        )
+        for engine in ("python", "numpy")
+    ]
+
+    assert [result.exit_code for result in results] == [0, 0]
+    assert results[0].output == results[1].output
@@ -0,0 +1,63 @@
+"""This module tests the early termination of the quiz."""
+
+from random import Random
+
+import pytest
+
+from sorting_hat.early_stop import EarlyStop, get_decided_house, simulate_savings
+from sorting_hat.referential import load_referential
+from sorting_hat.scoring import get_best_houses
+
+
+@pytest.mark.parametrize("information_gain", [False, True])
+def test_stopping_early_gives_the_same_house(information_gain: bool) -> None:
+    """Tests that the questions not asked would not have changed the house."""
+    referential = load_referential()
+    rng = Random(3)
+    chosen_variations = [
+        {"question_id": question_id, "variation_id": variation_id}
+        for question_id, variation_id in referential.variations
+    ]
+
+    for _ in range(50):
+        answers = {
+            key: str(rng.randint(1, len(texts)))
+            for key, texts in referential.answer_texts.items()
+        }
+
+        full_score = [0.0] * len(referential.houses)
+        for key, answer_id in answers.items():
+            vector = referential.weights[(*key, answer_id)]
+            full_score = [value + gain for value, gain in zip(full_score, vector)]
+        best_houses = get_best_houses(score=dict(zip(referential.houses, full_score)))
+
+        stop = EarlyStop(
+            referential=referential,
+            chosen_variations=chosen_variations,
+            information_gain=information_gain,
+        )
+        score = [0.0] * len(referential.houses)
+        while (variation := stop.next_variation(score=score)) is not None:
+            key = (variation["question_id"], variation["variation_id"])
+            vector = referential.weights[(*key, answers[key])]
+            score = [value + gain for value, gain in zip(score, vector)]
+
+        if stop.remaining:
+            decided = get_decided_house(
+                score=score,
+                max_remaining=stop.max_remaining,
+                min_remaining=stop.min_remaining,
+            )
+            assert best_houses == [referential.houses[decided]]
+
+
+def test_simulated_savings() -> None:
+    """Tests that some questions are saved and that the simulation is seeded."""
+    savings = simulate_savings(referential=load_referential(), respondents=200, seed=1)
+
+    assert savings.questions == 7
+    assert savings.saved > 0
+    assert savings.saved == pytest.approx(savings.questions - savings.asked)
+    assert savings == simulate_savings(
+        referential=load_referential(), respondents=200, seed=1
+    )
@@ -0,0 +1,87 @@
+"""This module tests the metrics recorded during a sorting."""
+
+import io
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from click.testing import CliRunner
+
+from sorting_hat.batch import score_answers
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.cli import cli
+from sorting_hat.metrics import METRICS
+from sorting_hat.referential import load_referential
+from sorting_hat.server import SortingHatServer
+from sorting_hat.simulate import simulate_to_file
+from sorting_hat.sorting_hat import SortingHat
+
+
+@pytest.fixture
+def metrics() -> Iterator[None]:
+    """Disables and resets the metrics after a test."""
+    yield
+    METRICS.enabled = False
+    METRICS.report = None
+    METRICS.reset()
+
+
+def test_phases_are_only_recorded_when_enabled(metrics: None) -> None:
+    """Tests the call counts of the phases and the Prometheus report."""
+    referential = load_referential()
+    ChooseVariations(referential=referential).run()
+    assert not METRICS.calls
+
+    METRICS.enabled = True
+    for variation in ChooseVariations(referential=referential).run():
+        SortingHat._update_score(
+            referential=referential,
+            answer={**variation, "answer_id": "1"},
+            current_score=defaultdict(float),
+        )
+    METRICS.count_house(house="serdaigle")
+
+    assert METRICS.calls == {"choose_variations": 1, "update_score": 7}
+    report = METRICS.to_prometheus()
+    assert 'sorting_hat_phase_calls_total{phase="update_score"} 7' in report
+    assert 'sorting_hat_houses_total{house="serdaigle"} 1' in report
+
+
+def test_the_profile_option_writes_a_json_report(metrics: None, tmp_path: Path) -> None:
+    """Tests that the report is written once the command is done."""
+    path = tmp_path / "profile.json"
+
+    result = CliRunner().invoke(cli, ["--profile", str(path), "analyze", "--chosen"])
+
+    assert result.exit_code == 0
+    assert json.loads(path.read_text())["phases"]["choose_variations"]["calls"] == 1
+
+
+def test_houses_are_counted_on_every_path(metrics: None) -> None:
+    """Tests that the batch scoring, the server and the simulation count houses."""
+    METRICS.enabled = True
+    referential = load_referential()
+
+    results = score_answers(
+        answers=[("alice", "1", "1", "1"), ("bob", "1", "1", "2")],
+        referential=referential,
+        seed=1,
+    )
+    assert sum(METRICS.houses.values()) == 2
+    assert METRICS.houses[results[0].house] >= 1
+
+    server = SortingHatServer(referential=referential)
+    _, session = server.dispatch(method="POST", path="/sessions", body=b"")
+    path = f"/sessions/{session['session_id']}"
+    for _ in range(session["number_of_questions"]):
+        server.dispatch(
+            method="POST", path=f"{path}/answers", body=b'{"answer_id": "1"}'
+        )
+    server.dispatch(method="GET", path=f"{path}/result", body=b"")
+    assert sum(METRICS.houses.values()) == 3
+
+    # The houses drawn by the worker processes are counted by the parent.
+    simulate_to_file(f=io.StringIO(), n=50, seed=3, workers=2)
+    assert sum(METRICS.houses.values()) == 53
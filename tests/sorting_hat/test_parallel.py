@@ -0,0 +1,76 @@
+"""This module tests the scoring of answer sheets on several cores."""
+
+import io
+import random
+from pathlib import Path
+
+from sorting_hat.batch import score_file
+from sorting_hat.parallel import score_file_parallel, split_file
+from sorting_hat.referential import load_referential
+
+
+def _write_answers(path: Path, number_of_respondents: int, shuffled: bool) -> None:
+    """Writes random answer sheets to a CSV file.
+
+    Args:
+        path: The path of the file to write.
+        number_of_respondents: The number of answer sheets.
+        shuffled: A flag to interleave the answers of the respondents.
+    """
+    rng = random.Random(0)
+    keys = sorted(load_referential().weights)
+    rows = [
+        f"r{i},{question_id},{variation_id},{answer_id}\n"
+        for i in range(number_of_respondents)
+        for question_id, variation_id, answer_id in rng.sample(keys, k=7)
+    ]
+    if shuffled:
+        rng.shuffle(rows)
+    path.write_text(
+        "respondent_id,question_id,variation_id,answer_id\n" + "".join(rows)
+    )
+
+
+def test_split_file_keeps_respondents_together(tmp_path: Path) -> None:
+    """Tests that no boundary falls between two rows of the same respondent."""
+    path = tmp_path / "answers.csv"
+    _write_answers(path=path, number_of_respondents=500, shuffled=False)
+
+    _, ranges = split_file(path=str(path), fmt="csv", number_of_chunks=8)
+    content = path.read_bytes()
+
+    assert len(ranges) == 8
+    for _, end in ranges[:-1]:
+        previous_row = content[:end].splitlines()[-1]
+        next_row = content[end:].splitlines()[0]
+        assert previous_row.split(b",")[0] != next_row.split(b",")[0]
+
+
+def test_parallel_results_match_a_single_process(tmp_path: Path) -> None:
+    """Tests that several workers give exactly the same output as one process."""
+    for shuffled in (False, True):
+        path = tmp_path / "answers.csv"
+        _write_answers(path=path, number_of_respondents=2_000, shuffled=shuffled)
+
+        expected = io.StringIO()
+        with open(path, encoding="utf-8") as f:
+            score_file(
+                input_file=f,
+                output_file=expected,
+                referential=load_referential(),
+                input_format="csv",
+                output_format="csv",
+                seed=7,
+            )
+
+        output = io.StringIO()
+        score_file_parallel(
+            path=str(path),
+            output_file=output,
+            input_format="csv",
+            output_format="csv",
+            workers=2,
+            seed=7,
+        )
+
+        assert output.getvalue() == expected.getvalue()
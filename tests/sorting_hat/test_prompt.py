@@ -0,0 +1,63 @@
+"""This module tests the prompts asking the questions of the quiz."""
+
+import io
+import random
+
+import pytest
+
+from sorting_hat.batch import score_answers
+from sorting_hat.prompt import Prompt, QuizCancelled, ScriptedPrompt, StdinPrompt
+from sorting_hat.referential import load_referential
+from sorting_hat.render import get_welcome_message
+from sorting_hat.sorting_hat import SortingHat
+
+
+def test_a_scripted_sorting_returns_its_result() -> None:
+    """Tests that the real quiz runs without anyone and gives its result back."""
+    referential = load_referential()
+    stream = io.BytesIO()
+
+    result = SortingHat(
+        referential=referential,
+        rng=random.Random(0),
+        prompt=ScriptedPrompt(rng=random.Random(1), stream=stream),
+    ).run()
+
+    assert len(result.answers) == 7
+    (expected,) = score_answers(
+        answers=[("alice", *answer.values()) for answer in result.answers],
+        referential=referential,
+    )
+    assert result.scores == expected.scores
+    # The result screen was rendered into the stream.
+    welcome_message = get_welcome_message(house=result.house)
+    assert welcome_message in stream.getvalue().decode("utf-8")
+
+
+def test_the_stdin_prompt_asks_again_until_a_valid_answer() -> None:
+    """Tests the numbered answers read from a stream."""
+    output = io.StringIO()
+    prompt = StdinPrompt(input_stream=io.StringIO("0\nabc\n2\n"), output_stream=output)
+
+    assert prompt.ask(message="Question ?", choices=["Oui", "Non"]) == 2
+    assert "  2. Non" in output.getvalue()
+    assert output.getvalue().count("Ta réponse (1-2)") == 3
+
+    with pytest.raises(QuizCancelled):
+        prompt.ask(message="Question ?", choices=["Oui", "Non"])
+
+
+def test_leaving_the_quiz_raises_instead_of_exiting() -> None:
+    """Tests that a quiz cut short lets the caller decide what to do."""
+    with pytest.raises(QuizCancelled):
+        SortingHat(prompt=ScriptedPrompt(answers=[1, 1, 1])).run()
+
+
+def test_a_backend_without_ask_cannot_be_created() -> None:
+    """Tests that a backend must implement ask before any quiz starts."""
+
+    class ShowOnly(Prompt):
+        """A backend which forgot to implement ask."""
+
+    with pytest.raises(TypeError, match="ask"):
+        ShowOnly()
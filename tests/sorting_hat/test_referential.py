@@ -0,0 +1,58 @@
+"""This module tests the indexed referential of the sorting hat."""
+
+import gc
+import tracemalloc
+
+from sorting_hat.model import House
+from sorting_hat.referential import QuizReferential, _load, load_referential
+
+
+def test_referential_indexes() -> None:
+    """Tests that every variation has a text, answers and weights for each answer."""
+    referential = QuizReferential.from_package()
+
+    assert set(referential.houses) == {
+        "gryffondor",
+        "poufsouffle",
+        "serdaigle",
+        "serpentard",
+    }
+    assert set(referential.variation_texts) == set(referential.answer_texts)
+
+    for (question_id, variation_id), answer_text in referential.answer_texts.items():
+        for answer_id in range(1, len(answer_text) + 1):
+            vector = referential.weights[(question_id, variation_id, str(answer_id))]
+            assert len(vector) == len(referential.houses)
+
+
+def test_load_referential_is_cached() -> None:
+    """Tests that the referential is only built once per process."""
+    assert load_referential() is load_referential()
+
+
+def test_the_referential_is_compact() -> None:
+    """Tests that the referential takes several times less memory than its rows."""
+    _load(package="sorting_hat.data", filename="questions.csv")  # Warms the imports.
+
+    gc.collect()
+    tracemalloc.start()
+    rows = [
+        _load(package="sorting_hat.data", filename=filename)
+        for filename in ("questions.csv", "answers.csv", "weights.csv")
+    ]
+    rows_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    gc.collect()
+    tracemalloc.start()
+    referential = QuizReferential(*rows)
+    del rows
+    gc.collect()
+    referential_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert referential_size * 3 < rows_size
+    assert isinstance(referential.houses[0], House)
+    # The identical weight vectors are shared.
+    vectors = {id(vector) for vector in referential.weights.values()}
+    assert len(vectors) * 4 < len(referential.weights)
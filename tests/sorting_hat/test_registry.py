@@ -0,0 +1,156 @@
+"""This module tests the registry of quiz packs."""
+
+import asyncio
+import json
+import shutil
+import threading
+from importlib import resources
+from pathlib import Path
+
+import pytest
+
+from sorting_hat.choose_variations import ChooseVariations
+from sorting_hat.referential import QuizReferential
+from sorting_hat.registry import FILENAMES, Pack, PackRegistry, estimate_size
+from sorting_hat.server import HTTPError, SortingHatServer
+
+
+@pytest.fixture
+def packs_dir(tmp_path: Path) -> Path:
+    """Creates a directory with two packs, copies of the default referential."""
+    data = resources.files("sorting_hat.data")
+    for name in ("saison", "anglais"):
+        (tmp_path / name).mkdir()
+        for filename in FILENAMES:
+            shutil.copyfile(data.joinpath(filename), tmp_path / name / filename)
+    (tmp_path / "incomplete").mkdir()
+    return tmp_path
+
+
+def test_the_packs_are_found(packs_dir: Path) -> None:
+    """Tests that the default pack and the packs of a directory are found."""
+    registry = PackRegistry(extra_dirs=[packs_dir])
+
+    assert list(registry.packs) == ["default", "anglais", "saison"]
+    assert registry.packs["saison"].location == packs_dir / "saison"
+    assert not registry.packs["saison"].builtin
+
+    with pytest.raises(ValueError, match="Unknown pack 'incomplete'"):
+        registry.get(name="incomplete")
+
+
+def test_the_least_recently_used_pack_is_evicted(packs_dir: Path) -> None:
+    """Tests that the cache keeps the packs in use and counts its lookups."""
+    registry = PackRegistry(extra_dirs=[packs_dir], max_packs=2)
+
+    saison = registry.get(name="saison")
+    assert registry.get(name="saison") is saison
+    registry.get(name="anglais")
+    registry.get(name="saison")
+    registry.get(name="default")
+
+    stats = registry.stats()
+    assert stats["loaded"] == ["saison", "default"]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 3, 1)
+    assert stats["bytes"] > 0
+    assert set(stats["load_seconds"]) == {"saison", "anglais", "default"}
+
+
+def test_packs_can_be_replaced_while_they_are_looked_up(
+    packs_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that a swap from another thread keeps the cache consistent."""
+    registry = PackRegistry(extra_dirs=[packs_dir], max_packs=2)
+    new = QuizReferential.from_directory(directory=packs_dir / "saison")
+    stop = threading.Event()
+
+    def swap() -> None:
+        """Replaces a pack until stopped."""
+        while not stop.is_set():
+            registry.replace(name="saison", referential=new)
+
+    thread = threading.Thread(target=swap)
+    thread.start()
+    try:
+        for _ in range(20):
+            for name in ("saison", "anglais", "default"):
+                registry.get(name=name)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert len(registry._loaded) == 2
+    assert registry.size == sum(size for _, size in registry._loaded.values())
+
+    # A pack replaced while it is read is read again, not kept out of date.
+    registry = PackRegistry(extra_dirs=[packs_dir])
+    from_directory = QuizReferential.from_directory
+    reads = []
+
+    def read_and_swap(directory: Path) -> QuizReferential:
+        """Reads a pack, which is replaced during the first read."""
+        reads.append(directory)
+        if len(reads) == 1:
+            registry.replace(name="anglais", referential=new)
+        return from_directory(directory=directory)
+
+    monkeypatch.setattr(QuizReferential, "from_directory", read_and_swap)
+    registry.get(name="anglais")
+    assert len(reads) == 2
+    assert registry.size == estimate_size(referential=registry.get(name="anglais"))
+
+
+def test_a_reload_of_the_default_pack_outlives_its_eviction(
+    packs_dir: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tests that the default pack is read again as reloaded once evicted."""
+    root = tmp_path_factory.mktemp("package")
+    (root / "copie_data").mkdir()
+    (root / "copie_data" / "__init__.py").touch()
+    data = resources.files("sorting_hat.data")
+    for filename in FILENAMES:
+        shutil.copyfile(data.joinpath(filename), root / "copie_data" / filename)
+    monkeypatch.syspath_prepend(str(root))
+    monkeypatch.setenv("SORTING_HAT_NO_CACHE", "1")
+    registry = PackRegistry(extra_dirs=[packs_dir], max_packs=2)
+    registry.packs["default"] = Pack("default", "copie_data", builtin=True)
+    original = registry.get()
+
+    path = root / "copie_data" / "weights.csv"
+    path.write_text(
+        path.read_text(encoding="utf-8").replace(
+            "1,1,1,gryffondor,0", "1,1,1,gryffondor,9"
+        ),
+        encoding="utf-8",
+    )
+    reloaded = QuizReferential.from_package(package="copie_data")
+    assert reloaded.weights != original.weights
+    assert registry.replace(name="default", referential=reloaded)
+    registry.get(name="saison")
+    registry.get(name="anglais")
+    assert "default" not in registry.stats()["loaded"]
+
+    assert registry.get().weights == reloaded.weights
+
+
+def test_a_pack_can_be_chosen(packs_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the quiz and the server use the pack asked for."""
+    registry = PackRegistry(extra_dirs=[packs_dir])
+    monkeypatch.setattr("sorting_hat.registry.get_registry", lambda: registry)
+
+    chosen_variations = ChooseVariations(pack="saison")
+    assert chosen_variations.referential is registry.get(name="saison")
+
+    server = SortingHatServer(referential=registry.get(), registry=registry)
+    _, session = server.dispatch(
+        method="POST", path="/sessions", body=json.dumps({"pack": "anglais"}).encode()
+    )
+    assert server.sessions.get(session["session_id"]).pack == "anglais"
+    assert "anglais" in registry.stats()["loaded"]
+
+    for body in (b'{"pack": ["anglais"]}', b'{"pack": 1}'):
+        with pytest.raises(HTTPError, match="string") as error:
+            asyncio.run(server.respond(method="POST", path="/sessions", body=body))
+        assert error.value.status == 400
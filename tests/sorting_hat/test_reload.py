@@ -0,0 +1,174 @@
+"""This module tests the reload of the quiz data in long-running processes."""
+
+import logging
+import os
+import shutil
+from importlib import resources
+from pathlib import Path
+
+import pytest
+
+from sorting_hat.referential import QuizReferential, load_referential
+from sorting_hat.reload import ReferentialWatcher, validate_referential
+from sorting_hat.server import HTTPError, SortingHatServer
+from sorting_hat.session import SessionStore
+from sorting_hat.stream import StreamScorer
+
+
+def _edit(path: Path, old: str, new: str) -> None:
+    """Replaces a text in a file and moves its modification time forward.
+
+    Args:
+        path: The file.
+        old: The text to replace.
+        new: The replacement.
+    """
+    stat = path.stat()
+    path.write_text(path.read_text(encoding="utf-8").replace(old, new, 1), "utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_the_watcher_swaps_valid_data_only(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Tests that a typo fix is swapped in and that invalid weights are not."""
+    data = resources.files("sorting_hat.data")
+    for filename in ("questions.csv", "answers.csv", "weights.csv"):
+        shutil.copy(str(data.joinpath(filename)), tmp_path / filename)
+    reloaded: list[tuple[QuizReferential, str]] = []
+    watcher = ReferentialWatcher(
+        name="test",
+        directory=tmp_path,
+        on_reload=lambda referential, version: reloaded.append((referential, version)),
+    )
+    first_version = watcher.version
+    assert not watcher.check()
+
+    _edit(tmp_path / "answers.csv", '"Le ou la Sage."', '"Le Sage ou la Sage."')
+    with caplog.at_level(logging.INFO, logger="sorting_hat.reload"):
+        assert watcher.check()
+    ((referential, version),) = reloaded
+    assert referential.answer_texts[("1", "1")][0] == "Le Sage ou la Sage."
+    assert version == watcher.version != first_version
+    assert f"version {version} (was {first_version}), built in" in caplog.text
+
+    _edit(tmp_path / "weights.csv", "1,1,1,gryffondor,0", "1,1,1,gryffondor,0.5")
+    with caplog.at_level(logging.INFO, logger="sorting_hat.reload"):
+        assert not watcher.check()
+        assert not watcher.check()
+    assert len(reloaded) == 1
+    assert watcher.failures == 1
+    assert "the weights of 1/1/1 sum to 1.5" in caplog.text
+
+    with pytest.raises(ValueError, match="1/1/1 has no weights"):
+        weights = dict(referential.weights)
+        del weights[("1", "1", "1")]
+        validate_referential(
+            referential=QuizReferential.from_indexes(
+                variation_texts=referential.variation_texts,
+                answer_texts=referential.answer_texts,
+                houses=referential.houses,
+                weights=weights,
+            )
+        )
+
+
+def test_a_session_keeps_the_referential_it_started_with() -> None:
+    """Tests the versions of the server, until the old one is dropped."""
+    now = [0.0]
+    server = SortingHatServer(
+        referential=load_referential(),
+        sessions=SessionStore(ttl=60.0, clock=lambda: now[0]),
+    )
+    _, old = server.dispatch(method="POST", path="/sessions", body=b"")
+    old_path = f"/sessions/{old['session_id']}/question"
+    _, question = server.dispatch(method="GET", path=old_path, body=b"")
+
+    referential = load_referential()
+    server.referential = QuizReferential.from_indexes(
+        variation_texts={key: "Reloaded" for key in referential.variation_texts},
+        answer_texts=referential.answer_texts,
+        houses=referential.houses,
+        weights=referential.weights,
+    )
+    _, new = server.dispatch(method="POST", path="/sessions", body=b"")
+    new_path = f"/sessions/{new['session_id']}/question"
+    assert server.dispatch(method="GET", path=old_path, body=b"")[1] == question
+    assert server.dispatch(method="GET", path=new_path, body=b"")[1]["text"] == (
+        "Reloaded"
+    )
+
+    # The old version is dropped with the last session which could use it.
+    now[0] = 59.0
+    server.dispatch(method="GET", path=new_path, body=b"")
+    now[0] = 61.0
+    server.dispatch(method="POST", path="/sessions", body=b"")
+    with pytest.raises(HTTPError, match="Unknown session"):
+        server.dispatch(method="GET", path=old_path, body=b"")
+    assert [referential for referential, _ in server._versions.values()] == [
+        server.referential
+    ]
+
+
+def test_a_pending_respondent_is_scored_with_their_referential() -> None:
+    """Tests that a respondent in the middle of a quiz is not affected by a swap."""
+    referential = load_referential()
+    scorer = StreamScorer(referential=referential, seed=3)
+    questions = sorted({question_id for question_id, _ in referential.variations})
+    answers = {
+        respondent: [(respondent, question_id, "1", "1") for question_id in questions]
+        for respondent in ("before", "after")
+    }
+    assert scorer.add(*answers["before"][0]) is None
+
+    scorer.reload(
+        referential=QuizReferential.from_indexes(
+            variation_texts=referential.variation_texts,
+            answer_texts=referential.answer_texts,
+            houses=referential.houses,
+            weights={
+                key: tuple(reversed(vector))
+                for key, vector in referential.weights.items()
+            },
+        )
+    )
+    results = {}
+    for respondent in ("after", "before"):
+        for answer in answers[respondent][-len(questions) + 1 :]:
+            results[respondent] = scorer.add(*answer)
+    after = scorer.add(*answers["after"][0])
+    assert results["after"] is None
+    assert list(after.scores.values()) == list(
+        reversed(results["before"].scores.values())
+    )
+
+
+def test_an_evicted_respondent_starts_again_with_the_new_referential() -> None:
+    """Tests that a respondent back after the timeout is scored with the new data."""
+    referential = load_referential()
+    swapped = QuizReferential.from_indexes(
+        variation_texts=referential.variation_texts,
+        answer_texts=referential.answer_texts,
+        houses=referential.houses,
+        # Other weights, at other positions.
+        weights={
+            key: tuple(reversed(vector))
+            for key, vector in reversed(referential.weights.items())
+        },
+    )
+    now = [0.0]
+    scorer = StreamScorer(
+        referential=referential, idle_timeout=10.0, seed=3, clock=lambda: now[0]
+    )
+    questions = sorted({question_id for question_id, _ in referential.variations})
+    answers = [("late", question_id, "1", "1") for question_id in questions]
+    assert scorer.add(*answers[0]) is None
+
+    scorer.reload(referential=swapped)
+    now[0] = 60.0
+    for answer in answers:
+        result = scorer.add(*answer)
+
+    expected = StreamScorer(referential=swapped, seed=3).run(answers)
+    assert scorer.evicted == 1
+    assert result == next(expected)
@@ -0,0 +1,65 @@
+"""This module tests the screen announcing the house."""
+
+import io
+import subprocess
+import sys
+
+import pytest
+
+from sorting_hat.model import House
+from sorting_hat.render import (
+    get_house_art,
+    get_welcome_message,
+    render_result,
+    write_result,
+)
+
+
+class CountingStream(io.BytesIO):
+    """A binary stream counting the writes."""
+
+    writes = 0
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        """Counts a write."""
+        self.writes += 1
+        return super().write(data)
+
+
+def test_the_result_screen_is_written_at_once() -> None:
+    """Tests that the banner, the art and the welcome message are in one write."""
+    stream = CountingStream()
+
+    write_result(house="serpentard", stream=stream)
+
+    assert stream.writes == 1
+    content = stream.getvalue()
+    assert content == render_result(house="serpentard")
+    assert get_house_art(house="serpentard") in content
+    assert "La maison Serpentard te souhaite la bienvenue !".encode() in content
+    assert content.endswith("Welcome my friend ! ----------\n\n".encode())
+
+
+def test_an_unknown_house_is_rejected() -> None:
+    """Tests that only the four houses can be rendered."""
+    with pytest.raises(ValueError, match="should be one of"):
+        render_result(house="durmstrang")
+
+
+def test_the_renderer_does_not_import_the_quiz() -> None:
+    """Tests that the renderer only needs the model, and knows every house."""
+    code = (
+        "import sys\n"
+        "import sorting_hat.render\n"
+        "print(sorted(m for m in sys.modules if m.startswith('sorting_hat.')))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert process.stdout.splitlines()[-1] == str(
+        ["sorting_hat.metrics", "sorting_hat.model", "sorting_hat.render"]
+    )
+    for house in House:
+        assert get_welcome_message(house=house.value)
+        assert get_house_art(house=house.value)
@@ -0,0 +1,356 @@
+"""This module tests the binary log of the sortings and its queries."""
+
+import asyncio
+import json
+import shutil
+import threading
+from importlib import resources
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+from click.testing import CliRunner
+
+from sorting_hat.cli import cli
+from sorting_hat.referential import QuizReferential, load_referential
+from sorting_hat.registry import FILENAMES, PackRegistry
+from sorting_hat.result_log import ResultLog, ResultLogReader, hash_respondent
+from sorting_hat.server import HTTPError, SortingHatServer
+from sorting_hat.simulate import Simulator
+
+
+def test_the_queries_match_a_scan_of_the_sortings(tmp_path: Path) -> None:
+    """Tests the indexes against the sortings, across segments and reopenings."""
+    referential = load_referential()
+    sortings = list(Simulator(referential=referential, seed=5).generate(n=2500))
+    packs = ["default", "saison"]
+
+    for start, end in ((0, 1000), (1000, 2500)):
+        with ResultLog(
+            directory=tmp_path,
+            referential=referential,
+            segment_records=700,
+            block_records=64,
+        ) as log:
+            for i in range(start, end):
+                sorting = sortings[i]
+                log.append(
+                    respondent_id=sorting.respondent_id,
+                    answers=sorting.answers,
+                    house=sorting.house,
+                    scores=sorting.scores,
+                    pack=packs[i % 2],
+                    timestamp=1_700_000_000 + i,
+                )
+
+    reader = ResultLogReader(directory=tmp_path)
+    assert len(reader) == 2500
+    assert len(reader.segments) == 4
+
+    since, until = 1_700_000_000 + 150.5, 1_700_000_000 + 2100
+    expected = [
+        i
+        for i, sorting in enumerate(sortings)
+        if sorting.house == "serpentard" and since <= 1_700_000_000 + i < until
+    ]
+    assert reader.count(house="serpentard", since=since, until=until) == len(expected)
+    results = list(reader.query(house="serpentard", since=since, until=until))
+    assert [result.timestamp for result in results] == [
+        1_700_000_000 + i for i in expected
+    ]
+
+    first = results[0]
+    sorting = sortings[expected[0]]
+    assert first.respondent == f"{hash_respondent(sorting.respondent_id):016x}"
+    assert sorted(first.answers) == sorted(sorting.answers)
+    assert tuple(first.scores.values()) == sorting.scores
+
+    answer = sortings[0].answers[0]
+    expected = [
+        i
+        for i, sorting in enumerate(sortings)
+        if answer in sorting.answers and i % 2 == 1
+    ]
+    assert reader.count(answer=answer) == sum(
+        answer in sorting.answers for sorting in sortings
+    )
+    assert reader.count(answer=answer, pack="saison") == len(expected)
+    assert len(list(reader.query(answer=answer, pack="saison", limit=3))) == 3
+    assert reader.count(pack="unknown") == 0
+
+
+def test_a_partial_record_is_dropped_on_reopening(tmp_path: Path) -> None:
+    """Tests that a log cut in the middle of a record can be appended to again."""
+    with ResultLog(directory=tmp_path, buffer_records=1) as log:
+        log.append(
+            respondent_id="a",
+            answers=[("1", "1", "2")],
+            house="serdaigle",
+            scores=(0.0, 0.0, 1.0, 0.0),
+        )
+    segment = tmp_path / "segment-000000.log"
+    with segment.open("ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    with ResultLog(directory=tmp_path) as log:
+        log.append(
+            respondent_id="b",
+            answers=[],
+            house="gryffondor",
+            scores={"gryffondor": 1.0},
+            tie=True,
+        )
+        with pytest.raises(ValueError, match="not one of the variations"):
+            log.append(
+                respondent_id="c",
+                answers=[("99", "1", "1")],
+                house="gryffondor",
+                scores={},
+            )
+
+    results = list(ResultLogReader(directory=tmp_path).query())
+    assert [(result.house, result.tie) for result in results] == [
+        ("serdaigle", False),
+        ("gryffondor", True),
+    ]
+    assert results[0].answers == [("1", "1", "2")]
+
+
+def test_the_commands_log_and_query_the_sortings(tmp_path: Path) -> None:
+    """Tests `sorting-hat score --log` and `sorting-hat query`."""
+    answers = tmp_path / "answers.csv"
+    answers.write_text(
+        "respondent_id,question_id,variation_id,answer_id\n"
+        "1,1,1,2\n1,2,1,1\n2,1,1,2\n2,2,1,3\n3,1,2,4\n"
+    )
+    log_dir = tmp_path / "log"
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["score", str(answers), "--log", str(log_dir)])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(cli, ["query", str(log_dir), "--answer", "1/1/2"])
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["answers"] for row in rows] == [["1/1/2", "2/1/1"], ["1/1/2", "2/1/3"]]
+
+    result = runner.invoke(cli, ["query", str(log_dir), "--since", "1h", "--count"])
+    assert result.output == "3\n"
+    result = runner.invoke(cli, ["query", str(log_dir), "--until", "1h", "--count"])
+    assert result.output == "0\n"
+
+
+def test_the_server_logs_each_completed_quiz(tmp_path: Path) -> None:
+    """Tests that a quiz answered through the endpoints is logged with its answers."""
+    with ResultLog(directory=tmp_path, buffer_records=1) as log:
+        server = SortingHatServer(referential=load_referential(), log=log)
+        _, session = server.dispatch(method="POST", path="/sessions", body=b"")
+        path = f"/sessions/{session['session_id']}"
+        for _ in range(session["number_of_questions"]):
+            server.dispatch(
+                method="POST", path=f"{path}/answers", body=b'{"answer_id": "1"}'
+            )
+        _, result = server.dispatch(method="GET", path=f"{path}/result", body=b"")
+
+    (logged,) = ResultLogReader(directory=tmp_path).query()
+    assert logged.house == result["house"]
+    assert logged.scores == result["scores"]
+    assert len(logged.answers) == session["number_of_questions"]
+    assert {answer_id for _, _, answer_id in logged.answers} == {"1"}
+
+
+def test_packs_are_loaded_and_quizzes_logged_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that the server leaves the disk to threads other than the loop's."""
+    data = resources.files("sorting_hat.data")
+    (tmp_path / "packs" / "copie").mkdir(parents=True)
+    for filename in FILENAMES:
+        shutil.copyfile(
+            data.joinpath(filename), tmp_path / "packs" / "copie" / filename
+        )
+    threads = {}
+
+    def record(name: str, function: Any) -> Any:
+        """Wraps a function to record the thread running it.
+
+        Args:
+            name: The name to record the thread under.
+            function: The function.
+
+        Returns:
+            The wrapped function.
+        """
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            """Records the thread, then calls the function."""
+            threads[name] = threading.current_thread()
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(
+        QuizReferential,
+        "from_directory",
+        staticmethod(record("load", QuizReferential.from_directory)),
+    )
+
+    async def scenario(server: SortingHatServer) -> dict:
+        """Completes a quiz of the pack over HTTP and returns its result."""
+        tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(method: str, path: str, body: bytes = b"") -> Any:
+            """Sends a request and returns the payload of its response."""
+            head = f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n"
+            writer.write(head.encode() + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+            return json.loads(await reader.readexactly(length))
+
+        session = await request("POST", "/sessions", b'{"pack": "copie"}')
+        path = f"/sessions/{session['session_id']}"
+        for _ in range(session["number_of_questions"]):
+            await request("POST", f"{path}/answers", b'{"answer_id": "1"}')
+        result = await request("GET", f"{path}/result")
+
+        writer.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+        return result
+
+    with ResultLog(directory=tmp_path / "log", buffer_records=1) as log:
+        monkeypatch.setattr(log, "append", record("append", log.append))
+        server = SortingHatServer(
+            referential=load_referential(),
+            registry=PackRegistry(extra_dirs=[tmp_path / "packs"]),
+            log=log,
+        )
+        result = asyncio.run(scenario(server=server))
+        # Written before the result was sent, so without waiting for the close.
+        (logged,) = ResultLogReader(directory=tmp_path / "log").query()
+
+    assert logged.house == result["house"]
+    assert logged.pack == "copie"
+    assert set(threads) == {"load", "append"}
+    assert threading.main_thread() not in threads.values()
+
+
+def _complete_quiz(server: SortingHatServer, pack: Optional[str] = None) -> dict:
+    """Answers every question of a quiz through the endpoints.
+
+    Args:
+        server: The server.
+        pack: The name of the quiz pack. Defaults to None (the default one).
+
+    Returns:
+        The result of the quiz.
+    """
+    status, session = server.dispatch(
+        method="POST",
+        path="/sessions",
+        body=json.dumps({"pack": pack}).encode() if pack else b"",
+    )
+    assert status == 201
+    path = f"/sessions/{session['session_id']}"
+    for _ in range(session["number_of_questions"]):
+        server.dispatch(
+            method="POST", path=f"{path}/answers", body=b'{"answer_id": "2"}'
+        )
+    return server.dispatch(method="GET", path=f"{path}/result", body=b"")[1]
+
+
+def test_packs_with_other_variations_are_logged(tmp_path: Path) -> None:
+    """Tests that a pack with a variation more gets its column from a new segment."""
+    data = resources.files("sorting_hat.data")
+    for name in ("plus", "autres"):
+        (tmp_path / "packs" / name).mkdir(parents=True)
+        for filename in FILENAMES:
+            shutil.copyfile(
+                data.joinpath(filename), tmp_path / "packs" / name / filename
+            )
+    # The pack "plus" has a variation 1/5, a copy of 1/1, and "autres" other houses.
+    for filename in FILENAMES:
+        path = tmp_path / "packs" / "plus" / filename
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        path.write_text(
+            "".join(lines)
+            + "".join(
+                line.replace("1,1,", "1,5,", 1)
+                for line in lines[1:]
+                if line.startswith("1,1,")
+            ),
+            encoding="utf-8",
+        )
+    path = tmp_path / "packs" / "autres" / "weights.csv"
+    path.write_text(
+        path.read_text(encoding="utf-8").replace("serpentard", "autre"), "utf-8"
+    )
+
+    registry = PackRegistry(extra_dirs=[tmp_path / "packs"])
+    plus = registry.get(name="plus")
+    assert ("1", "5") in plus.variations
+    directory = tmp_path / "log"
+    with ResultLog(directory=directory, buffer_records=1) as log:
+        server = SortingHatServer(
+            referential=load_referential(), registry=registry, log=log
+        )
+        results = [_complete_quiz(server=server)]
+        results.append(_complete_quiz(server=server, pack="plus"))
+        log.append(
+            respondent_id="r",
+            answers=[("1", "5", "3"), ("2", "1", "1")],
+            house="serdaigle",
+            scores=[0.0, 1.0, 2.0, 0.0],
+            pack="plus",
+        )
+        with pytest.raises(HTTPError, match="houses") as error:
+            server.dispatch(method="POST", path="/sessions", body=b'{"pack": "autres"}')
+        assert error.value.status == 409
+    with pytest.raises(ValueError, match="houses"):
+        ResultLog(directory=directory, referential=registry.get(name="autres"))
+    with ResultLog(directory=directory, referential=load_referential()) as log:
+        results.append(
+            _complete_quiz(
+                server=SortingHatServer(referential=load_referential(), log=log),
+            )
+        )
+
+    reader = ResultLogReader(directory=directory)
+    assert [len(index.blocks) > 0 for _, index, _ in reader.segments] == [True, True]
+    assert [logged.house for logged in reader.query()] == [
+        results[0]["house"],
+        results[1]["house"],
+        "serdaigle",
+        results[2]["house"],
+    ]
+    (logged,) = reader.query(answer=("1", "5", "3"))
+    assert logged.pack == "plus"
+    assert sorted(logged.answers) == [("1", "5", "3"), ("2", "1", "1")]
+    assert reader.count(answer=("2", "1", "1")) == 1
+    assert reader.count(pack="plus") == 2
+
+
+def test_the_default_pack_of_the_server_is_logged(tmp_path: Path) -> None:
+    """Tests that a quiz started without a pack is logged under the server's pack."""
+    data = resources.files("sorting_hat.data")
+    (tmp_path / "packs" / "copie").mkdir(parents=True)
+    for filename in FILENAMES:
+        shutil.copyfile(
+            data.joinpath(filename), tmp_path / "packs" / "copie" / filename
+        )
+    registry = PackRegistry(extra_dirs=[tmp_path / "packs"])
+    referential = registry.get(name="copie")
+
+    directory = tmp_path / "log"
+    with ResultLog(directory=directory, referential=referential) as log:
+        server = SortingHatServer(
+            referential=referential, registry=registry, log=log, default_pack="copie"
+        )
+        result = _complete_quiz(server=server)
+
+    reader = ResultLogReader(directory=directory)
+    (logged,) = reader.query(pack="copie")
+    assert logged.house == result["house"]
+    assert list(reader.query(pack="default")) == []
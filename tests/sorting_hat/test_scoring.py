@@ -0,0 +1,56 @@
+"""This module tests the functions and the cache turning answers into a house."""
+
+import random
+
+from sorting_hat.batch import score_answers
+from sorting_hat.referential import load_referential
+from sorting_hat.scoring import ScoreCache
+
+
+def test_the_cache_is_shared_by_the_orders_of_a_sheet_and_bounded() -> None:
+    """Tests the canonical key, the eviction and the counters of the cache."""
+    referential = load_referential()
+    cache = ScoreCache(referential=referential, max_sheets=2)
+    sheet = [cache.positions[("1", "1", "2")], cache.positions[("2", "1", "3")]]
+
+    totals = cache.totals(sheet)
+    assert cache.totals(reversed(sheet)) is totals
+    assert totals == tuple(
+        map(
+            sum,
+            zip(
+                referential.weights[("1", "1", "2")],
+                referential.weights[("2", "1", "3")],
+            ),
+        )
+    )
+
+    cache.totals([0])
+    cache.totals([1])
+    assert len(cache) == 2
+    assert cache.stats() == {
+        "sheets": 2,
+        "hits": 1,
+        "misses": 3,
+        "evictions": 1,
+        "hit_rate": 1 / 4,
+    }
+    assert cache.totals([]) == (0.0,) * len(referential.houses)
+
+
+def test_a_sheet_gets_the_same_totals_in_any_order() -> None:
+    """Tests that the rows of a sheet can be shuffled without changing its floats."""
+    referential = load_referential()
+    rng = random.Random(4)
+    rows = [
+        ("alice", *key)
+        for key in rng.sample(sorted(referential.weights), k=20)
+        if key[2] in ("1", "2")
+    ]
+
+    results = []
+    for _ in range(5):
+        rng.shuffle(rows)
+        (result,) = score_answers(answers=rows, referential=referential, seed=1)
+        results.append(result)
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,62 @@
+"""This module tests the HTTP service of the sorting hat."""
+
+import asyncio
+import json
+
+import pytest
+
+from sorting_hat.referential import load_referential
+from sorting_hat.server import HTTPError, SortingHatServer
+
+
+def test_a_whole_sorting_through_the_endpoints() -> None:
+    """Tests a session from its start to its result."""
+    server = SortingHatServer(referential=load_referential())
+
+    status, session = server.dispatch(method="POST", path="/sessions", body=b"")
+    assert status == 201
+    path = f"/sessions/{session['session_id']}"
+
+    with pytest.raises(HTTPError, match="not been answered"):
+        server.dispatch(method="GET", path=f"{path}/result", body=b"")
+
+    for _ in range(session["number_of_questions"]):
+        _, question = server.dispatch(method="GET", path=f"{path}/question", body=b"")
+        body = json.dumps({"answer_id": question["answers"][0]["answer_id"]})
+        server.dispatch(method="POST", path=f"{path}/answers", body=body.encode())
+
+    _, result = server.dispatch(method="GET", path=f"{path}/result", body=b"")
+    assert result["house"] in load_referential().houses
+    assert result["welcome_message"]
+
+
+def test_the_server_answers_over_http() -> None:
+    """Tests that requests sent on a keep-alive connection are answered."""
+
+    async def scenario() -> list[bytes]:
+        """Starts a server, sends two requests and returns the status lines."""
+        server = SortingHatServer(referential=load_referential())
+        tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        status_lines = []
+        for request in (
+            b"POST /sessions HTTP/1.1\r\nContent-Length: 0\r\n\r\n",
+            b"GET /sessions/unknown/question HTTP/1.1\r\n\r\n",
+        ):
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            status_lines.append(head.split(b"\r\n")[0])
+
+        writer.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+        return status_lines
+
+    assert asyncio.run(scenario()) == [
+        b"HTTP/1.1 201 Created",
+        b"HTTP/1.1 404 Not Found",
+    ]
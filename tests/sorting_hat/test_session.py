@@ -0,0 +1,53 @@
+"""This module tests the state of a quiz and the store of quizzes."""
+
+import pytest
+
+from sorting_hat.referential import load_referential
+from sorting_hat.session import QuizSession, SessionStore
+
+
+def test_a_quiz_resumed_from_its_bytes_gives_the_same_house() -> None:
+    """Tests that packing a quiz in the middle of it loses nothing."""
+    referential = load_referential()
+    session = QuizSession.start(referential=referential, seed=7)
+    assert len(session.to_bytes()) < 64
+
+    for i in range(len(session.order)):
+        if i == 5:
+            session = QuizSession.from_bytes(session.to_bytes())
+        session.answer(referential=referential, answer_id="1")
+
+    house = session.get_winning_house(referential=referential)
+    resumed = QuizSession.from_bytes(session.to_bytes())
+    assert resumed.score == session.score
+    assert resumed.get_winning_house(referential=referential) == house
+
+    with pytest.raises(ValueError, match="Every question"):
+        session.answer(referential=referential, answer_id="1")
+
+
+def test_the_store_evicts_idle_and_least_recently_used_quizzes() -> None:
+    """Tests the TTL, the memory cap and the counters of the store."""
+    now = [0.0]
+    session = QuizSession.start(referential=load_referential(), seed=1)
+    store = SessionStore(ttl=10, clock=lambda: now[0])
+    store.put(session_id="a", session=session)
+    entry_size = store.size
+    store.max_bytes = 2 * entry_size
+
+    store.put(session_id="b", session=session)
+    assert store.get(session_id="a") is not None
+    store.put(session_id="c", session=session)
+    assert store.get(session_id="b") is None  # The least recently used.
+    assert len(store) == 2
+
+    now[0] = 11
+    assert store.get(session_id="a") is None  # Idle for too long.
+    assert store.stats() == {
+        "sessions": 0,
+        "bytes": 0,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 3,
+        "hit_rate": 1 / 3,
+    }
@@ -0,0 +1,116 @@
+"""This module tests the table of the weights shared by the worker processes."""
+
+import io
+import random
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from sorting_hat.batch import score_file
+from sorting_hat.parallel import score_file_parallel
+from sorting_hat.referential import QuizReferential, load_referential
+from sorting_hat.scoring import ScoreCache
+from sorting_hat.shared import WeightTable, dump_table, publish_table
+
+
+def test_the_table_is_mapped_without_copying_the_weights(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests the content of the table and that its weights are not copied."""
+    monkeypatch.setenv("SORTING_HAT_CACHE_DIR", str(tmp_path))
+    referential = load_referential()
+    path = publish_table()
+    assert publish_table() == path
+
+    table = WeightTable(path=path)
+    cache = ScoreCache(referential=table)
+    assert table.houses == referential.houses
+    assert list(table.weights) == list(referential.weights)
+    for key, row in table.weights.items():
+        assert row.readonly and row.obj is table._mmap
+        assert tuple(row) == referential.weights[key]
+    assert cache.positions is table.weights.positions
+    sheet = [cache.positions[("1", "1", "2")], cache.positions[("2", "1", "3")]]
+    assert cache.totals(sheet) == ScoreCache(referential=referential).totals(sheet)
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        WeightTable(path=path)
+
+
+def test_the_memory_of_a_worker_does_not_grow_with_the_weights(
+    tmp_path: Path,
+) -> None:
+    """Tests that attaching to a table ten times as wide allocates no more memory."""
+    referential = load_referential()
+    wide = QuizReferential.from_indexes(
+        variation_texts=referential.variation_texts,
+        answer_texts=referential.answer_texts,
+        houses=tuple(f"{house}-{i}" for i in range(10) for house in referential.houses),
+        weights={key: vector * 10 for key, vector in referential.weights.items()},
+    )
+
+    allocated = {}
+    for name, table_referential in (("narrow", referential), ("wide", wide)):
+        path = tmp_path / f"{name}.weights"
+        path.write_bytes(dump_table(referential=table_referential, digest=bytes(32)))
+        tracemalloc.start()
+        try:
+            # What a worker keeps: the mapped table and its cache of the totals.
+            worker = ScoreCache(referential=WeightTable(path=path))
+            allocated[name] = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        assert worker.totals([0, 1])
+
+    # The 36 houses more would take 8 bytes per answer each if the weights were
+    # copied into the worker, and four times more as floats.
+    copied = 8 * len(referential.weights) * (len(wide.houses) - len(referential.houses))
+    assert allocated["wide"] - allocated["narrow"] < copied / 4
+
+
+def test_one_or_several_workers_give_the_same_results(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that the workers mapping the same table score as a single process."""
+    monkeypatch.setenv("SORTING_HAT_CACHE_DIR", str(tmp_path / "cache"))
+    rng = random.Random(2)
+    keys = sorted(load_referential().weights)
+    path = tmp_path / "answers.csv"
+    path.write_text(
+        "respondent_id,question_id,variation_id,answer_id\n"
+        + "".join(
+            f"r{i},{question_id},{variation_id},{answer_id}\n"
+            for i in range(1_000)
+            for question_id, variation_id, answer_id in rng.sample(keys, k=7)
+        )
+    )
+
+    expected = io.StringIO()
+    with open(path, encoding="utf-8") as f:
+        score_file(
+            input_file=f,
+            output_file=expected,
+            referential=load_referential(),
+            input_format="csv",
+            output_format="csv",
+            seed=3,
+        )
+
+    tables = set()
+    for workers in (1, 3):
+        output = io.StringIO()
+        score_file_parallel(
+            path=str(path),
+            output_file=output,
+            input_format="csv",
+            output_format="csv",
+            workers=workers,
+            seed=3,
+        )
+        assert output.getvalue() == expected.getvalue()
+        tables.add(publish_table().stat().st_ino)
+
+    # The table was written once, and mapped by every worker of both runs.
+    assert len(tables) == 1
@@ -0,0 +1,117 @@
+"""This module tests the generation of synthetic sortings."""
+
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+from click.testing import CliRunner
+
+from sorting_hat.batch import score_file
+from sorting_hat.cli import cli
+from sorting_hat.metrics import METRICS
+from sorting_hat.referential import load_referential
+from sorting_hat.simulate import BLOCK_SIZE, Simulator, simulate_to_file
+
+
+def test_the_output_does_not_depend_on_the_number_of_workers() -> None:
+    """Tests that a seed gives the same sortings with one or several processes."""
+    outputs = []
+    for workers in (1, 2):
+        f = io.StringIO()
+        simulate_to_file(f=f, n=BLOCK_SIZE + 10, seed=5, fmt="csv", workers=workers)
+        outputs.append(f.getvalue())
+
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0].splitlines()) == BLOCK_SIZE + 11
+
+
+def test_the_answers_are_scored_as_simulated() -> None:
+    """Tests that scoring the simulated answers gives the simulated results."""
+    answers, results, scored = io.StringIO(), io.StringIO(), io.StringIO()
+    simulate_to_file(f=answers, n=500, seed=9, answers=True, profile="serdaigle")
+    simulate_to_file(f=results, n=500, seed=9, profile="serdaigle")
+
+    answers.seek(0)
+    score_file(
+        input_file=answers,
+        output_file=scored,
+        referential=load_referential(),
+        input_format="jsonl",
+        output_format="jsonl",
+        seed=9,
+    )
+
+    assert scored.getvalue() == results.getvalue()
+
+
+def test_a_profile_biases_the_houses() -> None:
+    """Tests that the answers favor the house of the profile."""
+    sortings = list(
+        Simulator(
+            referential=load_referential(), seed=1, profile="serpentard"
+        ).generate(n=1000)
+    )
+
+    houses = [sorting.house for sorting in sortings]
+    assert houses.count("serpentard") > 500
+
+
+def test_only_a_few_blocks_are_rendered_ahead(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that the blocks waiting to be written are bounded by the workers."""
+    outstanding = []
+
+    class Output(io.StringIO):
+        """Counts the blocks written."""
+
+        written = 0
+
+        def write(self, text: str) -> int:
+            """Writes a text, counting the blocks after the header."""
+            self.written += 1
+            return super().write(text)
+
+    f = Output()
+
+    class Executor(ThreadPoolExecutor):
+        """Records the blocks submitted and not written yet."""
+
+        submitted = 0
+
+        def submit(self, *args: Any, **kwargs: Any) -> Future:
+            """Submits a block."""
+            self.submitted += 1
+            outstanding.append(self.submitted - f.written)
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr("sorting_hat.simulate.ProcessPoolExecutor", Executor)
+    monkeypatch.setattr("sorting_hat.simulate.BLOCK_SIZE", 10)
+    simulate_to_file(f=f, n=100, seed=2, workers=2)
+
+    assert len(outstanding) == 10
+    assert max(outstanding) <= 2 * 2
+
+
+def test_the_bias_house_does_not_clash_with_profiling(tmp_path: Path) -> None:
+    """Tests that --bias-house and the --profile of the group can be combined."""
+    runner = CliRunner()
+    report = tmp_path / "profile.json"
+
+    try:
+        result = runner.invoke(
+            cli,
+            ["--profile", str(report), "simulate", "--n", "5", "--seed", "1"]
+            + ["--bias-house", "serdaigle"],
+        )
+    finally:
+        METRICS.enabled = False
+        METRICS.report = None
+        METRICS.reset()
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 5
+    assert report.exists()
+
+    result = runner.invoke(cli, ["simulate", "--n", "5", "--bias-house", "nowhere"])
+    assert result.exit_code == 2
+    assert "--bias-house" in result.output
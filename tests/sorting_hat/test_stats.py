@@ -0,0 +1,97 @@
+"""This module tests the aggregate of the outcomes of the sortings."""
+
+import io
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from sorting_hat.batch import score_file
+from sorting_hat.cli import cli
+from sorting_hat.parallel import score_file_parallel
+from sorting_hat.referential import load_referential
+from sorting_hat.server import SortingHatServer
+from sorting_hat.simulate import simulate_to_file
+from sorting_hat.stats import SortingStats, merge_all, merge_directory, write_snapshot
+
+
+def _stats(house: str, tie: bool, answers: list[tuple[str, str, str]]) -> SortingStats:
+    """Builds an aggregate of a single sorting."""
+    stats = SortingStats()
+    for answer in answers:
+        stats.count_answer(*answer)
+    stats.record(house=house, tie=tie)
+    return stats
+
+
+def test_merge_is_associative_and_survives_a_snapshot(tmp_path: Path) -> None:
+    """Tests that the aggregates merge in any order and are saved without loss."""
+    a = _stats("serdaigle", False, [("1", "1", "2"), ("2", "1", "1")])
+    b = _stats("serpentard", True, [("1", "1", "2")])
+    c = _stats("serdaigle", False, [("1", "2", "4")])
+
+    merged = merge_all([a, b, c])
+    assert merge_all([merge_all([a, b]), c]) == merge_all([a, merge_all([b, c])])
+    assert merge_all([c, b, a]) == merged
+    assert merged.sortings == 3
+    assert merged.tie_rate == 1 / 3
+    assert merged.answers[("1", "1", "2")] == 2
+
+    write_snapshot(stats=merge_all([a, b]), directory=tmp_path)
+    write_snapshot(stats=c, directory=tmp_path)
+    assert merge_directory(directory=tmp_path) == merged
+
+
+def test_every_scoring_path_gives_the_same_aggregate(tmp_path: Path) -> None:
+    """Tests that one or several processes record the same outcomes."""
+    path = tmp_path / "answers.csv"
+    with path.open("w") as f:
+        simulate_to_file(f=f, n=200, seed=3, fmt="csv", answers=True)
+
+    single, several = SortingStats(), SortingStats()
+    with path.open() as f:
+        score_file(
+            input_file=f,
+            output_file=io.StringIO(),
+            referential=load_referential(),
+            input_format="csv",
+            output_format="csv",
+            seed=1,
+            stats=single,
+        )
+    score_file_parallel(
+        path=str(path),
+        output_file=io.StringIO(),
+        input_format="csv",
+        output_format="csv",
+        workers=2,
+        seed=1,
+        stats=several,
+    )
+
+    assert single.sortings == 200
+    assert sum(single.answers.values()) == 200 * 7
+    assert several == single
+
+
+def test_the_server_and_the_command_line_record_the_sortings(tmp_path: Path) -> None:
+    """Tests the statistics of the server and the stats command."""
+    server = SortingHatServer(referential=load_referential())
+    _, session = server.dispatch(method="POST", path="/sessions", body=b"")
+    path = f"/sessions/{session['session_id']}"
+    for _ in range(session["number_of_questions"]):
+        server.dispatch(method="POST", path=f"{path}/answers", body=b'{"answer_id": 1}')
+
+    _, stats = server.dispatch(method="GET", path="/stats", body=b"")
+    assert stats["sortings"] == 1
+    assert sum(stats["answers"].values()) == session["number_of_questions"]
+
+    answers = "respondent_id,question_id,variation_id,answer_id\nalice,1,1,1\n"
+    CliRunner().invoke(
+        cli,
+        ["--stats-dir", str(tmp_path), "score", "--input-format", "csv"],
+        input=answers,
+    )
+    result = CliRunner().invoke(cli, ["stats", str(tmp_path), "--json"])
+
+    assert json.loads(result.output)["answers"] == {"1/1/1": 1}
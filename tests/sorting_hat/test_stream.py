@@ -0,0 +1,56 @@
+"""This module tests the scoring of an unbounded stream of answers."""
+
+from sorting_hat.referential import load_referential
+from sorting_hat.stream import StreamScorer
+
+
+def _sheet(respondent_id: str) -> list[tuple[str, str, str, str]]:
+    """Builds the answers of a complete short quiz.
+
+    Args:
+        respondent_id: The respondent giving the answers.
+
+    Returns:
+        One answer (the first variation, the first answer) for each question.
+    """
+    return [(respondent_id, str(question_id), "1", "1") for question_id in range(1, 8)]
+
+
+def test_results_are_emitted_once_the_quiz_is_complete() -> None:
+    """Tests that interleaved respondents are emitted as soon as they are done."""
+    alice, bob = _sheet("alice"), _sheet("bob")
+    answers = [answer for pair in zip(alice, bob) for answer in pair][:-1]
+    scorer = StreamScorer(referential=load_referential(), seed=1)
+
+    results = list(scorer.run(answers))
+
+    assert [result.respondent_id for result in results] == ["alice"]
+    assert len(scorer) == 1
+    assert [result.respondent_id for result in scorer.run(bob[-1:])] == ["bob"]
+    assert len(scorer) == 0
+
+
+def test_idle_respondents_are_evicted() -> None:
+    """Tests that the respondents without new answers are dropped."""
+    now = [0.0]
+    scorer = StreamScorer(
+        referential=load_referential(), idle_timeout=10.0, clock=lambda: now[0]
+    )
+
+    scorer.add("alice", "1", "1", "1")
+    now[0] = 20.0
+    scorer.add("bob", "1", "1", "1")
+
+    assert len(scorer) == 1
+    assert scorer.evicted == 1
+
+
+def test_pending_quizzes_are_bounded() -> None:
+    """Tests that the number of incomplete quizzes kept never exceeds the cap."""
+    scorer = StreamScorer(referential=load_referential(), max_pending=100)
+
+    for i in range(1_000):
+        scorer.add(f"respondent-{i}", "1", "1", "1")
+
+    assert len(scorer) == 100
+    assert scorer.evicted == 900
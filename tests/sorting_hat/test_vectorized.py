@@ -0,0 +1,60 @@
+"""This module tests the scoring of answer sheets with NumPy."""
+
+import random
+
+import pytest
+
+from sorting_hat.batch import score_answers
+from sorting_hat.referential import load_referential
+from sorting_hat.scoring import ScoreCache, get_best_houses
+
+np = pytest.importorskip("numpy")
+
+from sorting_hat.vectorized import VectorizedScorer  # noqa: E402
+
+
+def test_score_answers_matches_the_python_engine() -> None:
+    """Tests that the totals and the houses, ties included, are the same."""
+    referential = load_referential()
+    rng = random.Random(4)
+    keys = sorted(referential.weights)
+    rows = [
+        (f"r{i}", *key)
+        for i in range(500)
+        for key in rng.sample(keys, k=rng.randint(0, 9))
+    ]
+    rng.shuffle(rows)
+
+    expected = score_answers(answers=rows, referential=referential, seed=5)
+    results = VectorizedScorer(referential=referential).score_answers(rows, seed=5)
+
+    assert results == expected
+
+
+def test_score_pads_sorts_and_breaks_ties() -> None:
+    """Tests the kernel on sheets of several lengths, in any order, with ties."""
+    referential = load_referential()
+    scorer = VectorizedScorer(referential=referential)
+    cache = ScoreCache(referential=referential, max_sheets=0)
+    rng = random.Random(6)
+    sheets = [
+        rng.sample(range(len(scorer.codes)), k=rng.randint(0, 8)) for _ in range(300)
+    ]
+
+    codes = scorer.encode(sheets)
+    result = scorer.score(codes=codes, seed=7)
+
+    assert codes.shape == (300, max(map(len, sheets)))
+    assert result.scores.tolist() == [list(cache.totals(sheet)) for sheet in sheets]
+    for totals, winner, tie in zip(result.scores, result.winners, result.ties):
+        best_houses = get_best_houses(score=dict(zip(scorer.houses, totals)))
+        assert scorer.houses[winner] in best_houses
+        assert tie == (len(best_houses) > 1)
+    assert result.ties.any()
+    again = scorer.score(codes=codes, seed=7)
+    assert np.array_equal(again.winners, result.winners)
+
+    with pytest.raises(ValueError, match="should be in"):
+        scorer.score(codes=np.array([[len(scorer.codes)]]))
+    with pytest.raises(ValueError, match="array"):
+        scorer.score(codes=np.array([1, 2]))